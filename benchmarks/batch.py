@@ -0,0 +1,139 @@
+"""
+Compare the throughput of validating many small documents one by one
+and in a batch.
+
+Usage: python -m benchmarks.batch
+"""
+import argparse
+import time
+
+from benchmarks.generator import DocumentGenerator
+from littlexml.batch import validate_many
+from littlexml.lexer import LexicalError
+from littlexml.parser import Parser, ParsingError
+
+
+def generate_documents(size, count, invalid_ratio, seed):
+    """
+    Generate documents of roughly the same size.
+    :param size: Approximate length of the documents
+    :param count: Number of documents
+    :param invalid_ratio: Fraction of invalid documents
+    :param seed: Seed of the random number generator
+    :return: List of LittleXML strings
+    """
+    generator = DocumentGenerator.for_size(size=size, seed=seed)
+    documents = []
+    for index in range(count):
+        if index < count * invalid_ratio:
+            documents.append(generator.generate_invalid())
+        else:
+            documents.append(generator.generate())
+    generator.random.shuffle(documents)
+    return documents
+
+
+def validate_one_by_one(documents):
+    for document in documents:
+        try:
+            Parser(input_stream=document)
+        except (LexicalError, ParsingError):
+            pass
+
+
+def validate_batch(documents):
+    validate_many(documents=documents)
+
+
+def time_function(function, documents, repeat):
+    """
+    Measure the time needed to validate documents.
+    :param function: Function validating a list of documents
+    :param documents: List of LittleXML strings
+    :param repeat: Number of measurements, the fastest one is reported
+    :return: Time in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(documents)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare batch validation with validating documents '
+                    'one by one',
+    )
+    parser.add_argument(
+        '-s', '--sizes',
+        type=int,
+        nargs='+',
+        default=[100, 300, 1000],
+        help='approximate sizes of documents',
+        dest='sizes',
+    )
+    parser.add_argument(
+        '-n', '--count',
+        type=int,
+        default=2000,
+        help='number of documents of each size',
+        dest='count',
+    )
+    parser.add_argument(
+        '-x', '--invalid',
+        type=float,
+        default=0.1,
+        help='fraction of invalid documents',
+        dest='invalid_ratio',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='number of measurements for each size',
+        dest='repeat',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='seed for document generation',
+        dest='seed',
+    )
+    args = parser.parse_args()
+
+    print(
+        f'{"size":>8} {"documents":>10} {"single/s":>10} '
+        f'{"batch/s":>10} {"speedup":>8}'
+    )
+    for size in args.sizes:
+        documents = generate_documents(
+            size=size,
+            count=args.count,
+            invalid_ratio=args.invalid_ratio,
+            seed=args.seed,
+        )
+        single = time_function(
+            function=validate_one_by_one,
+            documents=documents,
+            repeat=args.repeat,
+        )
+        batch = time_function(
+            function=validate_batch,
+            documents=documents,
+            repeat=args.repeat,
+        )
+        print(
+            f'{size:>8} {len(documents):>10} '
+            f'{len(documents) / single:>10.0f} '
+            f'{len(documents) / batch:>10.0f} '
+            f'{single / batch:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
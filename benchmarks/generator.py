@@ -0,0 +1,217 @@
+"""
+Seeded generator of synthetic LittleXML documents.
+Documents are derived from the grammar in `RULE_DICT`, choosing
+productions to reach the requested nesting depth, amount of text and
+length of names. Invalid documents are produced by mutating valid ones.
+"""
+import random
+import string
+
+from littlexml.lexer import LexicalError
+from littlexml.parser import Parser, ParsingError
+from littlexml.rule import RuleType, RULE_DICT
+from littlexml.token import TokenType
+
+
+# Productions of each rule type, keyed by the type of the first token
+PRODUCTIONS = {}
+for (_rule_type, _token_type), _production in RULE_DICT.items():
+    PRODUCTIONS.setdefault(_rule_type, {})[_token_type] = _production
+
+# Fixed text of terminals, terminals missing here are generated randomly
+TERMINAL_TEXT = {
+    TokenType.SPACE: ' ',
+    TokenType.HYPHEN: '-',
+    TokenType.DOT: '.',
+    TokenType.COLON: ':',
+    TokenType.LESS_THAN: '<',
+    TokenType.LT_SLASH: '</',
+    TokenType.LT_XML: '<?xml',
+    TokenType.GREATER_THAN: '>',
+    TokenType.GT_SLASH: '/>',
+    TokenType.GT_XML: '?>',
+    TokenType.UNDERSCORE: '_',
+    TokenType.VERSION: 'version=',
+    TokenType.END_OF_STRING: '',
+}
+
+# Characters inserted into valid documents to make them invalid
+INVALID_CHARS = '<>/?=!#&'
+
+
+class DocumentGenerator:
+    """
+    Generates LittleXML documents from the grammar.
+    Elements are nested `depth` levels deep, the innermost element contains
+    `words` words of text, and each element closes with the name it was
+    opened with.
+    :param seed: Seed of the random number generator
+    :param depth: Nesting depth of elements
+    :param words: Number of words in the text of the innermost element
+    :param name_length: Average length of element names
+    :param word_length: Average length of words
+    :param declaration: Probability of including an XML declaration
+    """
+
+    def __init__(self, seed=0, depth=1, words=1, name_length=4,
+                 word_length=5, declaration=0.5):
+        self.random = random.Random(seed)
+        self.depth = depth
+        self.words = words
+        self.name_length = name_length
+        self.word_length = word_length
+        self.declaration = declaration
+
+    @classmethod
+    def for_size(cls, size, text_ratio=0.5, name_length=4, depth=None,
+                 **kwargs):
+        """
+        Create a generator of documents with roughly `size` characters.
+        :param size: Approximate length of generated documents
+        :param text_ratio: Fraction of the document taken up by text,
+            the rest is taken up by tags
+        :param name_length: Average length of element names
+        :param depth: Nesting depth of elements, `None` to derive it from
+            the size and the text ratio. If given, the rest of the document
+            is taken up by text.
+        :return: Document generator
+        """
+        word_length = kwargs.get('word_length', 5)
+        tag_length = 2 * name_length + 5
+        if depth is None:
+            depth = max(1, round(size * (1 - text_ratio) / tag_length))
+            text_size = size * text_ratio
+        else:
+            text_size = size - depth * tag_length
+        words = max(1, round(text_size / (word_length + 1)))
+        return cls(
+            depth=depth,
+            words=words,
+            name_length=name_length,
+            **kwargs,
+        )
+
+    def generate(self):
+        """
+        Generate a valid document.
+        :return: LittleXML string
+        """
+        output = []
+        names = []
+        self._words_left = self.words
+        previous = None
+
+        # Expand rules using a stack with the top at the end of the list
+        stack = [RuleType.XML_DOCUMENT]
+        while stack:
+            symbol = stack.pop()
+            if isinstance(symbol, TokenType):
+                output.append(self._terminal(token_type=symbol))
+                previous = symbol
+                if symbol == TokenType.GT_SLASH:
+                    names.pop()
+                continue
+
+            # Closing tags repeat the name of the matching opening tag
+            if symbol == RuleType.NAME:
+                if previous == TokenType.LT_SLASH:
+                    output.append(names.pop())
+                else:
+                    names.append(self._name())
+                    output.append(names[-1])
+                previous = None
+                continue
+
+            token_type = self._choose(rule_type=symbol, depth=len(names))
+            stack.extend(reversed(PRODUCTIONS[symbol][token_type]))
+
+        return ''.join(output)
+
+    def generate_invalid(self, attempts=100):
+        """
+        Generate an invalid document by mutating a valid one.
+        :param attempts: Maximum number of mutations to try
+        :return: LittleXML string
+        :raises RuntimeError: If no mutation produces an invalid document
+        """
+        document = self.generate()
+        for _ in range(attempts):
+            mutated = self._mutate(document=document)
+            try:
+                Parser(input_stream=mutated)
+            except (LexicalError, ParsingError):
+                return mutated
+        raise RuntimeError('Could not generate an invalid document')
+
+    def _choose(self, rule_type, depth):
+        """
+        Choose a production of a rule type.
+        :param rule_type: Rule type to expand
+        :param depth: Current nesting depth
+        :return: Type of the first token of the chosen production
+        """
+        if rule_type == RuleType.XML_DOCUMENT:
+            if self.random.random() < self.declaration:
+                return TokenType.LT_XML
+            return TokenType.LESS_THAN
+        if rule_type == RuleType.CLOSE_TAG:
+            if depth < self.depth:
+                return TokenType.LESS_THAN
+            return self._word_char()
+        if rule_type == RuleType.OPEN_TAG:
+            if depth >= self.depth and self._words_left <= 0:
+                return TokenType.GT_SLASH
+            return TokenType.GREATER_THAN
+        if rule_type == RuleType.NEXT_WORD:
+            self._words_left -= 1
+            if self._words_left > 0:
+                return TokenType.SPACE
+            return TokenType.LT_SLASH
+        if rule_type in (RuleType.WORDS, RuleType.WORD):
+            return self._word_char()
+        if rule_type == RuleType.NEXT_CHAR:
+            if self.random.random() < 1 / self.word_length:
+                return TokenType.SPACE
+            return self._word_char()
+        if rule_type == RuleType.NEXT_DIGIT:
+            if self.random.random() < 0.2:
+                return TokenType.DIGIT
+            return TokenType.DOT
+
+        # Remaining rules have a single production
+        return next(iter(PRODUCTIONS[rule_type]))
+
+    def _word_char(self):
+        if self.random.random() < 0.05:
+            return TokenType.SIGN
+        if self.random.random() < 0.2:
+            return TokenType.DIGIT
+        return TokenType.LETTER
+
+    def _terminal(self, token_type):
+        if token_type == TokenType.LETTER:
+            return self.random.choice(string.ascii_letters)
+        if token_type == TokenType.DIGIT:
+            return self.random.choice(string.digits)
+        if token_type == TokenType.SIGN:
+            return self.random.choice('@?')
+        return TERMINAL_TEXT[token_type]
+
+    def _name(self):
+        first = self.random.choice(string.ascii_letters + '_:')
+        rest = string.ascii_letters + string.digits + '_:.-'
+        length = max(0, round(self.random.gauss(self.name_length - 1, 1)))
+        return first + ''.join(self.random.choices(rest, k=length))
+
+    def _mutate(self, document):
+        index = self.random.randrange(len(document))
+        mutation = self.random.randrange(3)
+        if mutation == 0:
+            # Delete a character
+            return document[:index] + document[index + 1:]
+        if mutation == 1:
+            # Insert an invalid character
+            char = self.random.choice(INVALID_CHARS)
+            return document[:index] + char + document[index:]
+        # Truncate the document
+        return document[:index]
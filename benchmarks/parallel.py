@@ -0,0 +1,110 @@
+"""
+Measure how the time needed to validate a single large document
+in parallel scales with the number of worker processes.
+
+Usage: python -m benchmarks.parallel
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from littlexml.parallel import validate_parallel
+from littlexml.validation import validate_file
+
+
+def nested_document(depth):
+    """
+    Build a document with elements nested `depth` levels deep,
+    with one tag per line.
+    :param depth: Number of nested elements
+    :return: LittleXML string
+    """
+    names = [f'element{index % 100}' for index in range(depth)]
+    return (
+        ''.join(f'<{name}>\n' for name in names)
+        + 'word'
+        + ''.join(f'</{name}>\n' for name in reversed(names))
+    )
+
+
+def time_function(function, repeat):
+    """
+    Measure the time needed to validate the document.
+    :param function: Function validating the document
+    :param repeat: Number of measurements, the fastest one is reported
+    :return: Time in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if not result.ok:
+            raise RuntimeError(str(result))
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure parallel validation of a single document',
+    )
+    parser.add_argument(
+        '-d', '--depth',
+        type=int,
+        default=200000,
+        help='nesting depth of the document',
+        dest='depth',
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8],
+        help='numbers of worker processes',
+        dest='jobs',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='number of measurements for each number of workers',
+        dest='repeat',
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'document.littlexml')
+        with open(path, 'w') as output_file:
+            output_file.write(nested_document(depth=args.depth))
+        size = os.path.getsize(path)
+        print(f'{size / 1e6:.1f} MB, {os.cpu_count()} CPUs')
+        print(f'{"jobs":>8} {"seconds":>10} {"MB/s":>8} {"speedup":>8}')
+        sequential = time_function(
+            function=lambda: validate_file(path=path, memory_map=True),
+            repeat=args.repeat,
+        )
+        print(
+            f'{"-":>8} {sequential:>10.3f} {size / 1e6 / sequential:>8.2f} '
+            f'{1:>7.1f}x'
+        )
+        for jobs in args.jobs:
+            elapsed = time_function(
+                function=lambda: validate_parallel(
+                    path=path,
+                    jobs=jobs,
+                    # Give each worker several chunks
+                    chunk_size=max(size // (jobs * 4), 1),
+                ),
+                repeat=args.repeat,
+            )
+            print(
+                f'{jobs:>8} {elapsed:>10.3f} {size / 1e6 / elapsed:>8.2f} '
+                f'{sequential / elapsed:>7.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure how parsing time scales with nesting depth and document size.
+Parsing time per token should stay roughly constant as the input grows.
+
+Usage: python -m benchmarks.scaling
+"""
+import argparse
+import time
+
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser
+
+
+def nested_document(depth):
+    """
+    Build a document with elements nested `depth` levels deep.
+    :param depth: Number of nested elements
+    :return: LittleXML string
+    """
+    return '<a>' * depth + 'x' + '</a>' * depth
+
+
+def text_document(words):
+    """
+    Build a document with a single element containing `words` words.
+    :param words: Number of words in the text node
+    :return: LittleXML string
+    """
+    return '<a>' + ' '.join(['word'] * words) + '</a>'
+
+
+def time_parser(input_string, repeat):
+    """
+    Measure the time needed to parse the token stream of a document.
+    :param input_string: LittleXML string
+    :param repeat: Number of measurements, the fastest one is reported
+    :return: Number of tokens, time in seconds
+    """
+    tokens = Lexer(input_string=input_string).tokens
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Parser(input_stream=tokens, parse_tokens=True)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return len(tokens), best
+
+
+def run(title, builder, sizes, repeat):
+    print(title)
+    print(f'{"size":>10} {"tokens":>10} {"seconds":>10} {"us/token":>10}')
+    for size in sizes:
+        token_count, elapsed = time_parser(
+            input_string=builder(size),
+            repeat=repeat,
+        )
+        per_token = elapsed / token_count * 1e6
+        print(
+            f'{size:>10} {token_count:>10} '
+            f'{elapsed:>10.4f} {per_token:>10.3f}'
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure parser scaling with input size',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='number of measurements for each size',
+        dest='repeat',
+    )
+    parser.add_argument(
+        '-m', '--max-exponent',
+        type=int,
+        default=5,
+        help='largest size is 10 to the power of this value',
+        dest='max_exponent',
+    )
+    args = parser.parse_args()
+    sizes = [10 ** exponent for exponent in range(2, args.max_exponent + 1)]
+    run(
+        title='Nesting depth',
+        builder=nested_document,
+        sizes=sizes,
+        repeat=args.repeat,
+    )
+    run(
+        title='Text length (words)',
+        builder=text_document,
+        sizes=sizes,
+        repeat=args.repeat,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+"""
+Benchmark suite measuring throughput and memory usage of lexing, parsing,
+serialization and the command line tool on generated documents.
+
+Usage: python -m benchmarks [-o results.json] [-c baseline.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generator import DocumentGenerator
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser
+from littlexml.serialization import read_tokens, write_tokens
+
+
+def bench_lex(document, tokens):
+    Lexer(input_string=document)
+
+
+def bench_lex_regex(document, tokens):
+    Lexer(input_string=document, scanner='regex')
+
+
+def bench_lex_spans(document, tokens):
+    Lexer(input_string=document, spans=True, scanner='regex')
+
+
+def bench_parse(document, tokens):
+    Parser(input_stream=tokens, parse_tokens=True)
+
+
+def bench_validate(document, tokens):
+    Parser(input_stream=document)
+
+
+def bench_json(document, tokens):
+    roundtrip(tokens=tokens, output_file=io.StringIO(), token_format='json')
+
+
+def bench_jsonl(document, tokens):
+    roundtrip(tokens=tokens, output_file=io.StringIO(), token_format='jsonl')
+
+
+def bench_binary(document, tokens):
+    roundtrip(tokens=tokens, output_file=io.BytesIO(), token_format='binary')
+
+
+def roundtrip(tokens, output_file, token_format):
+    write_tokens(
+        tokens=tokens,
+        output_file=output_file,
+        token_format=token_format,
+    )
+    output_file.seek(0)
+    for _ in read_tokens(input_file=output_file, token_format=token_format):
+        pass
+
+
+BENCHMARKS = {
+    'lex': bench_lex,
+    'lex_regex': bench_lex_regex,
+    'lex_spans': bench_lex_spans,
+    'parse': bench_parse,
+    'validate': bench_validate,
+    'json': bench_json,
+    'jsonl': bench_jsonl,
+    'binary': bench_binary,
+}
+
+
+def measure(function, document, tokens, repeat):
+    """
+    Measure the fastest run time and the peak memory usage of a benchmark.
+    :param function: Benchmark function
+    :param document: LittleXML string
+    :param tokens: Token stream of the document
+    :param repeat: Number of timed runs
+    :return: Time in seconds, peak memory in bytes
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(document=document, tokens=tokens)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    # Memory is measured in a separate run, as tracing slows it down
+    tracemalloc.start()
+    function(document=document, tokens=tokens)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def measure_cli(document, repeat):
+    """
+    Measure the run time of the validate command, including start-up time.
+    :param document: LittleXML string
+    :param repeat: Number of timed runs
+    :return: Time in seconds
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.littlexml',
+                                     delete=False) as input_file:
+        input_file.write(document)
+    try:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, '-m', 'littlexml', 'validate',
+                 '-i', input_file.name],
+                check=True,
+                stderr=subprocess.DEVNULL,
+            )
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return best
+    finally:
+        os.unlink(input_file.name)
+
+
+def result(benchmark, size, document, tokens, seconds, peak_memory):
+    size_bytes = len(document.encode())
+    return {
+        'benchmark': benchmark,
+        'size': size,
+        'bytes': size_bytes,
+        'tokens': len(tokens),
+        'seconds': seconds,
+        'mb_per_second': size_bytes / seconds / 1e6,
+        'tokens_per_second': len(tokens) / seconds,
+        'peak_memory': peak_memory,
+    }
+
+
+def run(sizes, benchmarks, repeat, seed, text_ratio, name_length, cli,
+        depth=None):
+    """
+    Run benchmarks on generated documents of increasing size.
+    :return: List of results
+    """
+    results = []
+    for size in sizes:
+        generator = DocumentGenerator.for_size(
+            size=size,
+            text_ratio=text_ratio,
+            name_length=name_length,
+            depth=depth,
+            seed=seed,
+        )
+        document = generator.generate()
+        tokens = Lexer(input_string=document).tokens
+        for benchmark in benchmarks:
+            seconds, peak_memory = measure(
+                function=BENCHMARKS[benchmark],
+                document=document,
+                tokens=tokens,
+                repeat=repeat,
+            )
+            results.append(result(
+                benchmark=benchmark,
+                size=size,
+                document=document,
+                tokens=tokens,
+                seconds=seconds,
+                peak_memory=peak_memory,
+            ))
+            print_result(results[-1])
+        if cli:
+            seconds = measure_cli(document=document, repeat=repeat)
+            results.append(result(
+                benchmark='cli',
+                size=size,
+                document=document,
+                tokens=tokens,
+                seconds=seconds,
+                peak_memory=None,
+            ))
+            print_result(results[-1])
+    return results
+
+
+def print_header():
+    print(
+        f'{"benchmark":<12} {"size":>9} {"tokens":>9} {"seconds":>9} '
+        f'{"MB/s":>8} {"tokens/s":>11} {"peak KiB":>10}'
+    )
+
+
+def print_result(item):
+    peak = item['peak_memory']
+    peak = '-' if peak is None else f'{peak / 1024:.0f}'
+    print(
+        f'{item["benchmark"]:<12} {item["size"]:>9} {item["tokens"]:>9} '
+        f'{item["seconds"]:>9.4f} {item["mb_per_second"]:>8.2f} '
+        f'{item["tokens_per_second"]:>11.0f} {peak:>10}'
+    )
+
+
+def compare(results, baseline):
+    """
+    Print the speedup of results over baseline results.
+    :param results: List of results
+    :param baseline: List of results to compare to
+    """
+    previous = {
+        (item['benchmark'], item['size']): item
+        for item in baseline
+    }
+    print()
+    print(f'{"benchmark":<12} {"size":>9} {"speedup":>9} {"memory":>9}')
+    for item in results:
+        old = previous.get((item['benchmark'], item['size']))
+        if old is None:
+            continue
+        speedup = old['seconds'] / item['seconds']
+        memory = '-'
+        if item['peak_memory'] and old['peak_memory']:
+            memory = f'{item["peak_memory"] / old["peak_memory"]:.2f}x'
+        print(
+            f'{item["benchmark"]:<12} {item["size"]:>9} '
+            f'{speedup:>8.2f}x {memory:>9}'
+        )
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'seed': args.seed,
+        'text_ratio': args.text_ratio,
+        'name_length': args.name_length,
+        'depth': args.depth,
+        'repeat': args.repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark LittleXML processing on generated documents',
+    )
+    parser.add_argument(
+        '-s', '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 100000],
+        help='approximate document sizes in characters',
+        dest='sizes',
+    )
+    parser.add_argument(
+        '-b', '--benchmarks',
+        nargs='+',
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+        help='benchmarks to run',
+        dest='benchmarks',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='number of measurements, the fastest one is reported',
+        dest='repeat',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='seed of the document generator',
+        dest='seed',
+    )
+    parser.add_argument(
+        '--text-ratio',
+        type=float,
+        default=0.5,
+        help='fraction of documents taken up by text',
+        dest='text_ratio',
+    )
+    parser.add_argument(
+        '--name-length',
+        type=int,
+        default=4,
+        help='average length of element names',
+        dest='name_length',
+    )
+    parser.add_argument(
+        '-d', '--depth',
+        type=int,
+        default=None,
+        help='nesting depth of elements, derived from the size and the text '
+             'ratio by default',
+        dest='depth',
+    )
+    parser.add_argument(
+        '--no-cli',
+        action='store_false',
+        help='skip end-to-end benchmarks of the command line tool',
+        dest='cli',
+    )
+    parser.add_argument(
+        '-o', '--output-file',
+        help='file for storing the results in JSON format',
+        dest='output_file',
+    )
+    parser.add_argument(
+        '-c', '--compare',
+        help='results in JSON format to compare to',
+        dest='compare',
+    )
+    args = parser.parse_args()
+
+    print_header()
+    results = run(
+        sizes=args.sizes,
+        benchmarks=args.benchmarks,
+        repeat=args.repeat,
+        seed=args.seed,
+        text_ratio=args.text_ratio,
+        name_length=args.name_length,
+        cli=args.cli,
+        depth=args.depth,
+    )
+    if args.output_file:
+        with open(args.output_file, 'w') as output_file:
+            json.dump(
+                {'metadata': metadata(args=args), 'results': results},
+                output_file,
+                indent=2,
+            )
+            output_file.write('\n')
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        compare(results=results, baseline=baseline)
@@ -1,2 +1,2 @@
-from littlexml.lexer import Lexer
+from littlexml.lexer import Lexer, StreamLexer
 from littlexml.parser import Parser
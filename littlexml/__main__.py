@@ -1,10 +1,26 @@
 import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import io
 import json
 import sys
 
-from littlexml.lexer import Lexer, LexicalError
+from littlexml.cache import DEFAULT_MAX_ENTRIES, ValidationCache
+from littlexml.diagnostics import DEFAULT_MAX_ERRORS, Diagnostics
+from littlexml.lexer import Lexer, LexicalError, StreamLexer, map_file
+from littlexml.limits import LimitError, Limits
+from littlexml.parallel import validate_parallel
 from littlexml.parser import Parser, ParsingError
-from littlexml.token import Token
+from littlexml.serialization import (
+    FORMATS, FormatError, read_tokens, write_tokens,
+)
+from littlexml.server import (
+    DEFAULT_CONCURRENCY, DEFAULT_HOST, DEFAULT_PORT, VALIDATE_PATH,
+    ValidationServer,
+)
+from littlexml.stats import Statistics
+from littlexml.validation import cache_options, find_files, validate_files
 
 
 def parse_args():
@@ -25,20 +41,127 @@ def parse_args():
         help='perform syntactic analysis',
     )
     validate_parser.set_defaults(handler=validate)
+    validate_parser.add_argument(
+        'paths',
+        nargs='*',
+        help='LittleXML files, directories or glob patterns to validate '
+             'instead of the input file',
+    )
     validate_parser.add_argument(
         '-i', '--input-file',
         nargs='?',
-        type=argparse.FileType('r'),
-        default=sys.stdin,
+        type=argparse.FileType('rb'),
+        default=sys.stdin.buffer,
         help='LittleXML file to validate',
         dest='input_file',
     )
     validate_parser.add_argument(
         '-t', '--tokens',
         action='store_true',
-        help='read token stream in JSON format',
+        help='read token stream instead of LittleXML',
         dest='tokens',
     )
+    validate_parser.add_argument(
+        '-f', '--format',
+        choices=FORMATS,
+        default='json',
+        help='format of the token stream read with -t (default: json)',
+        dest='token_format',
+    )
+    validate_parser.add_argument(
+        '-m', '--mmap',
+        action='store_true',
+        help='memory-map input files instead of reading them in chunks',
+        dest='memory_map',
+    )
+    validate_parser.add_argument(
+        '--spans',
+        action='store_true',
+        help='use span tokens for runs of letters and digits',
+        dest='spans',
+    )
+    validate_parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='number of worker processes used for validating multiple '
+             'files or a single file with --parallel, defaults to '
+             'the number of CPUs',
+        dest='jobs',
+    )
+    validate_parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='validate a single input file in chunks using worker processes',
+        dest='parallel',
+    )
+    validate_parser.add_argument(
+        '-u', '--unordered',
+        action='store_true',
+        help='print results for multiple files as they are completed '
+             'instead of in input order',
+        dest='unordered',
+    )
+    validate_parser.add_argument(
+        '-p', '--pattern',
+        default='*',
+        help='pattern for names of files found in directories',
+        dest='pattern',
+    )
+    add_limit_arguments(parser=validate_parser)
+    validate_parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='skip validation of content validated before',
+        dest='cache',
+    )
+    validate_parser.add_argument(
+        '--cache-file',
+        default=None,
+        help='file storing the cache between runs, implies --cache',
+        dest='cache_file',
+    )
+    validate_parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f'maximum number of cached results '
+             f'(default: {DEFAULT_MAX_ENTRIES})',
+        dest='cache_size',
+    )
+    validate_parser.add_argument(
+        '--cache-bytes',
+        type=int,
+        default=None,
+        help='maximum size of cached results in bytes',
+        dest='cache_bytes',
+    )
+    validate_parser.add_argument(
+        '-l', '--lines',
+        action='store_true',
+        help='print lines and columns of errors',
+        dest='lines',
+    )
+    validate_parser.add_argument(
+        '-r', '--recover',
+        action='store_true',
+        help='continue after errors and report all of them',
+        dest='recover',
+    )
+    validate_parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=DEFAULT_MAX_ERRORS,
+        help=f'number of errors after which validation is stopped '
+             f'with --recover (default: {DEFAULT_MAX_ERRORS})',
+        dest='max_errors',
+    )
+    validate_parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='print parsing statistics in JSON format',
+        dest='stats',
+    )
     validate_parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -56,8 +179,8 @@ def parse_args():
     tokenize_parser.add_argument(
         '-i', '--input-file',
         nargs='?',
-        type=argparse.FileType('r'),
-        default=sys.stdin,
+        type=argparse.FileType('rb'),
+        default=sys.stdin.buffer,
         help='file containing string for lexical analysis',
         dest='input_file',
     )
@@ -75,42 +198,489 @@ def parse_args():
         help='output token stream in short format instead of JSON',
         dest='short',
     )
+    tokenize_parser.add_argument(
+        '-f', '--format',
+        choices=FORMATS,
+        default='json',
+        help='format of the token stream (default: json)',
+        dest='token_format',
+    )
+    tokenize_parser.add_argument(
+        '-m', '--mmap',
+        action='store_true',
+        help='memory-map the input file instead of reading it in chunks',
+        dest='memory_map',
+    )
+    tokenize_parser.add_argument(
+        '--spans',
+        action='store_true',
+        help='output span tokens for runs of letters and digits',
+        dest='spans',
+    )
+    # The lexer does not see the structure of the document
+    add_limit_arguments(parser=tokenize_parser, structure=False)
+
+    serve_parser = subparsers.add_parser(
+        name='serve',
+        description='Validate LittleXML documents sent to a local '
+                    'HTTP endpoint',
+        help='run validation server',
+    )
+    serve_parser.set_defaults(handler=serve)
+    serve_parser.add_argument(
+        '--host',
+        default=DEFAULT_HOST,
+        help=f'address to listen on (default: {DEFAULT_HOST})',
+        dest='host',
+    )
+    serve_parser.add_argument(
+        '--port',
+        type=int,
+        default=DEFAULT_PORT,
+        help=f'port to listen on (default: {DEFAULT_PORT})',
+        dest='port',
+    )
+    serve_parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'maximum number of documents validated at once '
+             f'(default: {DEFAULT_CONCURRENCY})',
+        dest='concurrency',
+    )
+    serve_parser.add_argument(
+        '--threads',
+        type=int,
+        default=0,
+        help='number of threads validating large documents '
+             'outside the event loop (default: 0)',
+        dest='threads',
+    )
+    serve_parser.add_argument(
+        '--spans',
+        action='store_true',
+        help='use span tokens for runs of letters and digits',
+        dest='spans',
+    )
+    add_limit_arguments(parser=serve_parser)
 
     args = parser.parse_args()
     args.handler(parser=parser, args=args)
 
 
+def add_limit_arguments(parser, structure=True):
+    if structure:
+        parser.add_argument(
+            '--max-depth',
+            type=int,
+            default=None,
+            help='maximum nesting depth of elements',
+            dest='max_depth',
+        )
+        parser.add_argument(
+            '--max-name-length',
+            type=int,
+            default=None,
+            help='maximum length of names of elements',
+            dest='max_name_length',
+        )
+    else:
+        parser.set_defaults(max_depth=None, max_name_length=None)
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        default=None,
+        help='maximum number of tokens',
+        dest='max_tokens',
+    )
+    parser.add_argument(
+        '--max-bytes',
+        type=int,
+        default=None,
+        help='maximum size of the input',
+        dest='max_bytes',
+    )
+
+
 def print_help(parser, args):
     parser.print_help()
 
 
+def get_limits(args):
+    return Limits(
+        max_depth=args.max_depth,
+        max_tokens=args.max_tokens,
+        max_bytes=args.max_bytes,
+        max_name_length=args.max_name_length,
+    )
+
+
+def open_lexer(args, stack, stats=None, diagnostics=None, lines=False):
+    """
+    Create a lexer for the input file, memory-mapping the file if requested.
+    Files that cannot be memory-mapped, such as pipes, are read in chunks.
+    :param args: Parsed command line arguments
+    :param stack: Exit stack keeping the memory-mapped file open
+    :param stats: `Statistics` object passed to the lexer
+    :param diagnostics: `Diagnostics` passed to the lexer in recovery mode
+    :param lines: Whether the lexer indexes the starts of lines
+    :return: Lexer yielding tokens lazily
+    """
+    if args.memory_map:
+        try:
+            mapped = stack.enter_context(map_file(input_file=args.input_file))
+        except (OSError, ValueError):
+            pass
+        else:
+            # Only the default scanner can recover from errors
+            return Lexer(
+                input_string=mapped,
+                spans=args.spans,
+                scanner='regex' if diagnostics is None else 'default',
+                lazy=True,
+                stats=stats,
+                limits=get_limits(args=args),
+                diagnostics=diagnostics,
+                lines=lines,
+            )
+    return StreamLexer(
+        input_file=args.input_file,
+        spans=args.spans,
+        stats=stats,
+        limits=get_limits(args=args),
+        diagnostics=diagnostics,
+        lines=lines,
+    )
+
+
 def tokenize(parser, args):
-    lexer = Lexer(input_string=args.input_file.read())
-    if args.short:
-        for token in lexer:
-            print(token, file=args.output_file)
-    else:
-        json.dump(lexer.as_dict(), args.output_file, indent=2)
-        args.output_file.write('\n')
+    with contextlib.ExitStack() as stack:
+        lexer = open_lexer(args=args, stack=stack)
+        try:
+            if args.short:
+                for token in lexer:
+                    print(token, file=args.output_file)
+            else:
+                write_tokens(
+                    tokens=lexer,
+                    output_file=args.output_file,
+                    token_format=args.token_format,
+                )
+        except (LexicalError, LimitError) as error:
+            print(f'{error.name} -- {error}', file=sys.stderr)
+            exit(1)
+
+
+def open_cache(args, stack):
+    """
+    Create a validation cache if requested, which is saved when
+    the exit stack is closed.
+    :param args: Parsed command line arguments
+    :param stack: Exit stack saving the cache
+    :return: Validation cache, `None` if not requested
+    """
+    if not args.cache and args.cache_file is None:
+        return None
+    cache = ValidationCache(
+        max_entries=args.cache_size,
+        max_bytes=args.cache_bytes,
+        path=args.cache_file,
+    )
+    stack.enter_context(cache)
+    stack.callback(print_cache, cache=cache)
+    return cache
+
+
+def print_cache(cache):
+    print(f'Cache: {cache.hits} hits, {cache.misses} misses', file=sys.stderr)
 
 
 def validate(parser, args):
-    if args.tokens:
-        token_list = json.load(args.input_file)
-        input_stream = Token.from_list(token_list=token_list)
-    else:
-        input_stream = args.input_file.read()
-    try:
-        Parser(
-            input_stream=input_stream,
-            parse_tokens=args.tokens,
-            verbose=args.verbose,
+    if args.parallel:
+        if (args.paths or args.tokens or args.verbose or args.stats
+                or args.recover or args.lines or args.cache
+                or args.cache_file is not None):
+            parser.error('--parallel can only be used with a single input '
+                         'file, spans and limits')
+        if args.input_file is sys.stdin.buffer:
+            parser.error('--parallel requires an input file')
+        validate_one_parallel(args=args)
+        return
+    if args.lines:
+        if args.paths:
+            parser.error('lines of errors are not available '
+                         'for multiple files')
+        if args.tokens:
+            parser.error('lines of errors are not available for tokens')
+        if args.cache or args.cache_file is not None:
+            parser.error('lines of errors are not available with the cache')
+    if args.max_errors < 1:
+        parser.error('--max-errors must be at least 1')
+    if args.recover:
+        if args.paths:
+            parser.error('recovery mode is not available for multiple files')
+        if args.verbose or args.stats:
+            parser.error('verbose output and statistics are not available '
+                         'in recovery mode')
+        if args.cache or args.cache_file is not None:
+            parser.error('caching is not available in recovery mode')
+        validate_all_errors(args=args)
+        return
+    with contextlib.ExitStack() as stack:
+        cache = open_cache(args=args, stack=stack)
+        if args.paths:
+            validate_many(parser=parser, args=args, cache=cache)
+        else:
+            validate_one(args=args, cache=cache)
+
+
+def validate_one(args, cache):
+    stats = Statistics() if args.stats else None
+    limits = get_limits(args=args)
+    with contextlib.ExitStack() as stack:
+        key = None
+        try:
+            if cache is not None:
+                # The whole input is needed for looking it up in the cache
+                content = args.input_file.read()
+                key = cache.key(
+                    content=content,
+                    options=cache_options(
+                        tokens=args.tokens,
+                        token_format=args.token_format,
+                        spans=args.spans,
+                        limits=limits,
+                    ),
+                )
+                cached = cache.get(key=key)
+                if cached is not None:
+                    error_name, message = cached
+                    print_result(
+                        error_name=error_name,
+                        message=message,
+                        stats=stats,
+                    )
+                    return
+                input_file = io.BytesIO(content)
+            else:
+                input_file = args.input_file
+            if args.tokens:
+                input_stream = read_tokens(
+                    input_file=input_file,
+                    token_format=args.token_format,
+                )
+            elif cache is not None:
+                input_stream = Lexer(
+                    input_string=content,
+                    spans=args.spans,
+                    scanner='regex',
+                    lazy=True,
+                    stats=stats,
+                    limits=limits,
+                )
+            else:
+                input_stream = open_lexer(
+                    args=args,
+                    stack=stack,
+                    stats=stats,
+                    lines=args.lines,
+                )
+            Parser(
+                input_stream=input_stream,
+                parse_tokens=True,
+                spans=args.spans,
+                verbose=args.verbose,
+                stats=stats,
+                limits=limits,
+            )
+        except (LexicalError, ParsingError, FormatError, LimitError) as error:
+            if key is not None:
+                cache.put(key=key, error_name=error.name, message=str(error))
+            message = str(error)
+            if args.lines:
+                message += format_location(
+                    lexer=input_stream,
+                    position=getattr(error, 'position', None),
+                )
+            print_result(
+                error_name=error.name,
+                message=message,
+                stats=stats,
+            )
+        else:
+            if key is not None:
+                cache.put(key=key)
+            print_result(error_name=None, message=None, stats=stats)
+
+
+def validate_one_parallel(args):
+    args.input_file.close()
+    result = validate_parallel(
+        path=args.input_file.name,
+        jobs=args.jobs,
+        spans=args.spans,
+        limits=get_limits(args=args),
+    )
+    print_result(
+        error_name=result.error_name,
+        message=result.message,
+        stats=None,
+    )
+
+
+def validate_all_errors(args):
+    diagnostics = Diagnostics(max_errors=args.max_errors)
+    with contextlib.ExitStack() as stack:
+        try:
+            if args.tokens:
+                input_stream = read_tokens(
+                    input_file=args.input_file,
+                    token_format=args.token_format,
+                )
+            else:
+                input_stream = open_lexer(
+                    args=args,
+                    stack=stack,
+                    diagnostics=diagnostics,
+                    lines=args.lines,
+                )
+            Parser(
+                input_stream=input_stream,
+                parse_tokens=True,
+                spans=args.spans,
+                limits=get_limits(args=args),
+                diagnostics=diagnostics,
+            )
+        except (FormatError, LimitError) as error:
+            lexer = input_stream if args.lines else None
+            print_diagnostics(diagnostics=diagnostics, lexer=lexer)
+            location = ''
+            if lexer is not None:
+                location = format_location(
+                    lexer=lexer,
+                    position=getattr(error, 'position', None),
+                )
+            print(f'{error.name} -- {error}{location}', file=sys.stderr)
+            exit(1)
+        # Memory-mapped input is needed for finding lines of errors
+        print_diagnostics(
+            diagnostics=diagnostics,
+            lexer=input_stream if args.lines else None,
         )
-    except (LexicalError, ParsingError) as error:
-        print(f'{error.name} -- {error}', file=sys.stderr)
+    if not diagnostics.ok:
         exit(1)
-    else:
-        print(f'OK', file=sys.stderr)
+    print(f'OK', file=sys.stderr)
+
+
+def print_diagnostics(diagnostics, lexer=None):
+    for diagnostic in diagnostics:
+        location = ''
+        if lexer is not None:
+            location = format_location(
+                lexer=lexer,
+                position=diagnostic.position,
+            )
+        print(f'{diagnostic}{location}', file=sys.stderr)
+    if diagnostics.ok:
+        return
+    count = len(diagnostics)
+    summary = f'{count} error' if count == 1 else f'{count} errors'
+    if diagnostics.stopped:
+        summary += ', stopped'
+    print(summary, file=sys.stderr)
+
+
+def format_location(lexer, position):
+    """
+    Format the line and column of an error found by a lexer indexing
+    the starts of lines.
+    :param lexer: Lexer of the input
+    :param position: Position of the error, `None` if unknown
+    :return: Line and column in parentheses, an empty string if unknown
+    """
+    if position is None:
+        return ''
+    try:
+        line, column = lexer.location(position=position)
+    except ValueError:
+        return ''
+    return f' (line {line}, column {column})'
+
+
+def print_result(error_name, message, stats):
+    print_stats(stats=stats)
+    if error_name is not None:
+        print(f'{error_name} -- {message}', file=sys.stderr)
+        exit(1)
+    print(f'OK', file=sys.stderr)
+
+
+def print_stats(stats):
+    if stats is not None:
+        json.dump(stats.as_dict(), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+def validate_many(parser, args, cache):
+    if args.verbose or args.stats:
+        parser.error('verbose output and statistics are not available '
+                     'for multiple files')
+    results = validate_files(
+        paths=find_files(paths=args.paths, pattern=args.pattern),
+        jobs=args.jobs,
+        ordered=not args.unordered,
+        tokens=args.tokens,
+        token_format=args.token_format,
+        spans=args.spans,
+        memory_map=args.memory_map,
+        limits=get_limits(args=args),
+        cache=cache,
+    )
+    total = 0
+    failed = 0
+    for result in results:
+        total += 1
+        if not result.ok:
+            failed += 1
+        print(result)
+    print(f'{total} files, {total - failed} OK, {failed} failed',
+          file=sys.stderr)
+    if failed:
+        exit(1)
+
+
+def serve(parser, args):
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if args.threads:
+            executor = stack.enter_context(
+                concurrent.futures.ThreadPoolExecutor(
+                    max_workers=args.threads,
+                ),
+            )
+        server = ValidationServer(
+            host=args.host,
+            port=args.port,
+            concurrency=args.concurrency,
+            spans=args.spans,
+            limits=get_limits(args=args),
+            executor=executor,
+        )
+        try:
+            asyncio.run(run_server(server=server))
+        except OSError as error:
+            print(f'{error.strerror} -- {args.host}:{args.port}',
+                  file=sys.stderr)
+            exit(1)
+        except KeyboardInterrupt:
+            pass
+
+
+async def run_server(server):
+    await server.start()
+    print(f'Listening on http://{server.host}:{server.port}{VALIDATE_PATH}',
+          file=sys.stderr)
+    await server.serve_forever()
 
 
 if __name__ == '__main__':
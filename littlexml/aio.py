@@ -0,0 +1,218 @@
+import asyncio
+import codecs
+
+from littlexml.lexer import DEFAULT_CHUNK_SIZE, LexicalError, StreamLexer
+from littlexml.limits import Limits, token_limit_error
+from littlexml.parser import Parser, ParserState, select_grammar
+
+
+class _NeedMore(Exception):
+    """
+    Raised to stop parsing when all tokens lexed so far were parsed.
+    """
+
+
+class _FeedLexer(StreamLexer):
+    """
+    Lexer receiving the input in chunks pushed to it, instead of reading
+    them from a file. Tokens found without looking past the end of
+    the buffer are returned, the rest of the buffer is lexed again later.
+    :param spans: Whether to produce span tokens
+    :param limits: `Limits` on the size of the input
+    """
+
+    def __init__(self, spans=False, limits=None):
+        super().__init__(input_file=None, spans=spans, limits=limits)
+        self._position = 0
+        self._safe = 0
+        # Whether the lexer looked past the end of the buffer
+        self._starved = False
+
+    def feed(self, chunk):
+        """
+        Add a chunk to the buffer, discarding characters lexed before.
+        :param chunk: String
+        :raises LimitError: If the input read so far is over the size limit
+        """
+        consumed = self._safe - self._buffer_start
+        self._buffer = self._buffer[consumed:] + chunk
+        self._buffer_start = self._safe
+        self.limits.check_size(size=self._buffer_start + len(self._buffer))
+
+    def scan(self, final=False):
+        """
+        Lex the buffered characters, up to the first token that may
+        continue in the next chunk.
+        :param final: Whether the end of input was reached
+        :return: Tuple of the list of tokens and the lexical error found
+            after them, `None` if there is no error
+        """
+        result = []
+        self._starved = False
+        try:
+            for tokens, end in self._scan_groups(start=self._safe):
+                if self._starved and not final:
+                    break
+                result.extend(tokens)
+                self._safe = end
+        except LexicalError as error:
+            # Errors at the end of the buffer may be caused by
+            # a token continuing in the next chunk
+            if final or not self._starved:
+                return result, error
+        return result, None
+
+    def _fill_buffer(self):
+        """
+        Chunks are only added by `feed`.
+        :return: `False`
+        """
+        self._starved = True
+        return False
+
+
+class _TokenQueue:
+    """
+    Iterator over the tokens lexed so far, raising `_NeedMore` instead
+    of stopping when there are none left.
+    """
+
+    def __init__(self):
+        self.tokens = []
+        self._index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            token = self.tokens[self._index]
+        except IndexError:
+            self.tokens = []
+            self._index = 0
+            raise _NeedMore
+        self._index += 1
+        return token
+
+
+class ChunkValidator:
+    """
+    Validates a LittleXML document pushed to it in chunks, parsing
+    the tokens of each chunk as soon as they are lexed. The state of
+    the parser is kept between chunks, so each chunk is processed in time
+    proportional to its size.
+    Positions reported by errors are character offsets in the document.
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation, the size is
+        counted in characters
+    """
+
+    def __init__(self, spans=False, limits=None):
+        self.spans = spans
+        self.limits = limits if limits is not None else Limits()
+        self._lexer = _FeedLexer(spans=spans, limits=self.limits)
+        # Tokens are counted by the lexer, as the parser sees them in parts
+        self._parser_limits = Limits(
+            max_depth=self.limits.max_depth,
+            max_name_length=self.limits.max_name_length,
+        )
+        self._queue = _TokenQueue()
+        self._token_count = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(
+            errors='replace',
+        )
+        _, table = select_grammar(spans=spans)
+        self._state = ParserState(stack=[table.end, table.start])
+
+    def feed(self, chunk, final=False):
+        """
+        Validate the next chunk of the document.
+        :param chunk: String or bytes-like object encoded in UTF-8
+        :param final: Whether this is the last chunk
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        :raises ParsingError: If an unexpected token or end of input is
+            found in the input stream
+        :raises LimitError: If the document is over any of the limits
+        """
+        if not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk, final)
+        self._lexer.feed(chunk=chunk)
+        tokens, error = self._lexer.scan(final=final)
+        self._token_count += len(tokens)
+        max_tokens = self.limits.max_tokens
+        if max_tokens is not None and self._token_count > max_tokens:
+            allowed = len(tokens) - (self._token_count - max_tokens)
+            error = token_limit_error(
+                max_tokens=max_tokens,
+                token=tokens[allowed],
+            )
+            tokens = tokens[:allowed]
+        # Tokens before an error are parsed first, as with a lazy lexer
+        if tokens:
+            self._queue.tokens = tokens
+            try:
+                Parser(
+                    input_stream=self._queue,
+                    parse_tokens=True,
+                    spans=self.spans,
+                    limits=self._parser_limits,
+                    state=self._state,
+                )
+            except _NeedMore:
+                pass
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Validate the end of the document.
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        :raises ParsingError: If an unexpected token or end of input is
+            found in the input stream
+        :raises LimitError: If the document is over any of the limits
+        """
+        self.feed(chunk=b'', final=True)
+
+
+async def validate_async(reader, spans=False, limits=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                         offload_after=0):
+    """
+    Validate a LittleXML document read from an `asyncio.StreamReader`,
+    or any object with a `read` coroutine returning bytes or strings.
+    Each chunk is lexed and parsed as soon as it is read, and control
+    is returned to the event loop after every chunk, so that validating
+    large documents does not block other tasks.
+    Chunks can be processed in an executor instead, which keeps the event
+    loop free while the CPU-heavy work is done.
+    :param reader: Stream reader
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation, the size is
+        counted in characters
+    :param chunk_size: Maximum number of bytes read at once
+    :param executor: `concurrent.futures.Executor` processing the chunks,
+        `None` to process them in the event loop
+    :param offload_after: Number of bytes read before chunks are processed
+        in the executor, so that small documents avoid its overhead
+    :raises LexicalError: If an unexpected character or end of input is
+        found in the input stream
+    :raises ParsingError: If an unexpected token or end of input is
+        found in the input stream
+    :raises LimitError: If the document is over any of the limits
+    """
+    loop = asyncio.get_running_loop()
+    validator = ChunkValidator(spans=spans, limits=limits)
+    size = 0
+    final = False
+    while not final:
+        chunk = await reader.read(chunk_size)
+        final = not chunk
+        size += len(chunk)
+        if executor is not None and size > offload_after:
+            await loop.run_in_executor(executor, validator.feed, chunk, final)
+        else:
+            validator.feed(chunk=chunk, final=final)
+            # Reading buffered data does not suspend the task
+            await asyncio.sleep(0)
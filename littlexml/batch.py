@@ -0,0 +1,256 @@
+import re
+from array import array
+
+from littlexml.grammar_tables import CHARACTER_TYPES
+from littlexml.lexer import WHITESPACE_CLASS, LexicalError
+from littlexml.limits import LimitError
+from littlexml.parser import Parser, ParsingError
+from littlexml.rule import RULE_DICT, RuleType
+from littlexml.token import TokenType
+
+
+# Codes of validation results
+OK = 0
+LEXICAL_ERROR = 1
+PARSING_ERROR = 2
+LIMIT_ERROR = 3
+
+ERROR_CODES = {
+    LexicalError: LEXICAL_ERROR,
+    ParsingError: PARSING_ERROR,
+    LimitError: LIMIT_ERROR,
+}
+ERROR_NAMES = {
+    LEXICAL_ERROR: LexicalError.name,
+    PARSING_ERROR: ParsingError.name,
+    LIMIT_ERROR: LimitError.name,
+}
+
+# Offset of errors that do not report a position
+NO_OFFSET = -1
+
+
+def _char_class(token_types):
+    """
+    Build a character class of a regular expression from the characters
+    of single-character tokens in the grammar.
+    :param token_types: Token types of the characters
+    :return: Character class matching any of the characters
+    """
+    chars = ''.join(
+        char
+        for char, token_type in CHARACTER_TYPES.items()
+        if token_type in token_types
+    )
+    return f'[{re.escape(chars)}]'
+
+
+def _first_class(rule_type):
+    """
+    Build a character class from the characters that start a non-empty
+    production of a rule in the grammar.
+    :param rule_type: Rule of the grammar
+    :return: Character class matching any of the characters
+    """
+    return _char_class(token_types={
+        token_type
+        for (rule, token_type), production in RULE_DICT.items()
+        if rule == rule_type and production
+    })
+
+
+# Elements have either a single child element or text, so valid documents
+# are a chain of opening tags followed by an empty element or text, and
+# by the closing tags. Names of the tags are compared separately.
+# Characters of names, words and numbers are taken from the grammar,
+# the other tokens are those of the lexer. A word does not contain
+# the start of `?>`.
+_NAME = rf'{_first_class(RuleType.NAME)}{_first_class(RuleType.NAME_CHARS)}*'
+_WORD = rf'(?:(?!\?>){_first_class(RuleType.WORD)})+'
+_NUMBER = rf'{_first_class(RuleType.NUMBER)}+'
+_DOCUMENT = (
+    rf'(?:<\?xml version={_NUMBER}{_char_class({TokenType.DOT})}{_NUMBER}'
+    rf'\?>{WHITESPACE_CLASS}*)?'
+    rf'(?P<open>(?:<{_NAME}>{WHITESPACE_CLASS}*)*)'
+    rf'(?:<(?P<empty>{_NAME})/>{WHITESPACE_CLASS}*'
+    rf'|(?P<text>{_WORD}(?:{WHITESPACE_CLASS}+{_WORD})*))'
+    rf'(?P<close>(?:</{_NAME}>{WHITESPACE_CLASS}*)*)'
+)
+DOCUMENT_PATTERN = re.compile(_DOCUMENT)
+BYTES_DOCUMENT_PATTERN = re.compile(_DOCUMENT.encode())
+_TAG_NAME_PATTERN = re.compile(rf'</?({_NAME})')
+_BYTES_TAG_NAME_PATTERN = re.compile(_TAG_NAME_PATTERN.pattern.encode())
+
+
+class BatchResult:
+    """
+    Results of validating a batch of documents, stored in columns
+    of typed arrays instead of separate objects.
+    :param codes: Result code of each document, `OK` if valid
+    :param offsets: Position reported by the error of each document,
+        `NO_OFFSET` if valid or if the error has no position
+    :param messages: Error message of each document, `None` if valid,
+        or `None` instead of the list if messages were not requested
+    """
+
+    def __init__(self, codes, offsets, messages=None):
+        self.codes = codes
+        self.offsets = offsets
+        self.messages = messages
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __repr__(self):
+        return f'<BatchResult: {len(self)} documents, {self.failed} failed>'
+
+    @property
+    def failed(self):
+        """number of invalid documents"""
+        return len(self.codes) - self.codes.count(OK)
+
+    def ok(self, index):
+        """
+        Check whether a document is valid.
+        :param index: Index of the document
+        :return: `True` if the document is valid
+        """
+        return self.codes[index] == OK
+
+    def error_name(self, index):
+        """
+        Get the name of the error of a document.
+        :param index: Index of the document
+        :return: Name of the error, `None` if the document is valid
+        """
+        return ERROR_NAMES.get(self.codes[index])
+
+
+class BatchValidator:
+    """
+    Validates many small documents, sharing the setup between them.
+    Valid documents are recognized by a single precompiled regular
+    expression over the whole document, with the characters of names
+    and words taken from the grammar tables, and a comparison of the names
+    of its tags, without producing any tokens. Documents that are not
+    recognized, or that may be over a limit, are validated by the parser,
+    which reports the same error as when validating them one by one.
+    :param spans: Whether to use span tokens, which only affects errors
+    :param limits: `Limits` enforced during validation of each document
+    :param messages: Whether to keep error messages
+    """
+
+    def __init__(self, spans=False, limits=None, messages=False):
+        self.spans = spans
+        self.limits = limits
+        self.messages = messages
+        if limits is None:
+            self._max_depth = self._max_name_length = None
+            self._max_bytes = self._max_tokens = None
+        else:
+            self._max_depth = limits.max_depth
+            self._max_name_length = limits.max_name_length
+            self._max_bytes = limits.max_bytes
+            self._max_tokens = limits.max_tokens
+
+    def validate(self, documents):
+        """
+        Validate documents.
+        :param documents: Iterable of strings or bytes-like objects
+        :return: `BatchResult` with a result for each document
+        """
+        codes = array('B')
+        offsets = array('q')
+        messages = [] if self.messages else None
+        match_string = DOCUMENT_PATTERN.fullmatch
+        match_bytes = BYTES_DOCUMENT_PATTERN.fullmatch
+        for document in documents:
+            if isinstance(document, str):
+                match = match_string(document)
+            else:
+                match = match_bytes(document)
+            if match is not None and self._accept(
+                    document=document, match=match):
+                codes.append(OK)
+                offsets.append(NO_OFFSET)
+                if messages is not None:
+                    messages.append(None)
+                continue
+            code, offset, message = self._parse(document=document)
+            codes.append(code)
+            offsets.append(offset)
+            if messages is not None:
+                messages.append(message)
+        return BatchResult(codes=codes, offsets=offsets, messages=messages)
+
+    def _accept(self, document, match):
+        """
+        Check the names and limits of a document matching the pattern.
+        :param document: String or bytes-like object
+        :param match: Match of the document pattern
+        :return: `True` if the document is valid and within the limits,
+            `False` if it has to be validated by the parser
+        """
+        if isinstance(document, str):
+            find_names = _TAG_NAME_PATTERN.findall
+        else:
+            find_names = _BYTES_TAG_NAME_PATTERN.findall
+        open_names = find_names(match.group('open'))
+        # Text is only allowed inside an element
+        if not open_names and match.group('empty') is None:
+            return False
+        close_names = find_names(match.group('close'))
+        open_names.reverse()
+        if open_names != close_names:
+            return False
+        if self.limits is None:
+            return True
+
+        empty = match.group('empty')
+        depth = len(open_names) + (empty is not None)
+        if self._max_depth is not None and depth > self._max_depth:
+            return False
+        if self._max_name_length is not None:
+            if empty is not None:
+                open_names.append(empty)
+            if any(len(name) > self._max_name_length for name in open_names):
+                return False
+        if self._max_bytes is not None and len(document) > self._max_bytes:
+            return False
+        # Every token but the end of input covers at least one character
+        if (self._max_tokens is not None
+                and len(document) + 1 > self._max_tokens):
+            return False
+        return True
+
+    def _parse(self, document):
+        """
+        Validate a document using the parser.
+        :param document: String or bytes-like object
+        :return: Tuple of the result code, offset and message
+        """
+        try:
+            Parser(input_stream=document, spans=self.spans,
+                   limits=self.limits)
+        except (LexicalError, ParsingError, LimitError) as error:
+            if error.position is None:
+                offset = NO_OFFSET
+            else:
+                offset = error.position
+            message = str(error) if self.messages else None
+            return ERROR_CODES[type(error)], offset, message
+        return OK, NO_OFFSET, None
+
+
+def validate_many(documents, spans=False, limits=None, messages=False):
+    """
+    Validate many documents, which is several times faster than validating
+    small documents one by one.
+    :param documents: Iterable of strings or bytes-like objects
+    :param spans: Whether to use span tokens, which only affects errors
+    :param limits: `Limits` enforced during validation of each document
+    :param messages: Whether to keep error messages
+    :return: `BatchResult` with a result for each document
+    """
+    validator = BatchValidator(spans=spans, limits=limits, messages=messages)
+    return validator.validate(documents=documents)
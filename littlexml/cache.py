@@ -0,0 +1,209 @@
+import collections
+import hashlib
+import json
+import os
+import tempfile
+
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Cached results are only valid for the version they were produced with
+CACHE_VERSION = 1
+
+_READ_SIZE = 1024 * 1024
+
+# Estimated memory used by an entry, in addition to its strings
+_ENTRY_OVERHEAD = 64
+
+
+class ValidationCache:
+    """
+    Cache of validation results keyed by a hash of the validated content
+    and of the options affecting the result.
+    Results are stored as the name of the error and its message, or `None`
+    for both if the content is valid. The least recently used entries are
+    evicted when there are more entries or bytes than allowed.
+    The cache can be stored in a file, which is loaded when the cache is
+    created and saved by `save` or when leaving a `with` block.
+    :param max_entries: Maximum number of entries, `None` for no limit
+    :param max_bytes: Maximum estimated size of the entries in bytes,
+        `None` for no limit
+    :param path: Path to the file storing the cache
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None,
+                 path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        if path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+    @property
+    def nbytes(self):
+        """estimated size of the entries in bytes"""
+        return self._bytes
+
+    def key(self, content, options=''):
+        """
+        Get the key of a content.
+        :param content: Bytes-like object or string
+        :param options: String describing options affecting the result
+        :return: Key as a hexadecimal string
+        """
+        digest = self._new_hash(options=options)
+        if isinstance(content, str):
+            content = content.encode()
+        digest.update(content)
+        return digest.hexdigest()
+
+    def file_key(self, path, options=''):
+        """
+        Get the key of the content of a file, reading it in chunks.
+        :param path: Path to the file
+        :param options: String describing options affecting the result
+        :return: Key as a hexadecimal string
+        :raises OSError: If the file cannot be read
+        """
+        digest = self._new_hash(options=options)
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(_READ_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a result, counting hits and misses.
+        :param key: Key of the content
+        :return: Tuple of the error name and message, `None` if not cached
+        """
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, error_name=None, message=None):
+        """
+        Store a result, evicting the least recently used entries if needed.
+        :param key: Key of the content
+        :param error_name: Name of the error, `None` if valid
+        :param message: Error message, `None` if valid
+        """
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, *self._entries.pop(key))
+        self._entries[key] = (error_name, message)
+        self._bytes += self._entry_size(key, error_name, message)
+        self._evict()
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def load(self):
+        """
+        Load entries from the cache file. Missing files, files written
+        by other versions and files that are not valid cache files
+        are ignored, and replaced when the cache is saved.
+        """
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return
+        try:
+            entries = [
+                (key, error_name, message)
+                for key, error_name, message in data['entries']
+            ]
+        except (KeyError, TypeError, ValueError):
+            return
+        if not all(
+            isinstance(key, str)
+            and all(
+                value is None or isinstance(value, str)
+                for value in (error_name, message)
+            )
+            for key, error_name, message in entries
+        ):
+            return
+        for key, error_name, message in entries:
+            self.put(key=key, error_name=error_name, message=message)
+
+    def save(self):
+        """
+        Write entries to the cache file, from the least recently used.
+        The file is replaced at once, so that it is never left incomplete.
+        """
+        if self.path is None:
+            return
+        data = {
+            'version': CACHE_VERSION,
+            'entries': [
+                [key, error_name, message]
+                for key, (error_name, message) in self._entries.items()
+            ],
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(data, file)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def as_dict(self):
+        """
+        Get counters in a serializable format.
+        :return: Counters as dict
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
+
+    @staticmethod
+    def _new_hash(options):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{CACHE_VERSION}:{options}\0'.encode())
+        return digest
+
+    @staticmethod
+    def _entry_size(key, error_name, message):
+        return (
+            _ENTRY_OVERHEAD + len(key)
+            + len(error_name or '') + len(message or '')
+        )
+
+    def _evict(self):
+        while self._entries and (
+                self.max_entries is not None
+                and len(self._entries) > self.max_entries
+                or self.max_bytes is not None
+                and self._bytes > self.max_bytes):
+            key, (error_name, message) = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(key, error_name, message)
@@ -0,0 +1,66 @@
+DEFAULT_MAX_ERRORS = 100
+
+
+class Diagnostic:
+    """
+    Error found in recovery mode.
+    :param error: Lexical or parsing error
+    :param position: Position of the error, `None` if found at the end
+        of a token stream
+    """
+    __slots__ = ('error', 'position')
+
+    def __init__(self, error, position):
+        self.error = error
+        self.position = position
+
+    def __repr__(self):
+        return f'<Diagnostic [{self.position}]: {self}>'
+
+    def __str__(self):
+        return f'{self.error.name} -- {self.error}'
+
+
+class Diagnostics:
+    """
+    Collects errors found by the lexer and the parser in recovery mode,
+    in which they continue after an error instead of stopping at it.
+    Errors are collected in the order in which they are found, which is
+    the order of their positions when the input is lexed lazily.
+    :param max_errors: Number of errors after which lexing and parsing
+        are stopped when another error is found, `None` for no limit
+    """
+
+    def __init__(self, max_errors=DEFAULT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.errors = []
+        self.stopped = False
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __iter__(self):
+        return iter(self.errors)
+
+    @property
+    def ok(self):
+        """whether no errors were found"""
+        return not self.errors
+
+    def report(self, error, position):
+        """
+        Add an error, unless the limit of errors has been reached.
+        :param error: Lexical or parsing error
+        :param position: Position of the error
+        :raises TooManyErrors: If the error is over the limit
+        """
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self.stopped = True
+            raise TooManyErrors(
+                f'Stopped after {self.max_errors} errors'
+            )
+        self.errors.append(Diagnostic(error=error, position=position))
+
+
+class TooManyErrors(Exception):
+    name = 'Too many errors'
@@ -0,0 +1,172 @@
+import sys
+from enum import Enum
+
+from littlexml.token import TokenType
+
+
+class EventType(Enum):
+    DECLARATION = 'declaration'
+    START_ELEMENT = 'start_element'
+    TEXT = 'text'
+    END_ELEMENT = 'end_element'
+
+
+class Event:
+    """
+    Structural event produced while parsing a document.
+    Declarations carry the version number as the value, elements carry
+    their name and text carries its content with whitespace between words
+    replaced by single spaces. Positions are those of the first and last
+    character of the declaration, tag or text, not including whitespace
+    after tags.
+    :param event_type: Type of the event
+    :param start: Position where the event starts
+    :param value: Version, name or text
+    :param end: Position where the event ends
+    """
+    __slots__ = ('event_type', 'start', 'value', 'end')
+
+    def __init__(self, event_type, start, value=None, end=None):
+        self.event_type = event_type
+        self.start = start
+        self.value = value
+        self.end = end
+
+    def __repr__(self):
+        return (
+            f'<Event [{self.event_type.value} {self.start}-{self.end}]: '
+            f'{repr(self.value)}>'
+        )
+
+    def to_dict(self):
+        return {
+            'type': self.event_type.value,
+            'start': self.start,
+            'value': self.value,
+            'end': self.end,
+        }
+
+
+def _token_end(token):
+    """
+    Get the position of the last character of a token.
+    :param token: Token with a value
+    :return: End position of span tokens, start position of other tokens
+    """
+    return token.start if token.end is None else token.end
+
+
+class EventBuilder:
+    """
+    Turns tokens accepted by the parser into structural events.
+    Tokens are expected in the order in which the parser matches them,
+    so the builder does not need to validate them.
+    :param handler: Callable receiving events
+    """
+
+    # States of the builder
+    _CONTENT = 0
+    _OPEN_TAG = 1
+    _CLOSE_TAG = 2
+    _DECLARATION = 3
+
+    def __init__(self, handler):
+        self.handler = handler
+        self._state = self._CONTENT
+        self._chars = []
+        self._start = None
+        self._text_end = None
+        # Position of the last character of the name or version in a tag
+        self._tag_end = None
+
+    def feed(self, token):
+        """
+        Process a token matched by the parser.
+        :param token: Matched token
+        """
+        token_type = token.token_type
+
+        if token_type == TokenType.LESS_THAN:
+            self._start_tag(state=self._OPEN_TAG, start=token.start)
+        elif token_type == TokenType.LT_SLASH:
+            self._end_text()
+            # The position of the token is that of the slash
+            self._start_tag(state=self._CLOSE_TAG, start=token.start - 1)
+        elif token_type == TokenType.GREATER_THAN:
+            # Positions of tokens ending tags include the whitespace after
+            # them, the tags end right after the name instead
+            name = self._get_name()
+            if self._state == self._OPEN_TAG:
+                event_type = EventType.START_ELEMENT
+            else:
+                event_type = EventType.END_ELEMENT
+            self._emit(
+                event_type=event_type,
+                value=name,
+                end=self._tag_end + 1,
+            )
+        elif token_type == TokenType.GT_SLASH:
+            name = self._get_name()
+            start = self._start
+            self._emit(
+                event_type=EventType.START_ELEMENT,
+                value=name,
+                end=self._tag_end + 2,
+            )
+            self._start = start
+            self._emit(
+                event_type=EventType.END_ELEMENT,
+                value=name,
+                end=self._tag_end + 2,
+            )
+        elif token_type == TokenType.LT_XML:
+            self._start_tag(state=self._DECLARATION, start=token.start)
+        elif token_type == TokenType.GT_XML:
+            version = ''.join(self._chars)
+            self._emit(
+                event_type=EventType.DECLARATION,
+                value=version,
+                end=self._tag_end + 2,
+            )
+        elif token_type in (TokenType.VERSION, TokenType.END_OF_STRING):
+            pass
+        elif self._state != self._CONTENT:
+            if token_type != TokenType.SPACE:
+                self._chars.append(token.value)
+                self._tag_end = _token_end(token=token)
+        else:
+            # Text content
+            if self._start is None:
+                self._start = token.start
+            if token_type == TokenType.SPACE:
+                self._chars.append(' ')
+            else:
+                self._chars.append(token.value)
+                self._text_end = _token_end(token=token)
+
+    def _start_tag(self, state, start):
+        self._state = state
+        self._start = start
+        self._chars = []
+
+    def _get_name(self):
+        return sys.intern(''.join(self._chars))
+
+    def _end_text(self):
+        if self._state == self._CONTENT and self._start is not None:
+            self._emit(
+                event_type=EventType.TEXT,
+                value=''.join(self._chars),
+                end=self._text_end,
+            )
+
+    def _emit(self, event_type, value, end):
+        self.handler(Event(
+            event_type=event_type,
+            start=self._start,
+            value=value,
+            end=end,
+        ))
+        self._state = self._CONTENT
+        self._start = None
+        self._chars = []
@@ -0,0 +1,359 @@
+import argparse
+import os
+import re
+import sys
+
+from littlexml.rule import first_sets, follow_sets, sequence_first
+from littlexml.token import TOKEN_TYPE_IDS, TokenType
+
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'grammar.bnf')
+TABLES_PATH = os.path.join(os.path.dirname(__file__), 'grammar_tables.py')
+
+# Name of the grammar defined before any `%grammar` line
+DEFAULT_GRAMMAR = 'default'
+EMPTY = '%empty'
+
+_RULE_NAME = re.compile(r'[a-z][a-z0-9_]*')
+_TOKEN_NAME = re.compile(r'[A-Z][A-Z0-9_]*')
+_CHAR_RANGE = re.compile(r"'(.)'(?:-'(.)')?")
+# Quoted characters, or a comment to the end of the line
+_COMMENT = re.compile(r"('.')|#.*")
+
+
+class Grammar:
+    """
+    Context-free grammar read from a grammar file.
+    Rules are referred to by their names, terminals are token types.
+    :param rules: Dict mapping names of rules to lists of alternatives,
+        each a list of rule names and token types. The first rule is
+        the start rule.
+    :param chars: Dict mapping characters to the token types produced
+        by the lexer for them
+    """
+
+    def __init__(self, rules, chars=None):
+        self.rules = rules
+        self.chars = chars if chars is not None else {}
+        self.start = next(iter(rules))
+
+
+def parse_grammar(text):
+    """
+    Read the grammars defined in a grammar file.
+    Rules following a `%grammar` line replace rules of the same name
+    in the default grammar, or are added to it.
+    :param text: Contents of the grammar file
+    :return: Dict mapping names of grammars to `Grammar` objects,
+        the default grammar first
+    :raises GrammarError: If the file cannot be read
+    """
+    sections = {DEFAULT_GRAMMAR: {}}
+    chars = {}
+    rules = sections[DEFAULT_GRAMMAR]
+    rule = None
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = _COMMENT.sub(lambda match: match.group(1) or '', line).strip()
+        if not line:
+            continue
+        directive, _, rest = line.partition(' ')
+        if directive == '%chars':
+            _read_chars(text=rest, chars=chars, line_number=line_number)
+        elif directive == '%grammar':
+            name = rest.strip()
+            if not _RULE_NAME.fullmatch(name) or name in sections:
+                raise GrammarError(
+                    f'Invalid grammar name at line {line_number}: {name}'
+                )
+            rules = sections[name] = {}
+            rule = None
+        elif line.startswith('|'):
+            if rule is None:
+                raise GrammarError(
+                    f'Alternative without a rule at line {line_number}'
+                )
+            rules[rule].append(_read_alternative(
+                text=line[1:],
+                line_number=line_number,
+            ))
+        else:
+            rule, separator, rest = line.partition('::=')
+            rule = rule.strip()
+            if not separator or not _RULE_NAME.fullmatch(rule):
+                raise GrammarError(f'Invalid rule at line {line_number}')
+            if rule in rules:
+                raise GrammarError(
+                    f'Duplicate rule at line {line_number}: {rule}'
+                )
+            rules[rule] = [
+                _read_alternative(text=alternative, line_number=line_number)
+                for alternative in rest.split('|')
+            ]
+    default = sections.pop(DEFAULT_GRAMMAR)
+    if not default:
+        raise GrammarError('No rules defined')
+    grammars = {DEFAULT_GRAMMAR: Grammar(rules=default, chars=chars)}
+    for name, rules in sections.items():
+        grammars[name] = Grammar(rules={**default, **rules}, chars=chars)
+    return grammars
+
+
+def _read_chars(text, chars, line_number):
+    """
+    Read a `%chars` line, assigning characters to a token type.
+    :param text: Rest of the line after `%chars`
+    :param chars: Dict mapping characters to token types, updated in place
+    :param line_number: Number of the line in the grammar file
+    :raises GrammarError: If the line is invalid
+    """
+    names = text.split()
+    if len(names) < 2:
+        raise GrammarError(f'No characters at line {line_number}')
+    name, *items = names
+    token_type = _token_type(name=name, line_number=line_number)
+    for item in items:
+        match = _CHAR_RANGE.fullmatch(item)
+        if match is None:
+            raise GrammarError(
+                f'Invalid characters at line {line_number}: {item}'
+            )
+        first, last = match.group(1), match.group(2) or match.group(1)
+        for code in range(ord(first), ord(last) + 1):
+            char = chr(code)
+            if char in chars:
+                raise GrammarError(
+                    f'Duplicate character at line {line_number}: {char!r}'
+                )
+            chars[char] = token_type
+
+
+def _read_alternative(text, line_number):
+    """
+    Read an alternative of a rule.
+    :param text: Names of rules and token types separated by whitespace,
+        or `%empty`
+    :param line_number: Number of the line in the grammar file
+    :return: List of rule names and token types
+    :raises GrammarError: If the alternative is invalid
+    """
+    names = text.split()
+    if names == [EMPTY]:
+        return []
+    if not names or EMPTY in names:
+        raise GrammarError(f'Invalid alternative at line {line_number}')
+    symbols = []
+    for name in names:
+        if _RULE_NAME.fullmatch(name):
+            symbols.append(name)
+        else:
+            symbols.append(_token_type(name=name, line_number=line_number))
+    return symbols
+
+
+def _token_type(name, line_number):
+    """
+    Find the token type of a terminal.
+    :param name: Name of the token type
+    :param line_number: Number of the line in the grammar file
+    :return: Token type
+    :raises GrammarError: If there is no such token type
+    """
+    if not _TOKEN_NAME.fullmatch(name) or name not in TokenType.__members__:
+        raise GrammarError(
+            f'Unknown token type at line {line_number}: {name}'
+        )
+    return TokenType[name]
+
+
+def compile_rules(grammar):
+    """
+    Compute the LL(1) parse table of a grammar, selecting an alternative
+    of a rule by the next token type. An alternative is selected by
+    the token types in its FIRST set, and also by those in the FOLLOW set
+    of the rule if it can produce no tokens. Rules that cannot be reached
+    from the start rule are left out.
+    :param grammar: `Grammar` to compile
+    :return: Dict mapping tuples of rule names and token types
+        to productions
+    :raises GrammarError: If a rule is not defined, or if the grammar is
+        not LL(1), so that two alternatives are selected by the same
+        token type
+    """
+    rules = _reachable_rules(grammar=grammar)
+    alternatives = {
+        (rule, index): alternative
+        for rule, rule_alternatives in rules.items()
+        for index, alternative in enumerate(rule_alternatives)
+    }
+    first, nullable = first_sets(rule_dict=alternatives)
+    follow = follow_sets(rule_dict=alternatives, start=grammar.start)
+    rule_dict = {}
+    for (rule, _), production in alternatives.items():
+        tokens, production_nullable = sequence_first(
+            symbols=production,
+            first=first,
+            nullable=nullable,
+        )
+        if production_nullable:
+            tokens |= follow[rule]
+        for token_type in sorted(tokens, key=TOKEN_TYPE_IDS.get):
+            if (rule, token_type) in rule_dict:
+                raise GrammarError(
+                    f'LL(1) conflict in rule {rule} on {token_type.name}: '
+                    f'{_format(rule_dict[rule, token_type])} '
+                    f'or {_format(production)}'
+                )
+            rule_dict[rule, token_type] = production
+    return rule_dict
+
+
+def _reachable_rules(grammar):
+    """
+    Find the rules of a grammar that can be reached from the start rule.
+    :param grammar: `Grammar` to search
+    :return: Dict mapping names of reachable rules to lists of
+        alternatives, in the order of the grammar
+    :raises GrammarError: If a reachable rule refers to an undefined rule
+    """
+    reached = {grammar.start}
+    pending = [grammar.start]
+    while pending:
+        rule = pending.pop()
+        for alternative in grammar.rules[rule]:
+            for symbol in alternative:
+                if isinstance(symbol, TokenType) or symbol in reached:
+                    continue
+                if symbol not in grammar.rules:
+                    raise GrammarError(
+                        f'Undefined rule in rule {rule}: {symbol}'
+                    )
+                reached.add(symbol)
+                pending.append(symbol)
+    return {
+        rule: alternatives
+        for rule, alternatives in grammar.rules.items()
+        if rule in reached
+    }
+
+
+def _format(production):
+    """
+    Format a production for error messages.
+    :param production: List of rule names and token types
+    :return: Production as written in the grammar file
+    """
+    return ' '.join(
+        symbol.name if isinstance(symbol, TokenType) else symbol
+        for symbol in production
+    ) or EMPTY
+
+
+def generate_module(text):
+    """
+    Generate the source of the module holding the tables compiled from
+    a grammar file: the `RuleType` enum of all rules, `CHARACTER_TYPES`
+    for the lexer, and a `RULE_DICT` for each grammar, prefixed with
+    the name of the grammar for grammars other than the default one.
+    :param text: Contents of the grammar file
+    :return: Source of the module
+    :raises GrammarError: If the grammar file is invalid
+    """
+    grammars = parse_grammar(text=text)
+    rule_names = {}
+    for grammar in grammars.values():
+        rule_names.update(dict.fromkeys(grammar.rules))
+    lines = [
+        '# Generated from grammar.bnf by `python -m littlexml.grammar`,',
+        '# do not edit.',
+        'from enum import Enum',
+        '',
+        'from littlexml.token import TokenType',
+        '',
+        '',
+        'class RuleType(Enum):',
+    ]
+    lines.extend(
+        f'    {rule.upper()} = {rule!r}'
+        for rule in rule_names
+    )
+    lines.extend([
+        '',
+        '',
+        '# Token types of characters that the lexer produces single tokens',
+        '# for, except for letters and digits in span mode',
+        'CHARACTER_TYPES = {',
+    ])
+    lines.extend(
+        f'    {char!r}: TokenType.{token_type.name},'
+        for char, token_type in grammars[DEFAULT_GRAMMAR].chars.items()
+    )
+    lines.append('}')
+    for name, grammar in grammars.items():
+        prefix = '' if name == DEFAULT_GRAMMAR else f'{name.upper()}_'
+        lines.extend(['', '', f'{prefix}RULE_DICT = {{'])
+        for (rule, token_type), production in compile_rules(
+            grammar=grammar,
+        ).items():
+            key = f'(RuleType.{rule.upper()}, TokenType.{token_type.name})'
+            if not production:
+                lines.append(f'    {key}: [],')
+                continue
+            lines.append(f'    {key}: [')
+            lines.extend(
+                f'        TokenType.{symbol.name},'
+                if isinstance(symbol, TokenType)
+                else f'        RuleType.{symbol.upper()},'
+                for symbol in production
+            )
+            lines.append('    ],')
+        lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compile the LittleXML grammar into parse tables',
+    )
+    parser.add_argument(
+        '-g', '--grammar-file',
+        default=GRAMMAR_PATH,
+        help='grammar file to compile',
+        dest='grammar_file',
+    )
+    parser.add_argument(
+        '-o', '--output-file',
+        default=TABLES_PATH,
+        help='module to write the tables to',
+        dest='output_file',
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='only check that the module is up to date',
+        dest='check',
+    )
+    args = parser.parse_args()
+
+    with open(args.grammar_file) as grammar_file:
+        text = grammar_file.read()
+    try:
+        source = generate_module(text=text)
+    except GrammarError as error:
+        print(f'{error.name} -- {error}', file=sys.stderr)
+        exit(1)
+    if args.check:
+        with open(args.output_file) as output_file:
+            if output_file.read() != source:
+                print(f'{args.output_file} is out of date', file=sys.stderr)
+                exit(1)
+        return
+    with open(args.output_file, 'w') as output_file:
+        output_file.write(source)
+
+
+class GrammarError(Exception):
+    name = 'Grammar error'
+
+
+if __name__ == '__main__':
+    main()
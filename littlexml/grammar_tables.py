@@ -0,0 +1,404 @@
+# Generated from grammar.bnf by `python -m littlexml.grammar`,
+# do not edit.
+from enum import Enum
+
+from littlexml.token import TokenType
+
+
+class RuleType(Enum):
+    XML_DOCUMENT = 'xml_document'
+    XML_DECLARATION = 'xml_declaration'
+    VERSION_NUMBER = 'version_number'
+    ELEMENT = 'element'
+    OPEN_TAG = 'open_tag'
+    CLOSE_TAG = 'close_tag'
+    WORDS = 'words'
+    NEXT_WORD = 'next_word'
+    NAME = 'name'
+    NAME_CHARS = 'name_chars'
+    NUMBER = 'number'
+    NEXT_DIGIT = 'next_digit'
+    WORD = 'word'
+    NEXT_CHAR = 'next_char'
+
+
+# Token types of characters that the lexer produces single tokens
+# for, except for letters and digits in span mode
+CHARACTER_TYPES = {
+    'a': TokenType.LETTER,
+    'b': TokenType.LETTER,
+    'c': TokenType.LETTER,
+    'd': TokenType.LETTER,
+    'e': TokenType.LETTER,
+    'f': TokenType.LETTER,
+    'g': TokenType.LETTER,
+    'h': TokenType.LETTER,
+    'i': TokenType.LETTER,
+    'j': TokenType.LETTER,
+    'k': TokenType.LETTER,
+    'l': TokenType.LETTER,
+    'm': TokenType.LETTER,
+    'n': TokenType.LETTER,
+    'o': TokenType.LETTER,
+    'p': TokenType.LETTER,
+    'q': TokenType.LETTER,
+    'r': TokenType.LETTER,
+    's': TokenType.LETTER,
+    't': TokenType.LETTER,
+    'u': TokenType.LETTER,
+    'v': TokenType.LETTER,
+    'w': TokenType.LETTER,
+    'x': TokenType.LETTER,
+    'y': TokenType.LETTER,
+    'z': TokenType.LETTER,
+    'A': TokenType.LETTER,
+    'B': TokenType.LETTER,
+    'C': TokenType.LETTER,
+    'D': TokenType.LETTER,
+    'E': TokenType.LETTER,
+    'F': TokenType.LETTER,
+    'G': TokenType.LETTER,
+    'H': TokenType.LETTER,
+    'I': TokenType.LETTER,
+    'J': TokenType.LETTER,
+    'K': TokenType.LETTER,
+    'L': TokenType.LETTER,
+    'M': TokenType.LETTER,
+    'N': TokenType.LETTER,
+    'O': TokenType.LETTER,
+    'P': TokenType.LETTER,
+    'Q': TokenType.LETTER,
+    'R': TokenType.LETTER,
+    'S': TokenType.LETTER,
+    'T': TokenType.LETTER,
+    'U': TokenType.LETTER,
+    'V': TokenType.LETTER,
+    'W': TokenType.LETTER,
+    'X': TokenType.LETTER,
+    'Y': TokenType.LETTER,
+    'Z': TokenType.LETTER,
+    '0': TokenType.DIGIT,
+    '1': TokenType.DIGIT,
+    '2': TokenType.DIGIT,
+    '3': TokenType.DIGIT,
+    '4': TokenType.DIGIT,
+    '5': TokenType.DIGIT,
+    '6': TokenType.DIGIT,
+    '7': TokenType.DIGIT,
+    '8': TokenType.DIGIT,
+    '9': TokenType.DIGIT,
+    '-': TokenType.HYPHEN,
+    '.': TokenType.DOT,
+    ':': TokenType.COLON,
+    '>': TokenType.GREATER_THAN,
+    '@': TokenType.SIGN,
+    '?': TokenType.SIGN,
+    '_': TokenType.UNDERSCORE,
+}
+
+
+RULE_DICT = {
+    (RuleType.XML_DOCUMENT, TokenType.LT_XML): [
+        RuleType.XML_DECLARATION,
+        RuleType.ELEMENT,
+    ],
+    (RuleType.XML_DOCUMENT, TokenType.LESS_THAN): [
+        RuleType.ELEMENT,
+    ],
+    (RuleType.XML_DECLARATION, TokenType.LT_XML): [
+        TokenType.LT_XML,
+        TokenType.SPACE,
+        TokenType.VERSION,
+        RuleType.VERSION_NUMBER,
+        TokenType.GT_XML,
+    ],
+    (RuleType.VERSION_NUMBER, TokenType.DIGIT): [
+        RuleType.NUMBER,
+        TokenType.DOT,
+        RuleType.NUMBER,
+    ],
+    (RuleType.ELEMENT, TokenType.LESS_THAN): [
+        TokenType.LESS_THAN,
+        RuleType.NAME,
+        RuleType.OPEN_TAG,
+    ],
+    (RuleType.OPEN_TAG, TokenType.GREATER_THAN): [
+        TokenType.GREATER_THAN,
+        RuleType.CLOSE_TAG,
+    ],
+    (RuleType.OPEN_TAG, TokenType.GT_SLASH): [
+        TokenType.GT_SLASH,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.LESS_THAN): [
+        RuleType.ELEMENT,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.LETTER): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.DIGIT): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.SIGN): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.WORDS, TokenType.LETTER): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.WORDS, TokenType.DIGIT): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.WORDS, TokenType.SIGN): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.NEXT_WORD, TokenType.SPACE): [
+        TokenType.SPACE,
+        RuleType.WORDS,
+    ],
+    (RuleType.NEXT_WORD, TokenType.LT_SLASH): [],
+    (RuleType.NAME, TokenType.UNDERSCORE): [
+        TokenType.UNDERSCORE,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME, TokenType.COLON): [
+        TokenType.COLON,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME, TokenType.LETTER): [
+        TokenType.LETTER,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.DOT): [
+        TokenType.DOT,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.UNDERSCORE): [
+        TokenType.UNDERSCORE,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.COLON): [
+        TokenType.COLON,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.HYPHEN): [
+        TokenType.HYPHEN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.LETTER): [
+        TokenType.LETTER,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.DIGIT): [
+        TokenType.DIGIT,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.GREATER_THAN): [],
+    (RuleType.NAME_CHARS, TokenType.GT_SLASH): [],
+    (RuleType.NUMBER, TokenType.DIGIT): [
+        TokenType.DIGIT,
+        RuleType.NEXT_DIGIT,
+    ],
+    (RuleType.NEXT_DIGIT, TokenType.DIGIT): [
+        RuleType.NUMBER,
+    ],
+    (RuleType.NEXT_DIGIT, TokenType.DOT): [],
+    (RuleType.NEXT_DIGIT, TokenType.GT_XML): [],
+    (RuleType.WORD, TokenType.LETTER): [
+        TokenType.LETTER,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.WORD, TokenType.DIGIT): [
+        TokenType.DIGIT,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.WORD, TokenType.SIGN): [
+        TokenType.SIGN,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.LETTER): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.DIGIT): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.SIGN): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.SPACE): [],
+    (RuleType.NEXT_CHAR, TokenType.LT_SLASH): [],
+}
+
+
+SPAN_RULE_DICT = {
+    (RuleType.XML_DOCUMENT, TokenType.LT_XML): [
+        RuleType.XML_DECLARATION,
+        RuleType.ELEMENT,
+    ],
+    (RuleType.XML_DOCUMENT, TokenType.LESS_THAN): [
+        RuleType.ELEMENT,
+    ],
+    (RuleType.XML_DECLARATION, TokenType.LT_XML): [
+        TokenType.LT_XML,
+        TokenType.SPACE,
+        TokenType.VERSION,
+        RuleType.VERSION_NUMBER,
+        TokenType.GT_XML,
+    ],
+    (RuleType.VERSION_NUMBER, TokenType.DIGIT_SPAN): [
+        RuleType.NUMBER,
+        TokenType.DOT,
+        RuleType.NUMBER,
+    ],
+    (RuleType.ELEMENT, TokenType.LESS_THAN): [
+        TokenType.LESS_THAN,
+        RuleType.NAME,
+        RuleType.OPEN_TAG,
+    ],
+    (RuleType.OPEN_TAG, TokenType.GREATER_THAN): [
+        TokenType.GREATER_THAN,
+        RuleType.CLOSE_TAG,
+    ],
+    (RuleType.OPEN_TAG, TokenType.GT_SLASH): [
+        TokenType.GT_SLASH,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.LESS_THAN): [
+        RuleType.ELEMENT,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.SIGN): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.ALPHA_SPAN): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.DIGIT_SPAN): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.CLOSE_TAG, TokenType.ALNUM_SPAN): [
+        RuleType.WORDS,
+        TokenType.LT_SLASH,
+        RuleType.NAME,
+        TokenType.GREATER_THAN,
+    ],
+    (RuleType.WORDS, TokenType.SIGN): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.WORDS, TokenType.ALPHA_SPAN): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.WORDS, TokenType.DIGIT_SPAN): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.WORDS, TokenType.ALNUM_SPAN): [
+        RuleType.WORD,
+        RuleType.NEXT_WORD,
+    ],
+    (RuleType.NEXT_WORD, TokenType.SPACE): [
+        TokenType.SPACE,
+        RuleType.WORDS,
+    ],
+    (RuleType.NEXT_WORD, TokenType.LT_SLASH): [],
+    (RuleType.NAME, TokenType.UNDERSCORE): [
+        TokenType.UNDERSCORE,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME, TokenType.COLON): [
+        TokenType.COLON,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME, TokenType.ALPHA_SPAN): [
+        TokenType.ALPHA_SPAN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.DOT): [
+        TokenType.DOT,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.UNDERSCORE): [
+        TokenType.UNDERSCORE,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.COLON): [
+        TokenType.COLON,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.HYPHEN): [
+        TokenType.HYPHEN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.ALPHA_SPAN): [
+        TokenType.ALPHA_SPAN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.DIGIT_SPAN): [
+        TokenType.DIGIT_SPAN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.ALNUM_SPAN): [
+        TokenType.ALNUM_SPAN,
+        RuleType.NAME_CHARS,
+    ],
+    (RuleType.NAME_CHARS, TokenType.GREATER_THAN): [],
+    (RuleType.NAME_CHARS, TokenType.GT_SLASH): [],
+    (RuleType.NUMBER, TokenType.DIGIT_SPAN): [
+        TokenType.DIGIT_SPAN,
+    ],
+    (RuleType.WORD, TokenType.ALPHA_SPAN): [
+        TokenType.ALPHA_SPAN,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.WORD, TokenType.DIGIT_SPAN): [
+        TokenType.DIGIT_SPAN,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.WORD, TokenType.ALNUM_SPAN): [
+        TokenType.ALNUM_SPAN,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.WORD, TokenType.SIGN): [
+        TokenType.SIGN,
+        RuleType.NEXT_CHAR,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.SIGN): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.ALPHA_SPAN): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.DIGIT_SPAN): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.ALNUM_SPAN): [
+        RuleType.WORD,
+    ],
+    (RuleType.NEXT_CHAR, TokenType.SPACE): [],
+    (RuleType.NEXT_CHAR, TokenType.LT_SLASH): [],
+}
@@ -0,0 +1,704 @@
+from littlexml.lexer import Lexer, LexicalError
+from littlexml.parser import Parser, ParserState, ParsingError, select_grammar
+from littlexml.token import Token
+
+
+DEFAULT_CHECKPOINT_INTERVAL = 256
+
+
+class _Chunk:
+    """
+    Run of tokens lexed from consecutive characters of the input.
+    Positions of the tokens are those in the string they were lexed from,
+    so that chunks can be moved without changing their tokens until they
+    are needed. Chunks
+    after a lexical error may only keep their characters.
+    :param text: Characters of the chunk
+    :param tokens: List of tokens, `None` if the characters are not lexed
+    :param origin: Index of the first character of the chunk in the string
+        the positions of its tokens refer to
+    """
+    __slots__ = ('text', 'tokens', 'origin', 'checkpoint', 'error')
+
+    def __init__(self, text='', tokens=None, origin=0):
+        self.text = text
+        self.tokens = tokens
+        self.origin = origin
+        # State of the parser before the first token, `None` if not known
+        self.checkpoint = None
+        # Error found in the chunk, see `_ErrorTemplate`
+        self.error = None
+
+    def get_tokens(self, offset):
+        """
+        Get tokens with their current positions. Moved tokens replace
+        the old ones, so that they are only moved again after the chunk
+        moves.
+        :param offset: Index of the first character of the chunk
+        :return: List of tokens
+        """
+        delta = offset - self.origin
+        if delta:
+            self.tokens = [
+                _move_token(token=token, delta=delta)
+                for token in self.tokens
+            ]
+            self.origin = offset
+        return self.tokens
+
+
+class _LengthTree:
+    """
+    Fenwick tree of the lengths of chunks, finding the offset of a chunk
+    and the chunk at an offset in logarithmic time.
+    :param lengths: Lengths of the chunks
+    """
+    __slots__ = ('_tree',)
+
+    def __init__(self, lengths=()):
+        # Node `index` holds the sum of the `index & -index` lengths
+        # ending with the length of chunk `index - 1`
+        tree = [0]
+        tree.extend(lengths)
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    @property
+    def total(self):
+        """sum of the lengths of all chunks"""
+        return self.prefix(count=len(self._tree) - 1)
+
+    def prefix(self, count):
+        """
+        Sum up the lengths of the first chunks.
+        :param count: Number of chunks
+        :return: Offset of the chunk after them
+        """
+        tree = self._tree
+        total = 0
+        while count:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def add(self, index, delta):
+        """
+        Change the length of a chunk.
+        :param index: Index of the chunk
+        :param delta: Difference in length
+        """
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def append(self, length):
+        """
+        Add the length of a chunk after the last chunk.
+        :param length: Length of the chunk
+        """
+        index = len(self._tree)
+        self._tree.append(
+            length
+            + self.prefix(count=index - 1)
+            - self.prefix(count=index - (index & -index))
+        )
+
+    def truncate(self, count):
+        """
+        Remove the lengths of chunks after the first chunks.
+        :param count: Number of chunks kept
+        """
+        del self._tree[count + 1:]
+
+    def search(self, offset):
+        """
+        Find the first chunk ending at or after an offset.
+        :param offset: Index of a character
+        :return: Index of the chunk, the number of chunks if there is none
+        """
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = index + step
+            if node < len(tree) and tree[node] < offset:
+                index = node
+                offset -= tree[node]
+            step >>= 1
+        return index
+
+
+class _Checkpoint:
+    """
+    State of the parser between two chunks. The stack and the names
+    of open elements are kept in persistent stacks of nested tuples,
+    which share their bottom parts with the previous checkpoint, so that
+    a checkpoint only takes memory for what changed since then.
+    :param stack: Persistent stack of encoded symbols
+    :param stack_size: Number of symbols on the stack
+    :param names: Persistent stack of interned names of open elements
+    :param names_size: Number of names
+    """
+    __slots__ = ('stack', 'stack_size', 'names', 'names_size')
+
+    def __init__(self, stack, stack_size, names, names_size):
+        self.stack = stack
+        self.stack_size = stack_size
+        self.names = names
+        self.names_size = names_size
+
+    @classmethod
+    def from_state(cls, state, previous=None, previous_state=None):
+        """
+        Store the state of the parser between names.
+        :param state: `ParserState` to store
+        :param previous: `_Checkpoint` to share the stacks with
+        :param previous_state: `ParserState` stored in `previous`
+        :return: Checkpoint of the state
+        """
+        if previous is None:
+            return cls(
+                stack=_persist(items=state.stack),
+                stack_size=len(state.stack),
+                names=_persist(items=state.names),
+                names_size=len(state.names),
+            )
+        return cls(
+            stack=_persist(
+                items=state.stack,
+                previous=previous.stack,
+                previous_items=previous_state.stack,
+            ),
+            stack_size=len(state.stack),
+            names=_persist(
+                items=state.names,
+                previous=previous.names,
+                previous_items=previous_state.names,
+            ),
+            names_size=len(state.names),
+        )
+
+    def restore(self):
+        """
+        Get the state to resume parsing from.
+        :return: `ParserState` updated by the parser
+        """
+        return ParserState(
+            stack=_items(node=self.stack, size=self.stack_size),
+            names=_items(node=self.names, size=self.names_size),
+        )
+
+    def matches(self, other):
+        """
+        Compare the state with another checkpoint.
+        :param other: `_Checkpoint` to compare with
+        :return: `True` if the states are the same
+        """
+        return (
+            self.stack_size == other.stack_size
+            and self.names_size == other.names_size
+            and _same_items(node=self.stack, other=other.stack)
+            and _same_items(node=self.names, other=other.names)
+        )
+
+
+class _ErrorTemplate:
+    """
+    Error found in a chunk, with the position it reports kept relative
+    to the chunk, so that the error is formatted with the current position
+    only when requested.
+    :param error: Lexical or parsing error
+    :param offset: Index of the first character of the chunk at the time
+        of the error
+    """
+    __slots__ = ('error_type', 'head', 'tail', 'position')
+
+    def __init__(self, error, offset):
+        self.error_type = type(error)
+        message = str(error)
+        head, separator, tail = message.partition(
+            f'position {error.position}'
+        )
+        if error.position is None or not separator:
+            self.head = message
+            self.tail = None
+            self.position = error.position
+        else:
+            self.head = f'{head}position '
+            self.tail = tail
+            self.position = error.position - offset
+
+    def format(self, offset):
+        """
+        Create the error for the current position of the chunk.
+        :param offset: Index of the first character of the chunk
+        :return: Lexical or parsing error
+        """
+        if self.tail is None:
+            return self.error_type(self.head, position=self.position)
+        position = self.position + offset
+        return self.error_type(
+            f'{self.head}{position}{self.tail}',
+            position=position,
+        )
+
+
+class _Converged(Exception):
+    """
+    Raised to stop parsing when the parser reaches a checkpoint
+    with the same state as before the edit.
+    """
+
+
+def _persist(items, previous=None, previous_items=()):
+    """
+    Store a list in a persistent stack, sharing the nodes of the longest
+    common bottom part with the stack of a previous list.
+    :param items: List with the top at the end
+    :param previous: Persistent stack of the previous list
+    :param previous_items: The previous list
+    :return: Top node of the stack, `None` if empty
+    """
+    # Compare slices to find the common part without a loop per item
+    low = 0
+    high = min(len(items), len(previous_items))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if items[low:middle] == previous_items[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    node = previous
+    for _ in range(len(previous_items) - low):
+        node = node[1]
+    for item in items[low:]:
+        node = (item, node)
+    return node
+
+
+def _items(node, size):
+    """
+    Get the items of a persistent stack.
+    :param node: Top node of the stack
+    :param size: Number of items
+    :return: List with the top at the end
+    """
+    items = [None] * size
+    while node is not None:
+        size -= 1
+        items[size], node = node
+    return items
+
+
+def _same_items(node, other):
+    """
+    Compare two persistent stacks of the same size.
+    :param node: Top node of a stack
+    :param other: Top node of the other stack
+    :return: `True` if the stacks have the same items
+    """
+    # Shared nodes are only compared by identity
+    while node is not other:
+        if node[0] != other[0]:
+            return False
+        node = node[1]
+        other = other[1]
+    return True
+
+
+def _move_token(token, delta):
+    """
+    Move a token by a number of characters.
+    :param token: Token to move
+    :param delta: Number of characters
+    :return: Moved token
+    """
+    return Token(
+        token_type=token.token_type,
+        start=token.start + delta,
+        value=token.value,
+        end=token.end + delta if token.end is not None else None,
+    )
+
+
+class IncrementalParser:
+    """
+    Validates a LittleXML string and re-validates it after each edit,
+    giving the same result as parsing the edited string from scratch.
+    The string is kept in chunks of tokens together with their characters,
+    and the state of the parser before each chunk. Offsets of the chunks
+    are not stored but summed up from their lengths in a Fenwick tree,
+    so that an edit does not touch the following chunks. After an edit,
+    only the characters from the start of the affected chunk are lexed
+    again, until the tokens line up with an old chunk. Parsing is then
+    resumed from the nearest checkpoint, until the state of the parser
+    matches a checkpoint after the edit. Small edits are validated in time
+    proportional to the size of a chunk, except when they change
+    the nesting of all following elements.
+    :param input_string: The string to be validated
+    :param spans: Whether to use span tokens
+    :param checkpoint_interval: Number of tokens in a chunk
+    """
+
+    def __init__(self, input_string='', spans=False,
+                 checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.spans = spans
+        self.checkpoint_interval = checkpoint_interval
+        _, table = select_grammar(spans=spans)
+        self._initial = _Checkpoint.from_state(
+            state=ParserState(stack=[table.end, table.start]),
+        )
+        self._chunks = []
+        self._lengths = _LengthTree()
+        # Index of the chunk with the error of the string
+        self._error_index = None
+        # Index after the chunks following a lexical error, which may
+        # not be lexed, `None` if there is no lexical error
+        self._raw_end = None
+        # Index of the last chunk with a checkpoint of the current string
+        self._frontier = 0
+        # Whether the error is the result of parsing, so that parsing
+        # can stop at an old checkpoint
+        self._parsed = False
+        self._parsed_chunks = 0
+        self.edit(offset=0, deleted=0, inserted=input_string)
+
+    @property
+    def text(self):
+        """the current string"""
+        return ''.join(chunk.text for chunk in self._chunks)
+
+    @property
+    def error(self):
+        """error of the current string, `None` if valid"""
+        if self._error_index is None:
+            return None
+        return self._chunks[self._error_index].error.format(
+            offset=self._lengths.prefix(count=self._error_index),
+        )
+
+    @property
+    def ok(self):
+        """whether the current string is valid"""
+        return self._error_index is None
+
+    @property
+    def tokens(self):
+        """list of tokens of the current string, up to any lexical error"""
+        tokens = []
+        offset = 0
+        for chunk in self._chunks:
+            if chunk.tokens is None:
+                break
+            tokens.extend(chunk.get_tokens(offset=offset))
+            offset += len(chunk.text)
+        return tokens
+
+    def edit(self, offset, deleted=0, inserted=''):
+        """
+        Replace a part of the string and validate the result.
+        The error of the edited string, if any, is available in `error`.
+        :param offset: Index of the first replaced character
+        :param deleted: Number of replaced characters
+        :param inserted: String inserted at the offset
+        :raises ValueError: If the edit is out of the string
+        """
+        if not 0 <= offset <= offset + deleted <= self._lengths.total:
+            raise ValueError(
+                f'Edit out of range: offset {offset}, deleted {deleted}'
+            )
+        chunks = self._chunks
+        # The lexer looks at most one character after the end of a chunk
+        first = self._lengths.search(offset=offset)
+        stop = self._lengths.search(offset=offset + deleted) + 1
+        if not offset + deleted:
+            stop = 0
+        stop = min(max(stop, first + 1), len(chunks))
+        start = self._lengths.prefix(count=first)
+        text = ''.join(chunk.text for chunk in chunks[first:stop])
+        text = (
+            text[:offset - start]
+            + inserted
+            + text[offset + deleted - start:]
+        )
+
+        if self._raw_end is not None and first > self._error_index:
+            # The error is before the edit, which is not lexed
+            count = self._replace(
+                first=first,
+                stop=stop,
+                new_chunks=[_Chunk(text=text)],
+            )
+            self._raw_end = max(self._raw_end, first + count)
+            self._frontier = min(self._frontier, first)
+            return
+
+        checkpoint = None
+        if first < len(chunks) and first <= self._frontier:
+            checkpoint = chunks[first].checkpoint
+        new_chunks, stop, lex_error = self._relex(
+            first=first,
+            stop=stop,
+            text=text,
+            edit_end=offset - start + len(inserted),
+        )
+        if first <= self._frontier < stop:
+            self._frontier = first
+        count = self._replace(first=first, stop=stop, new_chunks=new_chunks)
+        chunks[first].checkpoint = checkpoint
+        chunks[0].checkpoint = self._initial
+
+        if lex_error is not None:
+            # States after the edit are not known until the string is parsed
+            self._error_index = first + len(new_chunks) - 1
+            chunks[self._error_index].error = lex_error
+            self._raw_end = max(self._raw_end or 0, first + count)
+            self._frontier = min(self._frontier, first)
+            self._parsed = False
+            return
+        if self._raw_end is not None:
+            self._raw_end = None
+            self._error_index = None
+        self._reparse(first=first, end=first + count)
+
+    def _relex(self, first, stop, text, edit_end):
+        """
+        Lex the edited characters of the affected chunks, followed by those
+        of the next chunks as needed, until the tokens line up with an old
+        chunk after the edit.
+        Characters are lexed in a string holding only the chunks needed
+        so far. Tokens are only kept if the lexer did not look past the end
+        of the string, otherwise more chunks are added to it.
+        :param first: Index of the first affected chunk
+        :param stop: Index of the first chunk after the affected chunks
+        :param text: Edited characters of the affected chunks
+        :param edit_end: Index in `text` after the inserted characters
+        :return: Tuple of the list of new chunks, the index of the first
+            chunk after the replaced chunks, and the `_ErrorTemplate`
+            of a lexical error or `None`
+        """
+        chunks = self._chunks
+        raw_end = self._raw_end or 0
+        # Offsets of old chunks in the string where lexing can stop
+        boundaries = {}
+        following = stop
+        new_chunks = []
+        chunk = _Chunk(tokens=[])
+        position = 0
+        while True:
+            complete = following == len(chunks)
+            if position >= edit_end and position in boundaries:
+                stop = boundaries[position]
+                break
+            lexer = Lexer(input_string=text, spans=self.spans, lazy=True)
+            try:
+                for tokens, token_end in lexer._scan_groups(start=position):
+                    if token_end >= len(text) and not complete:
+                        break
+                    chunk.tokens.extend(tokens)
+                    position = token_end
+                    if len(chunk.tokens) >= self.checkpoint_interval:
+                        chunk.text = text[chunk.origin:position]
+                        new_chunks.append(chunk)
+                        chunk = _Chunk(tokens=[], origin=position)
+                    if position >= edit_end and position in boundaries:
+                        break
+                else:
+                    stop = len(chunks)
+                    break
+            except LexicalError as error:
+                # Only the end of input may be different in a longer string
+                if complete or error.position is not None:
+                    if chunk.tokens:
+                        chunk.text = text[chunk.origin:position]
+                        new_chunks.append(chunk)
+                    new_chunks.append(_Chunk(text=text[position:]))
+                    return (
+                        new_chunks,
+                        following,
+                        _ErrorTemplate(error=error, offset=position),
+                    )
+            if position >= edit_end and position in boundaries:
+                continue
+
+            # Double the number of chunks added to the string
+            added = chunks[following:following + max(following - stop, 1)]
+            pieces = [text]
+            length = len(text)
+            for index, old_chunk in enumerate(added, start=following):
+                if old_chunk.tokens and index >= raw_end:
+                    boundaries.setdefault(length, index)
+                pieces.append(old_chunk.text)
+                length += len(old_chunk.text)
+            text = ''.join(pieces)
+            following += len(added)
+
+        if chunk.tokens:
+            chunk.text = text[chunk.origin:position]
+            new_chunks.append(chunk)
+        if stop < len(chunks):
+            new_chunks = self._merge_chunks(
+                new_chunks=new_chunks,
+                count=stop - first,
+            )
+        return new_chunks, stop, None
+
+    def _merge_chunks(self, new_chunks, count):
+        """
+        Merge the last new chunks while there are more of them than
+        the chunks they replace, up to twice the usual number of tokens,
+        so that the number of chunks does not change.
+        :param new_chunks: List of chunks lexed from the same string
+        :param count: Number of replaced chunks
+        :return: List of chunks
+        """
+        limit = 2 * self.checkpoint_interval
+        while len(new_chunks) > max(count, 1):
+            last = new_chunks[-1]
+            previous = new_chunks[-2]
+            if len(previous.tokens) + len(last.tokens) > limit:
+                break
+            previous.text += last.text
+            previous.tokens.extend(last.tokens)
+            new_chunks.pop()
+        return new_chunks
+
+    def _replace(self, first, stop, new_chunks):
+        """
+        Replace chunks and update their lengths. If there are fewer new
+        chunks than replaced ones, empty chunks are added after them, so that
+        the indices of the following chunks do not change. Otherwise,
+        the lengths of the following chunks are summed up again.
+        :param first: Index of the first replaced chunk
+        :param stop: Index of the first chunk after the replaced chunks
+        :param new_chunks: List of chunks replacing them
+        :return: Number of chunks replacing them
+        """
+        chunks = self._chunks
+        lengths = self._lengths
+        count = stop - first
+        if stop == len(chunks):
+            lengths.truncate(count=first)
+            chunks[first:] = new_chunks
+            for chunk in new_chunks:
+                lengths.append(length=len(chunk.text))
+        elif len(new_chunks) <= count:
+            # Empty chunks after a lexical error are not lexed either
+            raw = bool(new_chunks) and new_chunks[-1].tokens is None
+            for index in range(first, stop):
+                if index - first < len(new_chunks):
+                    chunk = new_chunks[index - first]
+                else:
+                    chunk = _Chunk(tokens=None if raw else [])
+                lengths.add(
+                    index=index,
+                    delta=len(chunk.text) - len(chunks[index].text),
+                )
+                chunks[index] = chunk
+            return count
+        else:
+            chunks[first:stop] = new_chunks
+            self._lengths = _LengthTree(
+                lengths=[len(chunk.text) for chunk in chunks],
+            )
+
+        shift = len(new_chunks) - count
+        if self._error_index is not None and self._error_index >= stop:
+            self._error_index += shift
+        if self._raw_end is not None and self._raw_end >= stop:
+            self._raw_end += shift
+        if self._frontier >= stop:
+            self._frontier += shift
+        return len(new_chunks)
+
+    def _reparse(self, first, end):
+        """
+        Parse the tokens from the nearest checkpoint before the edit
+        until the state of the parser matches a checkpoint after the edit.
+        :param first: Index of the first replaced chunk
+        :param end: Index of the first chunk after the replaced chunks
+        """
+        chunks = self._chunks
+        # Checkpoints of old chunks after the edit are only used to find
+        # out if parsing can be stopped
+        start = max(min(first, end - 1), 0)
+        while start > self._frontier or chunks[start].checkpoint is None:
+            start -= 1
+        checkpoint = chunks[start].checkpoint
+        state = checkpoint.restore()
+        self._parsed_chunks = 0
+        try:
+            Parser(
+                input_stream=self._feed_tokens(
+                    start=start,
+                    converge_from=end,
+                    state=state,
+                    checkpoint=checkpoint,
+                ),
+                parse_tokens=True,
+                spans=self.spans,
+                state=state,
+            )
+        except _Converged:
+            pass
+        except ParsingError as error:
+            index = start + self._parsed_chunks - 1
+            chunks[index].error = _ErrorTemplate(
+                error=error,
+                offset=self._lengths.prefix(count=index),
+            )
+            self._error_index = index
+            # The parser did not reach the following chunks
+            self._frontier = index
+        else:
+            self._error_index = None
+            self._frontier = len(chunks) - 1
+        self._parsed = True
+
+    def _feed_tokens(self, start, converge_from, state, checkpoint):
+        """
+        Yield tokens to the parser, storing the state of the parser
+        before each chunk as its checkpoint.
+        :param start: Index of the chunk to start at
+        :param converge_from: Index of the first chunk that was not
+            changed by the edit
+        :param state: State updated by the parser
+        :param checkpoint: Checkpoint of the state at the start
+        :return: Generator yielding tokens
+        :raises _Converged: If the state matches the checkpoint of
+            an unchanged chunk
+        """
+        chunks = self._chunks
+        # Old checkpoints can only be used if they were parsed
+        # with the same following chunks
+        converge_to = self._frontier if self._parsed else -1
+        previous = checkpoint
+        previous_state = state.copy()
+        offset = self._lengths.prefix(count=start)
+        for index in range(start, len(chunks)):
+            chunk = chunks[index]
+            if index > start:
+                # Checkpoints are only kept between names
+                if state.name_values:
+                    chunk.checkpoint = None
+                else:
+                    checkpoint = _Checkpoint.from_state(
+                        state=state,
+                        previous=previous,
+                        previous_state=previous_state,
+                    )
+                    old = chunk.checkpoint
+                    if (converge_from <= index <= converge_to
+                            and old is not None
+                            and old.matches(other=checkpoint)):
+                        raise _Converged
+                    chunk.checkpoint = previous = checkpoint
+                    previous_state = state.copy()
+            self._parsed_chunks += 1
+            yield from chunk.get_tokens(offset=offset)
+            offset += len(chunk.text)
@@ -1,27 +1,169 @@
+import contextlib
+import io
+import mmap
+import re
 import string
-
-from littlexml.token import Token, TokenType, CHARACTER_MAPPING
+import time
+
+from littlexml.grammar_tables import CHARACTER_TYPES
+from littlexml.limits import Limits
+from littlexml.lines import LineIndex
+from littlexml.token import Token, TokenStream, TokenType
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+SPAN_CHARS = frozenset(string.ascii_letters + string.digits)
+SCANNERS = ('default', 'regex')
+
+# Class of whitespace characters, which separate tokens
+WHITESPACE_CLASS = f'[{re.escape(string.whitespace)}]'
+
+# Master pattern used by the regex scanner, matching the most common tokens
+# at once. Anything else is left to the character-level scanner.
+# Single characters other than letters and digits are matched separately
+# from `>`, which is followed by whitespace, after `?>` is tried for `?`.
+_SINGLE_CHARS = re.escape(''.join(
+    char
+    for char, token_type in CHARACTER_TYPES.items()
+    if token_type not in (
+        TokenType.LETTER,
+        TokenType.DIGIT,
+        TokenType.GREATER_THAN,
+    )
+))
+TOKEN_PATTERN = re.compile(
+    rf'(?P<alnum>[A-Za-z0-9]+)'
+    rf'|(?P<space>{WHITESPACE_CLASS}+)'
+    rf'|(?P<greater_than>>{WHITESPACE_CLASS}*)'
+    rf'|(?P<lt_slash></)'
+    rf'|(?P<less_than><(?!\?))'
+    rf'|(?P<gt_slash>/>{WHITESPACE_CLASS}*)'
+    rf'|(?P<gt_xml>\?>{WHITESPACE_CLASS}*)'
+    rf'|(?P<lt_xml><\?xml version=)'
+    rf'|(?P<char>[{_SINGLE_CHARS}])'
+)
+BYTES_TOKEN_PATTERN = re.compile(TOKEN_PATTERN.pattern.encode())
+
+# Byte-class tables for bytes-like input, indexed by the value of a byte.
+# ASCII bytes map to their characters and non-ASCII bytes to `None`,
+# characters of single-character tokens also map to their token types.
+_BYTE_CHARS = tuple(
+    chr(byte) if byte < 0x80 else None
+    for byte in range(256)
+)
+_BYTE_TYPES = tuple(
+    CHARACTER_TYPES.get(char)
+    for char in _BYTE_CHARS
+)
+
+# Characters that can start a token, where lexing resumes after an error
+_TOKEN_START_CHARS = frozenset(
+    ''.join(CHARACTER_TYPES) + string.whitespace + '/<'
+)
+
+
+@contextlib.contextmanager
+def map_file(input_file):
+    """
+    Memory-map a file for reading, so that it can be tokenized without
+    reading it into memory first.
+    :param input_file: File object backed by a file descriptor
+    :return: Context manager yielding the memory-mapped file contents
+    :raises OSError: If the file cannot be memory-mapped
+    """
+    try:
+        mapped = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be memory-mapped
+        if input_file.seek(0, 2) == 0:
+            yield b''
+            return
+        raise
+    with mapped:
+        yield mapped
+
+
+def span_type(value):
+    """
+    Get the type of a span token.
+    :param value: Run of letters and digits covered by the span
+    :return: Token type of the span
+    """
+    if value[0] in string.ascii_letters:
+        return TokenType.ALPHA_SPAN
+    if value.isdigit():
+        return TokenType.DIGIT_SPAN
+    return TokenType.ALNUM_SPAN
 
 
 class Lexer:
     """
     Converts a LittleXML string into a stream of lexical tokens.
     The object can be iterated over, yielding the resulting tokens.
-    :param input_string: The string to be tokenized
+    In span mode, each run of letters and digits is returned as a single
+    span token with start and end positions instead of one token per
+    character.
+    The `regex` scanner matches whole tokens using a single compiled
+    regular expression, producing the same tokens and errors as the
+    `default` character-level scanner.
+    With `compact` set, the tokens are stored in a `TokenStream` instead of
+    a list, which uses a fraction of the memory for large inputs.
+    With `lazy` set, the tokens are not stored at all. Instead, they are
+    produced while iterating over the object, which can be done once.
+    The input can also be a bytes-like object, such as a memory-mapped file
+    returned by `map_file`. It is scanned without decoding, using tables
+    of byte classes, and positions of tokens are byte offsets. Non-ASCII
+    characters are reported as invalid like in string input.
+    Scanning can start in the middle of the input, in which case positions
+    of tokens are still counted from the beginning of the input.
+    With `lines` set, a `LineIndex` of the input is kept for mapping
+    positions of tokens and errors to lines and columns. For input held
+    in memory, it is extended up to the positions that are looked up.
+    :param input_string: The string or bytes-like object to be tokenized
+    :param spans: Whether to produce span tokens
+    :param scanner: Scanner used for tokenizing, one of `SCANNERS`
+    :param compact: Whether to store tokens in a `TokenStream`
+    :param lazy: Whether to produce tokens only when iterating
+    :param stats: `Statistics` object for counting tokens and measuring
+        the time spent tokenizing
+    :param limits: `Limits` on the size of the input and the number
+        of tokens
+    :param diagnostics: `Diagnostics` collecting errors in recovery mode,
+        in which invalid characters are reported and skipped up to
+        the next character that can start a token
+    :param lines: Whether to index the starts of lines
+    :param start: Index of the character at which scanning starts
+    :raises ValueError: If the scanner is unknown
     """
 
-    def __init__(self, input_string):
+    def __init__(self, input_string, spans=False, scanner='default',
+                 compact=False, lazy=False, stats=None, limits=None,
+                 diagnostics=None, lines=False, start=0):
+        if scanner not in SCANNERS:
+            raise ValueError(f'Unknown scanner: {scanner}')
         self.input_string = input_string
+        self.spans = spans
+        self.scanner = scanner
+        self.compact = compact
+        self.lazy = lazy
+        self.stats = stats
+        self.limits = limits if limits is not None else Limits()
+        self._set_diagnostics(diagnostics=diagnostics)
+        self.line_index = LineIndex() if lines else None
+        self.start = start
+        self._binary = not isinstance(input_string, str)
         self._tokens = None
-        self._serialized = None
-        self._tokenize()
+        if not lazy:
+            self._tokenize()
 
     def __iter__(self):
+        if self.lazy and self._tokens is None:
+            return self._generate_tokens()
         return iter(self._get_tokens())
 
     @property
     def tokens(self):
-        """list of tokens"""
+        """list of tokens, or `TokenStream` in compact mode"""
         return self._get_tokens()
 
     def as_dict(self):
@@ -29,10 +171,76 @@ class Lexer:
         Get tokens in a serializable format.
         :return: Token stream as list of dicts
         """
-        if self._serialized is None:
-            tokens = self._get_tokens()
-            self._serialized = [token.to_dict() for token in tokens]
-        return self._serialized
+        return [token.to_dict() for token in self._get_tokens()]
+
+    def location(self, position):
+        """
+        Find the line and column of a position, such as the start
+        of a token or the position of an error.
+        :param position: Position in the input
+        :return: Tuple of the line and column number
+        :raises ValueError: If lines are not indexed, or if the position
+            has not been read yet
+        """
+        self._index_lines(position=position)
+        return self.line_index.location(position=position)
+
+    def excerpt(self, position, context=0):
+        """
+        Slice the lines around a position from the input.
+        :param position: Position in the input
+        :param context: Number of lines included before and after the line
+            of the position
+        :return: List of tuples of the line number and the text of the line
+        :raises ValueError: If lines are not indexed
+        """
+        return self._excerpt(
+            source=self.input_string,
+            position=position,
+            context=context,
+        )
+
+    def _excerpt(self, source, position, context):
+        """
+        Slice the lines around a position, indexing the input up to the end
+        of the last of them.
+        :param source: String or bytes-like object with the input
+        :param position: Position in the input
+        :param context: Number of lines included before and after the line
+            of the position
+        :return: List of tuples of the line number and the text of the line
+        :raises ValueError: If lines are not indexed
+        """
+        self._index_lines(position=position)
+        line, _ = self.line_index.location(position=position)
+        self._index_lines(position=position, line=line + context)
+        return self.line_index.excerpt(
+            source=source,
+            position=position,
+            context=context,
+        )
+
+    def _index_lines(self, position, line=None):
+        """
+        Extend the line index of the input held in memory in chunks,
+        until it covers a position, and the end of a line if given.
+        :param position: Position in the input
+        :param line: Number of the line that is indexed up to its end,
+            or up to the end of input
+        :raises ValueError: If lines are not indexed
+        """
+        line_index = self.line_index
+        if line_index is None:
+            raise ValueError('Lines are not indexed')
+        length = len(self.input_string)
+        while line_index.length < length and (
+            line_index.length < position
+            or line is not None and len(line_index) <= line
+        ):
+            start = line_index.length
+            line_index.feed(
+                chunk=self.input_string[start:start + DEFAULT_CHUNK_SIZE],
+            )
 
     def _get_tokens(self):
         if self._tokens is None:
@@ -45,29 +253,205 @@ class Lexer:
         :raises LexicalError: If an unexpected character or end of input is
             found in the input stream
         """
-        self._position = 0
-        self._tokens = []
+        if self.compact:
+            self._tokens = TokenStream(tokens=self._generate_tokens())
+        else:
+            self._tokens = list(self._generate_tokens())
+
+    def _generate_tokens(self):
+        """
+        Lazily perform lexical analysis of the input,
+        collecting statistics if requested.
+        :return: Iterator yielding tokens as they are found
+        :raises LimitError: If the input is over the size limit
+        """
+        self._check_input_size()
+        if self.stats is None:
+            tokens = self._scan_tokens()
+        else:
+            tokens = self._scan_tokens_with_stats()
+        return self.limits.limit_tokens(tokens=tokens)
+
+    def _check_input_size(self):
+        """
+        Check the size of the input against the limit.
+        :raises LimitError: If the input is over the size limit
+        """
+        self.limits.check_size(size=len(self.input_string))
+
+    def _scan_tokens_with_stats(self):
+        """
+        Lazily perform lexical analysis of the input, counting tokens and
+        measuring the time spent producing them.
+        :return: Generator yielding tokens as they are found
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        """
+        stats = self.stats
+        tokens = self._scan_tokens()
+        while True:
+            start = time.perf_counter()
+            try:
+                token = next(tokens)
+            finally:
+                stats.lex_time += time.perf_counter() - start
+            stats.token_counts[token.token_type] += 1
+            yield token
+            if token.token_type == TokenType.END_OF_STRING:
+                return
+
+    def _scan_tokens(self):
+        """
+        Lazily perform lexical analysis of the input.
+        :return: Generator yielding tokens as they are found
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        """
+        self._position = self.start
+
+        if self.scanner == 'regex':
+            yield from self._generate_tokens_regex()
 
         # Repeat until reaching the end of input
-        while self._position < len(self.input_string):
+        while self._peek_char() is not None:
 
             # Get the next tokens in the output stream
             tokens = self._get_token()
 
-            # Add returned tokens to the list of tokens
+            # Yield returned tokens
             if isinstance(tokens, list):
                 # Multiple tokens returned
-                self._tokens += tokens
+                yield from tokens
             else:
                 # A single token returned
-                self._tokens.append(tokens)
+                yield tokens
 
         # Include the END_OF_STRING token at the end
-        end_position = len(self.input_string) + 1
-        self._tokens.append(Token(
+        end_position = self._position + 1
+        yield Token(
             token_type=TokenType.END_OF_STRING,
             start=end_position,
-        ))
+        )
+
+    def _scan_groups(self, start=0):
+        """
+        Lazily perform lexical analysis of the input from a position,
+        yielding the tokens found at once together with the position after
+        them. The scanner does not look past the character at that
+        position, so scanning can be restarted there.
+        :param start: Position to start scanning at
+        :return: Generator yielding lists of tokens and positions
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        """
+        self._position = start
+        while self._peek_char() is not None:
+            tokens = self._get_token()
+            if not isinstance(tokens, list):
+                tokens = [tokens]
+            yield tokens, self._position
+        end_token = Token(
+            token_type=TokenType.END_OF_STRING,
+            start=self._position + 1,
+        )
+        yield [end_token], self._position
+
+    def _generate_tokens_regex(self):
+        """
+        Lazily perform lexical analysis of the input string using
+        the master regular expression, up to the end of input.
+        :return: Generator yielding tokens as they are found
+        :raises LexicalError: If an unexpected character or end of input is
+            found in the input stream
+        """
+        input_string = self.input_string
+        length = len(input_string)
+        if self._binary:
+            match_token = BYTES_TOKEN_PATTERN.match
+        else:
+            match_token = TOKEN_PATTERN.match
+        index = self._position
+
+        while index < length:
+            match = match_token(input_string, index)
+
+            # Let the character-level scanner handle anything else,
+            # including reporting of errors
+            if match is None:
+                self._position = index
+                tokens = self._get_token()
+                if isinstance(tokens, list):
+                    yield from tokens
+                else:
+                    yield tokens
+                index = self._position
+                continue
+
+            # Token positions start at one, so the end index of a match
+            # is the position of its last character
+            kind = match.lastgroup
+            end = match.end()
+
+            if kind == 'alnum':
+                value = match.group()
+                if self._binary and not self.spans:
+                    for position, byte in enumerate(value, start=index + 1):
+                        yield Token(
+                            token_type=_BYTE_TYPES[byte],
+                            start=position,
+                            value=_BYTE_CHARS[byte],
+                        )
+                    index = end
+                    continue
+                if self._binary:
+                    value = value.decode('ascii')
+                if self.spans:
+                    yield Token(
+                        token_type=span_type(value=value),
+                        start=index + 1,
+                        value=value,
+                        end=end,
+                    )
+                else:
+                    for position, char in enumerate(value, start=index + 1):
+                        yield Token(
+                            token_type=CHARACTER_TYPES[char],
+                            start=position,
+                            value=char,
+                        )
+            elif kind == 'space':
+                yield Token(token_type=TokenType.SPACE, start=end)
+            elif kind == 'greater_than':
+                yield Token(
+                    token_type=TokenType.GREATER_THAN,
+                    start=end,
+                    value='>',
+                )
+            elif kind == 'lt_slash':
+                yield Token(token_type=TokenType.LT_SLASH, start=end)
+            elif kind == 'less_than':
+                yield Token(token_type=TokenType.LESS_THAN, start=end)
+            elif kind == 'gt_slash':
+                yield Token(token_type=TokenType.GT_SLASH, start=end)
+            elif kind == 'gt_xml':
+                yield Token(token_type=TokenType.GT_XML, start=end)
+            elif kind == 'lt_xml':
+                yield Token(token_type=TokenType.LT_XML, start=index + 1)
+                yield Token(token_type=TokenType.SPACE, start=index + 6)
+                yield Token(token_type=TokenType.VERSION, start=index + 7)
+            else:
+                if self._binary:
+                    char = _BYTE_CHARS[input_string[index]]
+                else:
+                    char = match.group()
+                yield Token(
+                    token_type=CHARACTER_TYPES[char],
+                    start=end,
+                    value=char,
+                )
+            index = end
+
+        self._position = index
 
     def _get_token(self):
         """
@@ -81,18 +465,20 @@ class Lexer:
         # Get the next character in the input stream
         input_char = self._next_char()
 
-        # If the character is a letter, return a LETTER token
-        if input_char in string.ascii_letters:
-            return Token(
-                token_type=TokenType.LETTER,
-                start=self._position,
-                value=input_char,
-            )
+        # In span mode, return a single token for letters and digits
+        if self.spans and input_char in SPAN_CHARS:
+            return self._get_span(input_char=input_char)
 
-        # If the character is a digit, return a DIGIT token
-        if input_char in string.digits:
+        # If the character is a letter, a digit or another character
+        # of a single-character token, return the token from the grammar
+        token_type = CHARACTER_TYPES.get(input_char)
+        if token_type is not None:
+            if token_type is TokenType.GREATER_THAN:
+                self._consume_space()
+            elif input_char == '?':
+                return self._analyze_q(input_char=input_char)
             return Token(
-                token_type=TokenType.DIGIT,
+                token_type=token_type,
                 start=self._position,
                 value=input_char,
             )
@@ -105,16 +491,6 @@ class Lexer:
                 start=self._position,
             )
 
-        # Try to match character using the mapping
-        if input_char in CHARACTER_MAPPING:
-            if input_char == '>':
-                self._consume_space()
-            return Token(
-                token_type=CHARACTER_MAPPING[input_char],
-                start=self._position,
-                value=input_char,
-            )
-
         # If the character is a forward slash, try to match a GT_SLASH token
         if input_char == '/':
             self._consume(chars='>')
@@ -124,16 +500,62 @@ class Lexer:
                 start=self._position,
             )
 
-        # If the character is a less-than sign or a question mark,
+        # If the character is a less-than sign,
         # one of multiple tokens could be possible
         if input_char == '<':
             return self._analyze_lt()
-        if input_char == '?':
-            return self._analyze_q(input_char=input_char)
 
         # If no token is returned, raise an exception
         raise LexicalError(
-            f'Invalid character at position {self._position}: {input_char}'
+            f'Invalid character at position {self._position}: {input_char}',
+            position=self._position,
+        )
+
+    def _set_diagnostics(self, diagnostics):
+        """
+        Enable recovery mode if requested, without slowing down lexing
+        in normal mode.
+        :param diagnostics: `Diagnostics` collecting errors, or `None`
+        """
+        self.diagnostics = diagnostics
+        if diagnostics is not None:
+            self._get_token = self._recover_token
+
+    def _recover_token(self):
+        """
+        Analyze characters at the current position in the input stream,
+        reporting an error and skipping to the next character that can
+        start a token if they do not form a token.
+        :return: The next token (or multiple tokens) in the stream,
+            an empty list if an error was reported
+        :raises TooManyErrors: If too many errors were reported
+        """
+        try:
+            return Lexer._get_token(self)
+        except LexicalError as error:
+            self.diagnostics.report(error=error, position=self._position)
+        while True:
+            char = self._peek_char()
+            if char is None or char in _TOKEN_START_CHARS:
+                return []
+            self._next_char()
+
+    def _get_span(self, input_char):
+        """
+        Read a run of letters and digits starting with the current character.
+        :param input_char: The current character
+        :return: Span token covering the whole run
+        """
+        start = self._position
+        chars = [input_char]
+        while self._peek_char() in SPAN_CHARS:
+            chars.append(self._next_char())
+        value = ''.join(chars)
+        return Token(
+            token_type=span_type(value=value),
+            start=start,
+            value=value,
+            end=self._position,
         )
 
     def _analyze_lt(self):
@@ -186,6 +608,7 @@ class Lexer:
     def _analyze_q(self, input_char):
         """
         Analyze characters after a question mark in the input stream.
+        :param input_char: The question mark
         :return: The next token in the stream
         """
 
@@ -201,9 +624,9 @@ class Lexer:
                 start=self._position,
             )
 
-        # Otherwise return a SIGN token
+        # Otherwise return the token of the character from the grammar
         return Token(
-            token_type=TokenType.SIGN,
+            token_type=CHARACTER_TYPES[input_char],
             start=self._position,
             value=input_char,
         )
@@ -222,7 +645,8 @@ class Lexer:
             if input_char != char:
                 raise LexicalError(
                     f'Invalid character at position {self._position}: '
-                    f'{input_char}'
+                    f'{input_char}',
+                    position=self._position,
                 )
 
     def _consume_space(self):
@@ -244,6 +668,8 @@ class Lexer:
             char = self.input_string[self._position]
         except IndexError:
             return None
+        if self._binary:
+            char = _BYTE_CHARS[char] or self._decode_char()
         self._position += 1
         return char
 
@@ -253,10 +679,185 @@ class Lexer:
         :return: The following character, `None` if end of input
         """
         try:
-            return self.input_string[self._position]
+            char = self.input_string[self._position]
         except IndexError:
             return None
+        if self._binary:
+            char = _BYTE_CHARS[char] or self._decode_char()
+        return char
+
+    def _decode_char(self):
+        """
+        Decode a non-ASCII character of bytes-like input at the current
+        position. Such characters are never valid, but the whole character
+        is decoded so that errors match those reported for string input.
+        :return: The character starting at the current position
+        """
+        index = self._position
+        encoded = bytes(self.input_string[index:index + 4])
+        return encoded.decode(errors='replace')[0]
+
+
+class StreamLexer(Lexer):
+    """
+    Converts a LittleXML file into a stream of lexical tokens,
+    reading the file in chunks as the tokens are requested.
+    Iterating over the object yields tokens lazily, so only a single chunk
+    of the input is held in memory. The object can be iterated over once.
+    Files opened in binary mode are scanned without decoding, and positions
+    of tokens are byte offsets, like for bytes-like input of `Lexer`.
+    :param input_file: File-like object opened in text or binary mode
+    :param chunk_size: Number of characters or bytes read from the file
+        at once
+    :param spans: Whether to produce span tokens
+    :param compact: Whether to store tokens in a `TokenStream`
+        if all tokens are requested at once
+    :param stats: `Statistics` object for counting tokens and measuring
+        the time spent tokenizing
+    :param limits: `Limits` on the size of the input and the number
+        of tokens, the size is checked as the chunks are read
+    :param diagnostics: `Diagnostics` collecting errors in recovery mode
+    :param lines: Whether to index the starts of lines as the chunks
+        are read
+    """
+
+    def __init__(self, input_file, chunk_size=DEFAULT_CHUNK_SIZE,
+                 spans=False, compact=False, stats=None, limits=None,
+                 diagnostics=None, lines=False):
+        self.input_file = input_file
+        self.chunk_size = chunk_size
+        self.spans = spans
+        self.scanner = 'default'
+        self.compact = compact
+        self.lazy = True
+        self.stats = stats
+        self.limits = limits if limits is not None else Limits()
+        self._set_diagnostics(diagnostics=diagnostics)
+        self.line_index = LineIndex() if lines else None
+        self.start = 0
+        self._binary = isinstance(
+            input_file,
+            (io.RawIOBase, io.BufferedIOBase),
+        )
+        self._buffer = b'' if self._binary else ''
+        self._buffer_start = 0
+        self._tokens = None
+
+    def _fill_buffer(self, discard=True):
+        """
+        Read the next chunk of the input file into the buffer.
+        :param discard: Whether characters before the current position
+            are discarded
+        :return: `False` if end of input, `True` otherwise
+        :raises LimitError: If the input read so far is over the size limit
+        """
+        chunk = self.input_file.read(self.chunk_size)
+        if not chunk:
+            return False
+        if discard:
+            consumed = self._position - self._buffer_start
+            self._buffer = self._buffer[consumed:] + chunk
+            self._buffer_start = self._position
+        else:
+            self._buffer += chunk
+        self.limits.check_size(size=self._buffer_start + len(self._buffer))
+        if self.line_index is not None:
+            self.line_index.feed(chunk=chunk)
+        return True
+
+    def _check_input_size(self):
+        """
+        The size of the input file is checked as it is read.
+        """
+
+    def excerpt(self, position, context=0, source=None):
+        """
+        Slice the lines around a position from the input. The input file
+        is not kept, so its contents have to be passed, such as
+        a memory-mapped file. Chunks are read ahead up to the end
+        of the last line.
+        :param position: Position in the input
+        :param context: Number of lines included before and after the line
+            of the position
+        :param source: String or bytes-like object with the contents
+            of the input file
+        :return: List of tuples of the line number and the text of the line
+        :raises ValueError: If lines are not indexed, or if no source
+            is given
+        """
+        if source is None:
+            raise ValueError('Input of a stream lexer is not kept')
+        return self._excerpt(
+            source=source,
+            position=position,
+            context=context,
+        )
+
+    def _index_lines(self, position, line=None):
+        """
+        Lines are indexed as the chunks are read. To index the end of
+        a line, chunks are read ahead into the buffer.
+        :param position: Position in the input
+        :param line: Number of the line that is indexed up to its end,
+            or up to the end of input
+        :raises ValueError: If lines are not indexed
+        :raises LimitError: If the input read so far is over the size limit
+        """
+        if self.line_index is None:
+            raise ValueError('Lines are not indexed')
+        while line is not None and len(self.line_index) <= line:
+            # The scanner may be suspended before the current position
+            if not self._fill_buffer(discard=False):
+                break
+
+    def _next_char(self):
+        """
+        Move forward in the input stream by one character.
+        :return: The current character, `None` if end of input
+        """
+        char = self._peek_char()
+        if char is not None:
+            self._position += 1
+        return char
+
+    def _peek_char(self):
+        """
+        Peek at the next character in the input stream,
+        reading the next chunk of the file if needed.
+        :return: The following character, `None` if end of input
+        """
+        index = self._position - self._buffer_start
+        if index >= len(self._buffer):
+            if not self._fill_buffer():
+                return None
+            index = self._position - self._buffer_start
+        char = self._buffer[index]
+        if self._binary:
+            char = _BYTE_CHARS[char] or self._decode_char()
+        return char
+
+    def _decode_char(self):
+        """
+        Decode a non-ASCII character of a file opened in binary mode
+        at the current position, reading the next chunk if the character
+        continues in it.
+        :return: The character starting at the current position
+        """
+        index = self._position - self._buffer_start
+        while len(self._buffer) - index < 4 and self._fill_buffer():
+            index = self._position - self._buffer_start
+        encoded = self._buffer[index:index + 4]
+        return encoded.decode(errors='replace')[0]
 
 
 class LexicalError(Exception):
+    """
+    :param message: Error message
+    :param position: Position of the invalid character, `None` at the end
+        of input
+    """
     name = 'Lexical error'
+
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.position = position
@@ -0,0 +1,104 @@
+import itertools
+import sys
+
+
+class Limits:
+    """
+    Limits on the size and structure of documents, which allow rejecting
+    abusive input early instead of running out of memory.
+    Limits set to `None` are not enforced.
+    :param max_depth: Maximum nesting depth of elements
+    :param max_tokens: Maximum number of tokens, including the end of input
+    :param max_bytes: Maximum size of the input, in characters for strings
+        and in bytes for bytes-like objects
+    :param max_name_length: Maximum length of names of elements
+    """
+
+    def __init__(self, max_depth=None, max_tokens=None, max_bytes=None,
+                 max_name_length=None):
+        self.max_depth = max_depth
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+        self.max_name_length = max_name_length
+
+    def __repr__(self):
+        return (
+            f'Limits(max_depth={self.max_depth}, '
+            f'max_tokens={self.max_tokens}, '
+            f'max_bytes={self.max_bytes}, '
+            f'max_name_length={self.max_name_length})'
+        )
+
+    @property
+    def checks_names(self):
+        """whether limits require collecting names of elements"""
+        return self.max_depth is not None or self.max_name_length is not None
+
+    def check_size(self, size):
+        """
+        Check the size of the input read so far.
+        :param size: Number of characters or bytes
+        :raises LimitError: If the size is over the limit
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise LimitError(
+                f'Input size limit of {self.max_bytes} bytes exceeded'
+            )
+
+    def limit_tokens(self, tokens):
+        """
+        Limit the number of tokens in a token stream.
+        The tokens are passed through without any per-token work until
+        the limit is reached.
+        :param tokens: Iterator of tokens
+        :return: Iterator raising `LimitError` if there are more tokens
+            than allowed
+        """
+        if self.max_tokens is None:
+            return tokens
+        return itertools.chain(
+            itertools.islice(tokens, self.max_tokens),
+            _reject_tokens(tokens=tokens, max_tokens=self.max_tokens),
+        )
+
+
+def _reject_tokens(tokens, max_tokens):
+    """
+    Raise an error on any token left in a token stream.
+    :param tokens: Iterator of tokens after the last allowed token
+    :param max_tokens: Limit on the number of tokens
+    :raises LimitError: If there is any token left
+    """
+    for token in tokens:
+        raise token_limit_error(max_tokens=max_tokens, token=token)
+    yield from ()
+
+
+def token_limit_error(max_tokens, token):
+    """
+    Create the error raised for the first token over the limit.
+    :param max_tokens: Limit on the number of tokens
+    :param token: First token over the limit
+    :return: Limit error
+    """
+    return LimitError(
+        f'Token limit of {max_tokens} exceeded at position {token.start}',
+        position=token.start,
+    )
+
+
+# Limit used where no limit is set, which is never reached
+NO_LIMIT = sys.maxsize
+
+
+class LimitError(Exception):
+    """
+    :param message: Error message
+    :param position: Position at which the limit was exceeded, `None`
+        for limits on the size of the input
+    """
+    name = 'Limit error'
+
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.position = position
@@ -0,0 +1,93 @@
+import bisect
+from array import array
+
+
+class LineIndex:
+    """
+    Index of the starts of lines in an input, built from its chunks
+    as they are scanned. Positions of tokens and errors are mapped to line
+    and column numbers by binary search over the index, which takes eight
+    bytes per line. Lines are separated by `\\n`.
+    Positions, line numbers and column numbers all start at one.
+    """
+
+    def __init__(self):
+        self.starts = array('q', [0])
+        self.length = 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def feed(self, chunk):
+        """
+        Index the next chunk of the input.
+        :param chunk: String or bytes-like object following the chunks
+            indexed before
+        """
+        if isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        newline = '\n' if isinstance(chunk, str) else b'\n'
+        find = chunk.find
+        starts = self.starts
+        offset = self.length
+        index = find(newline)
+        while index != -1:
+            starts.append(offset + index + 1)
+            index = find(newline, index + 1)
+        self.length += len(chunk)
+
+    def location(self, position):
+        """
+        Find the line and column of a position.
+        :param position: Position of a character, or the position after
+            the last character at the end of input
+        :return: Tuple of the line and column number
+        :raises ValueError: If the position has not been indexed yet
+        """
+        offset = position - 1
+        if offset < 0 or offset > self.length:
+            raise ValueError(f'Position {position} is not indexed')
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def line_span(self, line):
+        """
+        Find the offsets of a line, which can be used for slicing the input.
+        :param line: Line number
+        :return: Tuple of the offsets of the first character of the line
+            and of the character after its last character, not including
+            the line break
+        :raises ValueError: If the line has not been indexed yet
+        """
+        if not 1 <= line <= len(self.starts):
+            raise ValueError(f'Line {line} is not indexed')
+        start = self.starts[line - 1]
+        if line < len(self.starts):
+            return start, self.starts[line] - 1
+        return start, self.length
+
+    def excerpt(self, source, position, context=0):
+        """
+        Slice the lines around a position from the input.
+        Positions of characters in the input are byte offsets if it is
+        a bytes-like object. A file stream read as text can be sliced
+        as a memory-mapped file up to the first non-ASCII character,
+        as it is never valid.
+        :param source: String or bytes-like object with the indexed input
+        :param position: Position of a character
+        :param context: Number of lines included before and after the line
+            of the position
+        :return: List of tuples of the line number and the text of the line
+        :raises ValueError: If the position has not been indexed yet
+        """
+        line, _ = self.location(position=position)
+        first = max(line - context, 1)
+        last = min(line + context, len(self.starts))
+        lines = []
+        for number in range(first, last + 1):
+            start, end = self.line_span(line=number)
+            text = source[start:end]
+            if not isinstance(text, str):
+                text = bytes(text).decode(errors='replace')
+            lines.append((number, text.rstrip('\r')))
+        return lines
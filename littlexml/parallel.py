@@ -0,0 +1,499 @@
+import concurrent.futures
+import contextlib
+import itertools
+import sys
+
+from littlexml.lexer import Lexer, LexicalError, map_file
+from littlexml.limits import LimitError, Limits, token_limit_error
+from littlexml.parser import Parser, ParserState, ParsingError
+from littlexml.rule import ActionType, RuleType
+from littlexml.table import SPAN_TAG_PARSE_TABLE, TAG_PARSE_TABLE
+from littlexml.token import TokenType
+from littlexml.validation import INPUT_ERROR, ValidationResult, validate_file
+
+
+DEFAULT_PARALLEL_CHUNK_SIZE = 1024 * 1024
+
+
+def _close_unit(table):
+    """
+    Get the symbols of a closing tag, which are pushed to the stack below
+    the content of each open element. Below the rule at its top, the stack
+    holds the end of input and one unit for each open element.
+    :param table: Parse table with tag actions
+    :return: Encoded symbols of the unit, with the top at the end
+    """
+    production = table.get(
+        rule_type=RuleType.CLOSE_TAG,
+        token_type=TokenType.LESS_THAN,
+    )
+    return production[:-1]
+
+
+_CLOSE_UNITS = {
+    False: _close_unit(table=TAG_PARSE_TABLE),
+    True: _close_unit(table=SPAN_TAG_PARSE_TABLE),
+}
+
+
+class _Chunk:
+    """
+    Part of the input starting at a `<`, or at the beginning.
+    :param start: Index of the first character
+    :param end: Index of the character after the last character
+    :param last: Whether the chunk ends at the end of input
+    """
+    __slots__ = ('start', 'end', 'last')
+
+    def __init__(self, start, end, last):
+        self.start = start
+        self.end = end
+        self.last = last
+
+
+class _ChunkSummary:
+    """
+    Effect of parsing a chunk on the state of the parser, assuming that
+    the rule at the top of the stack before it is known. Parsing a chunk may
+    need symbols below the rule, which are units of closing tags of elements
+    opened in previous chunks.
+    :param top: Symbols assumed at the top of the stack
+    :param demand: Number of units needed from below the top
+    :param closed: Names of elements opened in previous chunks closed
+        in the chunk
+    :param opened: Names of elements opened in the chunk and left open
+    :param units: Number of units of closing tags left on the stack
+    :param rest: Symbols left on the stack above the units
+    :param depth: Nesting depth reached in the chunk, relative to the depth
+        before it
+    :param tokens: Number of tokens in the chunk
+    :param at_end: Whether the end of input was reached with an empty stack
+    """
+    __slots__ = (
+        'top', 'demand', 'closed', 'opened', 'units', 'rest', 'depth',
+        'tokens', 'at_end',
+    )
+
+    def __init__(self, top, demand, closed, opened, units, rest, depth,
+                 tokens, at_end):
+        self.top = top
+        self.demand = demand
+        self.closed = closed
+        self.opened = opened
+        self.units = units
+        self.rest = rest
+        self.depth = depth
+        self.tokens = tokens
+        self.at_end = at_end
+
+
+class _FragmentParser(Parser):
+    """
+    Parses a chunk of the input from a guessed top of the stack. Whenever
+    the stack is emptied, a unit of a closing tag is pushed, and names
+    of elements closed by it are collected instead of being matched.
+    :param input_stream: Iterable of tokens of the chunk
+    :param spans: Whether to use span tokens
+    :param max_name_length: Limit on the length of names
+    :param top: Symbols assumed at the top of the stack
+    """
+
+    def __init__(self, input_stream, spans, max_name_length, top):
+        self.unit = _CLOSE_UNITS[spans]
+        self.demand = 0
+        self.closed = []
+        self.depth = 0
+        self.tokens = 0
+        self.at_end = False
+        self._position = 0
+        super().__init__(
+            input_stream=input_stream,
+            parse_tokens=True,
+            spans=spans,
+            limits=Limits(max_name_length=max_name_length),
+            state=ParserState(stack=top),
+        )
+
+    def _parse_table(self, token=None):
+        while True:
+            try:
+                super()._parse_table(token=token)
+            except ParsingError as error:
+                # Tokens of the chunk are exhausted between two tags
+                if error.position is None:
+                    self.tokens += self._position
+                    return
+                raise
+            self.tokens += self._position
+            token = self._token
+            if token is None:
+                token = next(self._tokens, None)
+                if token is None:
+                    return
+            if token.token_type == TokenType.END_OF_STRING:
+                self.tokens += 1
+                self.at_end = True
+                return
+            self.state.stack.extend(self.unit)
+            self.demand += 1
+
+    def _run_action(self, action):
+        if action == ActionType.END_ELEMENT and not self._names:
+            name = sys.intern(''.join(self._name_values))
+            self._name_values.clear()
+            self._check_name(name=name)
+            self.closed.append(name)
+            return
+        if action != ActionType.END_ELEMENT:
+            depth = len(self._names) - len(self.closed) + 1
+            if depth > self.depth:
+                self.depth = depth
+        super()._run_action(action=action)
+
+    def summary(self, top):
+        """
+        Summarize the effect of the chunk on the state of the parser.
+        :param top: Symbols assumed at the top of the stack
+        :return: Summary of the chunk
+        """
+        units, rest = _split_stack(stack=self.state.stack, unit=self.unit)
+        return _ChunkSummary(
+            top=tuple(top),
+            demand=self.demand,
+            closed=self.closed,
+            opened=self._names,
+            units=units,
+            rest=rest,
+            depth=self.depth,
+            tokens=self.tokens,
+            at_end=self.at_end,
+        )
+
+
+def _split_stack(stack, unit):
+    """
+    Count units of closing tags at the bottom of a stack.
+    :param stack: Encoded symbols
+    :param unit: Encoded symbols of a unit
+    :return: Tuple of the number of units and the symbols above them
+    """
+    size = len(unit)
+    unit = list(unit)
+    index = 0
+    while stack[index:index + size] == unit:
+        index += size
+    return index // size, tuple(stack[index:])
+
+
+def _guess_top(mapped, chunk, spans):
+    """
+    Guess the symbols at the top of the stack before a chunk. Chunks
+    in the middle of a valid document start with an opening tag following
+    another opening tag, or with a closing tag following another tag.
+    :param mapped: Memory-mapped input
+    :param chunk: Chunk of the input
+    :param spans: Whether to use span tokens
+    :return: Encoded symbols
+    """
+    table = SPAN_TAG_PARSE_TABLE if spans else TAG_PARSE_TABLE
+    if chunk.start == 0:
+        return (table.start,)
+    if mapped[chunk.start + 1:chunk.start + 2] in (b'/', b'?'):
+        return ()
+    return (table.symbol_ids[RuleType.CLOSE_TAG],)
+
+
+def _chunk_tokens(mapped, chunk, spans):
+    """
+    Lex a chunk of the input. The lexer is stopped at the first token after
+    the chunk, so tokens cut off by the end of the chunk, and errors found
+    when lexing the token after it, are reported as they would be
+    for the whole input.
+    :param mapped: Memory-mapped input
+    :param chunk: Chunk of the input
+    :param spans: Whether to use span tokens
+    :return: Iterator yielding tokens of the chunk
+    """
+    lexer = Lexer(
+        input_string=mapped,
+        spans=spans,
+        scanner='regex',
+        lazy=True,
+        start=chunk.start,
+    )
+    if chunk.last:
+        return iter(lexer)
+    # Positions of tokens after the chunk start at the `<` after it
+    end = chunk.end
+    return itertools.takewhile(lambda token: token.start <= end, lexer)
+
+
+def _summarize_chunk(path, chunk, spans, max_name_length):
+    """
+    Lex and parse a chunk of a file in a worker process.
+    :param path: Path to the file
+    :param chunk: Chunk of the file
+    :param spans: Whether to use span tokens
+    :param max_name_length: Limit on the length of names
+    :return: Summary of the chunk, `None` if it has to be parsed again
+        from the known state of the parser
+    """
+    with open(path, 'rb') as input_file, \
+            map_file(input_file=input_file) as mapped:
+        top = _guess_top(mapped=mapped, chunk=chunk, spans=spans)
+        try:
+            parser = _FragmentParser(
+                input_stream=_chunk_tokens(
+                    mapped=mapped,
+                    chunk=chunk,
+                    spans=spans,
+                ),
+                spans=spans,
+                max_name_length=max_name_length,
+                top=top,
+            )
+        except (LexicalError, ParsingError, LimitError):
+            return None
+        return parser.summary(top=top)
+
+
+class _Stitcher:
+    """
+    Applies summaries of chunks to the state of the parser, in the order
+    of the chunks. Chunks whose summaries do not fit the state, or that
+    contain an error, are parsed again from the state, which gives the same
+    result as parsing the whole input at once.
+    :param mapped: Memory-mapped input
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation
+    """
+
+    def __init__(self, mapped, spans, limits):
+        self.mapped = mapped
+        self.spans = spans
+        self.limits = limits
+        self.unit = _CLOSE_UNITS[spans]
+        table = SPAN_TAG_PARSE_TABLE if spans else TAG_PARSE_TABLE
+        self.end = table.end
+        self.units = 0
+        self.rest = (table.start,)
+        self.names = []
+        self.tokens = 0
+
+    def apply(self, chunk, summary):
+        """
+        Update the state of the parser after a chunk.
+        :param chunk: Chunk of the input
+        :param summary: Summary of the chunk, `None` if not available
+        :raises LexicalError: If the chunk contains an invalid character
+        :raises ParsingError: If the chunk contains an invalid token
+        :raises LimitError: If a limit is exceeded in the chunk
+        """
+        if not self._fits(chunk=chunk, summary=summary):
+            self._parse(chunk=chunk)
+            return
+        closed = len(summary.closed)
+        if closed:
+            del self.names[-closed:]
+        # Names are compared by identity when parsing chunks again
+        self.names.extend(map(sys.intern, summary.opened))
+        self.units += summary.units - summary.demand
+        self.rest = summary.rest
+        self.tokens += summary.tokens
+
+    def _fits(self, chunk, summary):
+        """
+        Check whether parsing the chunk from the state gives the summary.
+        :param chunk: Chunk of the input
+        :param summary: Summary of the chunk, `None` if not available
+        :return: `True` if the summary can be applied
+        """
+        if summary is None or summary.top != self.rest:
+            return False
+        if summary.demand > self.units:
+            return False
+        closed = len(summary.closed)
+        if closed and summary.closed != self.names[:-closed - 1:-1]:
+            return False
+        max_depth = self.limits.max_depth
+        if (max_depth is not None
+                and len(self.names) + summary.depth > max_depth):
+            return False
+        max_tokens = self.limits.max_tokens
+        if (max_tokens is not None
+                and self.tokens + summary.tokens > max_tokens):
+            return False
+        if chunk.last:
+            return (summary.at_end
+                    and self.units == summary.demand + summary.units)
+        return not summary.at_end
+
+    def _parse(self, chunk):
+        """
+        Parse a chunk from the state.
+        :param chunk: Chunk of the input
+        :raises LexicalError: If the chunk contains an invalid character
+        :raises ParsingError: If the chunk contains an invalid token
+        :raises LimitError: If a limit is exceeded in the chunk
+        """
+        state = ParserState(
+            stack=[self.end, *self.unit * self.units, *self.rest],
+            names=self.names,
+        )
+        tokens = _chunk_tokens(
+            mapped=self.mapped,
+            chunk=chunk,
+            spans=self.spans,
+        )
+        try:
+            Parser(
+                input_stream=self._count_tokens(tokens=tokens),
+                parse_tokens=True,
+                spans=self.spans,
+                limits=Limits(
+                    max_depth=self.limits.max_depth,
+                    max_name_length=self.limits.max_name_length,
+                ),
+                state=state,
+            )
+        except ParsingError as error:
+            # Tokens of the chunk are exhausted between two tags
+            if chunk.last or error.position is not None:
+                raise
+        self.names = state.names
+        self.units, self.rest = _split_stack(
+            stack=state.stack[1:],
+            unit=self.unit,
+        )
+
+    def _count_tokens(self, tokens):
+        """
+        Count tokens of a chunk, enforcing the limit on the number of tokens
+        of the whole input.
+        :param tokens: Iterator yielding tokens of the chunk
+        :return: Generator yielding the tokens
+        :raises LimitError: If there are too many tokens
+        """
+        max_tokens = self.limits.max_tokens
+        for token in tokens:
+            self.tokens += 1
+            if max_tokens is not None and self.tokens > max_tokens:
+                raise token_limit_error(max_tokens=max_tokens, token=token)
+            yield token
+
+
+def split_chunks(mapped, chunk_size):
+    """
+    Split the input into chunks of roughly the same size, each of them
+    starting at a `<`, which always starts a token.
+    :param mapped: Memory-mapped input
+    :param chunk_size: Minimum size of a chunk
+    :return: List of chunks
+    """
+    chunks = []
+    start = 0
+    length = len(mapped)
+    while True:
+        end = mapped.find(b'<', start + chunk_size)
+        if end == -1:
+            chunks.append(_Chunk(start=start, end=length, last=True))
+            return chunks
+        chunks.append(_Chunk(start=start, end=end, last=False))
+        start = end
+
+
+def validate_parallel(path, jobs=None, chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE,
+                      spans=False, limits=None, executor=None):
+    """
+    Validate a single large LittleXML file using a pool of worker processes.
+    The file is split into chunks at `<` characters, and each chunk is
+    lexed and parsed by a worker, assuming the symbol at the top of the stack
+    before it. The summaries of the chunks are then checked against the state
+    of the parser and applied in order, in time proportional to the number
+    of elements opened and closed in each chunk. Chunks that do not fit,
+    such as the chunk with the first error, are parsed again from the state,
+    so the result is the same as when validating the memory-mapped file
+    in a single process.
+    :param path: Path to the file
+    :param jobs: Number of worker processes, defaults to the number of CPUs
+    :param chunk_size: Minimum size of a chunk in bytes
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation
+    :param executor: `concurrent.futures.Executor` used instead of a new
+        process pool, which is not shut down
+    :return: Validation result
+    """
+    limits = limits if limits is not None else Limits()
+    try:
+        with open(path, 'rb') as input_file, \
+                map_file(input_file=input_file) as mapped:
+            limits.check_size(size=len(mapped))
+            chunks = split_chunks(mapped=mapped, chunk_size=chunk_size)
+            if len(chunks) == 1 or (jobs == 1 and executor is None):
+                return validate_file(
+                    path=path,
+                    spans=spans,
+                    memory_map=True,
+                    limits=limits,
+                )
+            _validate_chunks(
+                path=path,
+                mapped=mapped,
+                chunks=chunks,
+                jobs=jobs,
+                spans=spans,
+                limits=limits,
+                executor=executor,
+            )
+    except (LexicalError, ParsingError, LimitError) as error:
+        return ValidationResult(
+            path=path,
+            error_name=error.name,
+            message=str(error),
+        )
+    except (OSError, ValueError) as error:
+        return ValidationResult(
+            path=path,
+            error_name=INPUT_ERROR,
+            message=str(error),
+        )
+    return ValidationResult(path=path)
+
+
+def _validate_chunks(path, mapped, chunks, jobs, spans, limits, executor):
+    """
+    Validate chunks of a file in worker processes and stitch them together.
+    :param path: Path to the file
+    :param mapped: Memory-mapped file
+    :param chunks: List of chunks
+    :param jobs: Number of worker processes
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation
+    :param executor: Executor running the workers, `None` for a new
+        process pool
+    :raises LexicalError: If the file contains an invalid character
+    :raises ParsingError: If the file contains an invalid token
+    :raises LimitError: If a limit is exceeded
+    """
+    stitcher = _Stitcher(mapped=mapped, spans=spans, limits=limits)
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs,
+            )
+            stack.callback(executor.shutdown, cancel_futures=True)
+        futures = [
+            executor.submit(
+                _summarize_chunk,
+                path=path,
+                chunk=chunk,
+                spans=spans,
+                max_name_length=limits.max_name_length,
+            )
+            for chunk in chunks
+        ]
+        # Chunks after an error are not needed
+        for future in futures:
+            stack.callback(future.cancel)
+        for chunk, future in zip(chunks, futures):
+            stitcher.apply(chunk=chunk, summary=future.result())
@@ -1,79 +1,564 @@
 import sys
+import time
 
+from littlexml.diagnostics import TooManyErrors
+from littlexml.events import EventBuilder
 from littlexml.lexer import Lexer
-from littlexml.rule import RuleType, RULE_DICT
-from littlexml.token import TokenType
+from littlexml.limits import NO_LIMIT, LimitError, Limits
+from littlexml.rule import (
+    ActionType, RuleType, RULE_DICT, SPAN_RULE_DICT, add_tag_actions,
+    follow_sets,
+)
+from littlexml.table import (
+    PARSE_TABLE, SPAN_PARSE_TABLE, SPAN_TAG_PARSE_TABLE, TAG_PARSE_TABLE,
+)
+from littlexml.token import TOKEN_TYPE_IDS, TokenType
+
+
+def reverse_rules(rule_dict):
+    """
+    Reverse productions of a grammar, so that they can be pushed onto
+    the stack with the first element of a production ending up at the top.
+    :param rule_dict: Grammar mapping states to productions
+    :return: Grammar mapping states to reversed productions
+    """
+    return {
+        state: production[::-1]
+        for state, production in rule_dict.items()
+    }
+
+
+REVERSED_RULE_DICT = reverse_rules(rule_dict=RULE_DICT)
+REVERSED_SPAN_RULE_DICT = reverse_rules(rule_dict=SPAN_RULE_DICT)
+REVERSED_TAG_RULE_DICT = reverse_rules(
+    rule_dict=add_tag_actions(rule_dict=RULE_DICT),
+)
+REVERSED_SPAN_TAG_RULE_DICT = reverse_rules(
+    rule_dict=add_tag_actions(rule_dict=SPAN_RULE_DICT),
+)
+
+FOLLOW_SETS = follow_sets(rule_dict=RULE_DICT)
+SPAN_FOLLOW_SETS = follow_sets(rule_dict=SPAN_RULE_DICT)
+
+# Tokens at which the parser resumes after an error in recovery mode
+SYNC_TOKENS = frozenset({
+    TokenType.GREATER_THAN,
+    TokenType.LT_SLASH,
+    TokenType.END_OF_STRING,
+})
+
+
+def print_trace(step, stack_top, token, stack_depth):
+    """
+    Trace callback printing the top of the stack and the current token.
+    :param step: Number of the parsing step
+    :param stack_top: Element at the top of the stack
+    :param token: Current token
+    :param stack_depth: Number of elements on the stack, including the top
+    """
+    print(stack_top, token.token_type, file=sys.stderr)
+
+
+def _limit(value):
+    """
+    Get a limit that can be compared without checking if it is set.
+    :param value: Limit or `None` if not set
+    :return: The limit, or `NO_LIMIT` if not set
+    """
+    return value if value is not None else NO_LIMIT
+
+
+def select_grammar(spans=False, actions=True):
+    """
+    Select the grammar driving the parser.
+    :param spans: Whether span tokens are parsed
+    :param actions: Whether the grammar has actions collecting names
+        of elements, used for matching tags and enforcing limits on names
+    :return: Tuple of the reversed grammar and the parse table
+    """
+    if spans and actions:
+        return REVERSED_SPAN_TAG_RULE_DICT, SPAN_TAG_PARSE_TABLE
+    if spans:
+        return REVERSED_SPAN_RULE_DICT, SPAN_PARSE_TABLE
+    if actions:
+        return REVERSED_TAG_RULE_DICT, TAG_PARSE_TABLE
+    return REVERSED_RULE_DICT, PARSE_TABLE
+
+
+class ParserState:
+    """
+    State of the table-driven parser between two tokens. The parser updates
+    the state in place, so that parsing can be resumed from a copy of it
+    with the rest of the token stream.
+    :param stack: Encoded symbols on the stack, with the top at the end
+    :param names: Interned names of open elements
+    :param name_values: Values of tokens of the current name
+    :param name_start: Position of the current name
+    """
+    __slots__ = ('stack', 'names', 'name_values', 'name_start')
+
+    def __init__(self, stack, names=(), name_values=(), name_start=None):
+        self.stack = list(stack)
+        self.names = list(names)
+        self.name_values = list(name_values)
+        self.name_start = name_start
+
+    def copy(self):
+        """
+        Copy the state, which is cheap as the state only grows
+        with the nesting depth.
+        :return: Copy of the state
+        """
+        return ParserState(
+            stack=self.stack,
+            names=self.names,
+            name_values=self.name_values,
+            name_start=self.name_start,
+        )
 
 
 class Parser:
     """
     Parses a LittleXML string or stream of lexical tokens.
+    Token streams can be any iterable of tokens. They are consumed one token
+    at a time, so parsing stops at the first invalid token without reading
+    the rest of the stream.
+    Parsing is driven by a precompiled integer parse table, unless
+    statistics or tracing are requested.
+    Names in closing tags are checked against the names of open elements
+    by actions in the grammar, which collect the tokens of each name and
+    keep a stack of interned names of open elements.
+    The trace callback is called with the step number, the top of the stack,
+    the current token and the stack depth at every `trace_every`-th step.
     :param input_stream: The string or token stream to be parsed
     :param parse_tokens: Whether `input_stream` is a stream of tokens
-    :param verbose: Print verbose output
+    :param spans: Whether to parse span tokens produced by the lexer
+        in span mode
+    :param verbose: Print verbose output, same as using `print_trace`
+        as the trace callback
+    :param stats: `Statistics` object for counting parsing steps and
+        measuring the time spent parsing
+    :param trace: Trace callback
+    :param trace_every: Number of steps between calls of the trace callback
+    :param handler: Callable receiving events for the declaration, elements
+        and text as they are parsed, see `EventBuilder`
+    :param match_tags: Whether to check that names in closing tags match
+        the names of open elements
+    :param limits: `Limits` on the nesting depth, the number of tokens and
+        the length of names, also passed to the lexer when parsing a string
+    :param state: `ParserState` to resume parsing from, updated in place
+        as the token stream is parsed by the table-driven parser
+    :param diagnostics: `Diagnostics` collecting errors in recovery mode,
+        also passed to the lexer when parsing a string. After an error,
+        tokens are skipped up to the next `>`, `</` or the end of input,
+        and the stack is unwound until the parser can continue with
+        the token. Parsing stops when too many errors are found.
+    :raises ValueError: If recovery mode is combined with statistics
+        or tracing
     """
 
-    def __init__(self, input_stream, parse_tokens=False, verbose=False):
+    def __init__(self, input_stream, parse_tokens=False, spans=False,
+                 verbose=False, stats=None, trace=None, trace_every=1,
+                 handler=None, match_tags=True, limits=None, state=None,
+                 diagnostics=None):
         self.input_stream = input_stream
+        self.spans = spans
+        self.match_tags = match_tags
+        self.limits = limits if limits is not None else Limits()
+        self.diagnostics = diagnostics
         self.verbose = verbose
+        self.stats = stats
+        self.trace = print_trace if verbose else trace
+        self.trace_every = trace_every
+        self.handler = handler
+        if handler is not None:
+            self._on_token = EventBuilder(handler=handler).feed
+        else:
+            self._on_token = None
+        # Limits on names are enforced by the same actions as tag matching
+        self._rules, self._table = select_grammar(
+            spans=spans,
+            actions=match_tags or self.limits.checks_names,
+        )
+        if state is None:
+            state = ParserState(stack=[self._table.end, self._table.start])
+        self.state = state
+        # Names of open elements, and tokens of the current name
+        self._names = state.names
+        self._name_values = state.name_values
+        self._max_depth = _limit(value=self.limits.max_depth)
+        self._max_name_length = _limit(value=self.limits.max_name_length)
         if not parse_tokens:
-            self._tokens = Lexer(input_string=input_stream).tokens
+            # Errors are found in the order of their positions
+            # if the lexer runs along with the parser
+            lexer = Lexer(
+                input_string=input_stream,
+                spans=spans,
+                lazy=diagnostics is not None,
+                stats=stats,
+                limits=self.limits,
+                diagnostics=diagnostics,
+            )
+            tokens = lexer if lexer.lazy else lexer.tokens
         else:
-            self._tokens = list(input_stream)
-        self._parse()
+            tokens = input_stream
+        self._tokens = self.limits.limit_tokens(tokens=iter(tokens))
+        if diagnostics is not None:
+            if stats is not None or self.trace is not None:
+                raise ValueError('Statistics and tracing are not available '
+                                 'in recovery mode')
+            self._parse_with_recovery()
+            return
+        if stats is None and self.trace is None:
+            self._parse_table()
+            return
+
+        start = time.perf_counter()
+        lex_time = stats.lex_time if stats is not None else 0.0
+        try:
+            self._parse()
+        finally:
+            # Tokens can be produced lazily during parsing,
+            # which is not included in the time spent parsing
+            if stats is not None:
+                elapsed = time.perf_counter() - start
+                stats.parse_time += elapsed - (stats.lex_time - lex_time)
+
+    def _parse_table(self, token=None):
+        """
+        Perform syntactic analysis of the token stream
+        using the precompiled parse table.
+        On errors, the current token is kept in `_token` and the symbol
+        that did not match it is left at the top of the stack. When the stack
+        is emptied, the current token is kept in `_token` if it was not
+        matched, so that parsing can be resumed with more symbols.
+        :param token: Current token if already pulled from the stream
+        :raises ParsingError: If an unexpected token or end of input is
+            found in the input stream
+        """
+        table = self._table.table
+        token_count = self._table.token_count
+        token_ids = TOKEN_TYPE_IDS
+        tokens = self._tokens
+        on_token = self._on_token
+        symbols = self._table.symbols
+        name_char = self._table.symbol_ids[ActionType.NAME_CHAR]
+        state = self.state
+        name_values = self._name_values
+        max_name_length = self._max_name_length
+        position = 0
+
+        if token is None:
+            token = next(tokens, None)
+            if token is None:
+                self._token = None
+                raise ParsingError('Unexpected end of input')
+        token_id = token_ids[token.token_type]
+
+        stack = state.stack
+        while stack:
+            stack_top = stack.pop()
+
+            # Rule types are encoded after all token types
+            if stack_top >= token_count:
+                index = (stack_top - token_count) * token_count + token_id
+                stack_next = table[index]
+                if stack_next is None:
+                    break
+                stack.extend(stack_next)
+                continue
+
+            if stack_top != token_id:
+                # Actions are encoded as negative integers
+                if stack_top < 0:
+                    if stack_top == name_char:
+                        if not name_values:
+                            state.name_start = token.start
+                        name_values.append(token.value)
+                        # Each token of a name has at least one character
+                        if len(name_values) > max_name_length:
+                            self._check_name(name=''.join(name_values))
+                    else:
+                        self._position = position
+                        self._run_action(action=symbols[stack_top])
+                    continue
+                break
+            position += 1
+            if on_token is not None:
+                on_token(token)
+
+            # Only pull the next token if there is anything left to match
+            if stack:
+                token = next(tokens, None)
+                if token is None:
+                    self._position = position
+                    self._token = None
+                    raise ParsingError('Unexpected end of input')
+                token_id = token_ids[token.token_type]
+            else:
+                token = None
+        else:
+            self._position = position
+            self._token = token
+            return
+
+        self._position = position
+        self._token = token
+        stack.append(stack_top)
+        raise ParsingError(
+            f'Invalid token at position {token.start}: '
+            f'{token.token_type.value}',
+            position=token.start,
+        )
+
+    def _parse_with_recovery(self):
+        """
+        Perform syntactic analysis of the token stream using
+        the precompiled parse table, reporting errors to the diagnostics
+        and recovering from them, until the end of input or until too many
+        errors are found.
+        """
+        token = None
+        error_token = None
+        try:
+            while True:
+                try:
+                    self._parse_table(token=token)
+                    return
+                except ParsingError as error:
+                    token = self._token
+                    if token is None:
+                        self.diagnostics.report(error=error, position=None)
+                        return
+                    # Errors at the same token are caused by recovery
+                    if token is not error_token:
+                        self.diagnostics.report(
+                            error=error,
+                            position=token.start,
+                        )
+                    error_token = token
+                token = self._synchronize(token=token)
+                if token is None:
+                    return
+        except TooManyErrors:
+            return
+
+    def _synchronize(self, token):
+        """
+        Recover from an error in panic mode. Tokens are skipped up to
+        a synchronizing token, and symbols are popped from the stack until
+        the symbol at the top can continue with the token. Rule types are
+        popped if the token is in their FOLLOW set, otherwise the token
+        is skipped as well.
+        :param token: Token that caused the error
+        :return: Token to resume parsing at, `None` at the end of input
+        :raises TooManyErrors: If the lexer found too many errors
+        """
+        table = self._table
+        token_count = table.token_count
+        close_tag = table.symbol_ids[RuleType.CLOSE_TAG]
+        follow = SPAN_FOLLOW_SETS if self.spans else FOLLOW_SETS
+        stack = self.state.stack
+        while token is not None:
+            if token.token_type not in SYNC_TOKENS:
+                token = next(self._tokens, None)
+                continue
+            token_id = TOKEN_TYPE_IDS[token.token_type]
+            while True:
+                stack_top = stack[-1]
+                if stack_top < 0:
+                    stack.pop()
+                    self._skip_action(action=table.symbols[stack_top])
+                elif stack_top < token_count:
+                    if stack_top == token_id:
+                        return token
+                    # The end of input is only matched at the end
+                    if stack_top == table.end:
+                        break
+                    stack.pop()
+                else:
+                    index = table.index(rule_id=stack_top, token_id=token_id)
+                    if table.table[index] is not None:
+                        return token
+                    rule_type = table.symbols[stack_top]
+                    if (token.token_type not in follow[rule_type]
+                            and token.token_type != TokenType.END_OF_STRING):
+                        break
+                    stack.pop()
+                    # Each closing tag ends an element started before it
+                    if stack_top == close_tag and self._names:
+                        self._names.pop()
+            token = next(self._tokens, None)
+        return None
+
+    def _skip_action(self, action):
+        """
+        Finish the current name at the end of a tag popped from the stack
+        while recovering from an error, without checking it.
+        :param action: Action at the top of the stack
+        """
+        if action == ActionType.NAME_CHAR:
+            return
+        name = sys.intern(''.join(self._name_values))
+        self._name_values.clear()
+        if action == ActionType.END_ELEMENT:
+            if self._names:
+                self._names.pop()
+        elif action == ActionType.START_ELEMENT:
+            self._names.append(name)
 
     def _parse(self):
         """
-        Perform syntactic analysis of the token stream.
+        Perform syntactic analysis of the token stream,
+        collecting statistics and calling the trace callback.
         :raises ParsingError: If an unexpected token or end of input is
             found in the input stream
         """
         self._position = 0
-        self._stack = [RuleType.XML_DOCUMENT, TokenType.END_OF_STRING]
+        self._token = None
+        stats = self.stats
+        trace = self.trace
+        step = 0
+
+        # The top of the stack is the last element of the list,
+        # which makes both pushing and popping constant-time operations
+        self._stack = self._table.decode(symbol_ids=self.state.stack)
         while self._stack:
-            stack_top = self._stack.pop(0)
+            stack_depth = len(self._stack)
+            stack_top = self._stack.pop()
+            # Actions are not counted or traced as parsing steps
+            if isinstance(stack_top, ActionType):
+                if stack_top == ActionType.NAME_CHAR:
+                    token = self._get_token()
+                    if not self._name_values:
+                        self.state.name_start = token.start
+                    self._name_values.append(token.value)
+                    if len(self._name_values) > self._max_name_length:
+                        self._check_name(name=''.join(self._name_values))
+                else:
+                    self._run_action(action=stack_top)
+                continue
+            if stats is not None:
+                stats.steps += 1
+                if isinstance(stack_top, RuleType):
+                    stats.rule_steps[stack_top] += 1
+                if stack_depth > stats.max_stack_depth:
+                    stats.max_stack_depth = stack_depth
+            if trace is not None and step % self.trace_every == 0:
+                trace(
+                    step=step,
+                    stack_top=stack_top,
+                    token=self._get_token(),
+                    stack_depth=stack_depth,
+                )
+            step += 1
             stack_next = self._next_rule(stack_top=stack_top)
-            self._stack = stack_next + self._stack
+            self._stack.extend(stack_next)
 
     def _next_rule(self, stack_top):
         """
         Analyze token at the current position in the input stream.
-        :return: List of elements to push to the stack
+        :return: List of elements to push to the stack, in reverse order
         :raises ParsingError: If an unexpected token or end of input is
             found in the input stream
         """
         token = self._get_token()
 
-        if self.verbose:
-            print(stack_top, token.token_type, file=sys.stderr)
-
         if isinstance(stack_top, RuleType):
             state = stack_top, token.token_type
-            stack_next = RULE_DICT.get(state, None)
+            stack_next = self._rules.get(state, None)
             if stack_next is not None:
                 return stack_next
 
         if isinstance(stack_top, TokenType) and token.token_type == stack_top:
             self._position += 1
+            self._token = None
+            if self._on_token is not None:
+                self._on_token(token)
             return []
 
         raise ParsingError(
             f'Invalid token at position {token.start}: '
-            f'{token.token_type.value}'
+            f'{token.token_type.value}',
+            position=token.start,
         )
 
+    def _run_action(self, action):
+        """
+        Finish the current name at the end of a tag.
+        :param action: Action at the top of the stack
+        :raises ParsingError: If the name in a closing tag does not match
+            the name of the innermost open element
+        :raises LimitError: If the name is too long or the element is
+            nested too deep
+        """
+        name = sys.intern(''.join(self._name_values))
+        self._name_values.clear()
+        self._check_name(name=name)
+        if action == ActionType.END_ELEMENT:
+            expected = self._names.pop()
+            # Interned names can be compared by identity
+            if self.match_tags and name is not expected:
+                error = ParsingError(
+                    f'Mismatched closing tag at position '
+                    f'{self.state.name_start}: '
+                    f'expected {expected}, found {name}',
+                    position=self.state.name_start,
+                )
+                if self.diagnostics is None:
+                    raise error
+                self.diagnostics.report(
+                    error=error,
+                    position=self.state.name_start,
+                )
+            return
+
+        # Empty elements are nested in the open elements as well
+        if len(self._names) >= self._max_depth:
+            raise LimitError(
+                f'Nesting depth limit of {self._max_depth} exceeded '
+                f'at position {self.state.name_start}',
+                position=self.state.name_start,
+            )
+        if action == ActionType.START_ELEMENT:
+            self._names.append(name)
+
+    def _check_name(self, name):
+        """
+        Check the length of a name against the limit.
+        :param name: Name or its beginning
+        :raises LimitError: If the name is too long
+        """
+        if len(name) > self._max_name_length:
+            raise LimitError(
+                f'Name length limit of {self._max_name_length} exceeded '
+                f'at position {self.state.name_start}',
+                position=self.state.name_start,
+            )
+
     def _get_token(self):
         """
-        Get current token in the input stream.
+        Get current token in the input stream,
+        pulling it from the token iterator if needed.
         :return: The current token
         :raises ParsingError: If end of input is found
         """
-        try:
-            token = self._tokens[self._position]
-        except IndexError:
-            raise ParsingError('Unexpected end of input')
-        return token
+        if self._token is None:
+            try:
+                self._token = next(self._tokens)
+            except StopIteration:
+                raise ParsingError('Unexpected end of input')
+        return self._token
 
 
 class ParsingError(Exception):
+    """
+    :param message: Error message
+    :param position: Position of the invalid token or tag, `None` at the end
+        of input
+    """
     name = 'Parsing error'
+
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.position = position
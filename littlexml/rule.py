@@ -1,166 +1,123 @@
 from enum import Enum
 
+# Rule types and grammars are compiled from `grammar.bnf`
+from littlexml.grammar_tables import RuleType, RULE_DICT, SPAN_RULE_DICT
 from littlexml.token import TokenType
 
 
-class RuleType(Enum):
-    XML_DOCUMENT = 'xml_document'
-    XML_DECLARATION = 'xml_declaration'
-    VERSION_NUMBER = 'version_number'
-    ELEMENT = 'element'
-    OPEN_TAG = 'open_tag'
-    CLOSE_TAG = 'close_tag'
-    WORDS = 'words'
-    NEXT_WORD = 'next_word'
-    NAME = 'name'
-    NAME_CHARS = 'name_chars'
-    NUMBER = 'number'
-    NEXT_DIGIT = 'next_digit'
-    WORD = 'word'
-    NEXT_CHAR = 'next_char'
+class ActionType(Enum):
+    NAME_CHAR = 'name_char'
+    START_ELEMENT = 'start_element'
+    EMPTY_ELEMENT = 'empty_element'
+    END_ELEMENT = 'end_element'
 
 
-RULE_DICT = {
-    (RuleType.XML_DOCUMENT, TokenType.LT_XML): [
-        RuleType.XML_DECLARATION,
-        RuleType.ELEMENT,
-    ],
-    (RuleType.XML_DOCUMENT, TokenType.LESS_THAN): [
-        RuleType.ELEMENT,
-    ],
-    (RuleType.XML_DECLARATION, TokenType.LT_XML): [
-        TokenType.LT_XML,
-        TokenType.SPACE,
-        TokenType.VERSION,
-        RuleType.VERSION_NUMBER,
-        TokenType.GT_XML,
-    ],
-    (RuleType.VERSION_NUMBER, TokenType.DIGIT): [
-        RuleType.NUMBER,
-        TokenType.DOT,
-        RuleType.NUMBER,
-    ],
-    (RuleType.ELEMENT, TokenType.LESS_THAN): [
-        TokenType.LESS_THAN,
-        RuleType.NAME,
-        RuleType.OPEN_TAG,
-    ],
-    (RuleType.OPEN_TAG, TokenType.GREATER_THAN): [
-        TokenType.GREATER_THAN,
-        RuleType.CLOSE_TAG,
-    ],
-    (RuleType.OPEN_TAG, TokenType.GT_SLASH): [
-        TokenType.GT_SLASH,
-    ],
-    (RuleType.CLOSE_TAG, TokenType.LESS_THAN): [
-        RuleType.ELEMENT,
-        TokenType.LT_SLASH,
-        RuleType.NAME,
-        TokenType.GREATER_THAN,
-    ],
-    (RuleType.CLOSE_TAG, TokenType.LETTER): [
-        RuleType.WORDS,
-        TokenType.LT_SLASH,
-        RuleType.NAME,
-        TokenType.GREATER_THAN,
-    ],
-    (RuleType.CLOSE_TAG, TokenType.DIGIT): [
-        RuleType.WORDS,
-        TokenType.LT_SLASH,
-        RuleType.NAME,
-        TokenType.GREATER_THAN,
-    ],
-    (RuleType.CLOSE_TAG, TokenType.SIGN): [
-        RuleType.WORDS,
-        TokenType.LT_SLASH,
-        RuleType.NAME,
-        TokenType.GREATER_THAN,
-    ],
-    (RuleType.WORDS, TokenType.LETTER): [
-        RuleType.WORD,
-        RuleType.NEXT_WORD,
-    ],
-    (RuleType.WORDS, TokenType.DIGIT): [
-        RuleType.WORD,
-        RuleType.NEXT_WORD,
-    ],
-    (RuleType.WORDS, TokenType.SIGN): [
-        RuleType.WORD,
-        RuleType.NEXT_WORD,
-    ],
-    (RuleType.NEXT_WORD, TokenType.LT_SLASH): [],
-    (RuleType.NEXT_WORD, TokenType.SPACE): [
-        TokenType.SPACE,
-        RuleType.WORDS,
-    ],
-    (RuleType.NAME, TokenType.UNDERSCORE): [
-        TokenType.UNDERSCORE,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME, TokenType.COLON): [
-        TokenType.COLON,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME, TokenType.LETTER): [
-        TokenType.LETTER,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.DOT): [
-        TokenType.DOT,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.GREATER_THAN): [],
-    (RuleType.NAME_CHARS, TokenType.GT_SLASH): [],
-    (RuleType.NAME_CHARS, TokenType.UNDERSCORE): [
-        TokenType.UNDERSCORE,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.COLON): [
-        TokenType.COLON,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.HYPHEN): [
-        TokenType.HYPHEN,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.LETTER): [
-        TokenType.LETTER,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NAME_CHARS, TokenType.DIGIT): [
-        TokenType.DIGIT,
-        RuleType.NAME_CHARS,
-    ],
-    (RuleType.NUMBER, TokenType.DIGIT): [
-        TokenType.DIGIT,
-        RuleType.NEXT_DIGIT,
-    ],
-    (RuleType.NEXT_DIGIT, TokenType.GT_XML): [],
-    (RuleType.NEXT_DIGIT, TokenType.DOT): [],
-    (RuleType.NEXT_DIGIT, TokenType.DIGIT): [
-        RuleType.NUMBER,
-    ],
-    (RuleType.WORD, TokenType.LETTER): [
-        TokenType.LETTER,
-        RuleType.NEXT_CHAR,
-    ],
-    (RuleType.WORD, TokenType.DIGIT): [
-        TokenType.DIGIT,
-        RuleType.NEXT_CHAR,
-    ],
-    (RuleType.WORD, TokenType.SIGN): [
-        TokenType.SIGN,
-        RuleType.NEXT_CHAR,
-    ],
-    (RuleType.NEXT_CHAR, TokenType.LT_SLASH): [],
-    (RuleType.NEXT_CHAR, TokenType.SPACE): [],
-    (RuleType.NEXT_CHAR, TokenType.LETTER): [
-        RuleType.WORD,
-    ],
-    (RuleType.NEXT_CHAR, TokenType.DIGIT): [
-        RuleType.WORD,
-    ],
-    (RuleType.NEXT_CHAR, TokenType.SIGN): [
-        RuleType.WORD,
-    ],
-}
+def add_tag_actions(rule_dict):
+    """
+    Insert actions for matching names of tags into the productions
+    of a grammar. Each token of a name is preceded by `NAME_CHAR`,
+    the name of an element is followed by `START_ELEMENT` before the end
+    of the opening tag or `EMPTY_ELEMENT` before the end of an empty
+    element, and the name in a closing tag is followed by `END_ELEMENT`.
+    :param rule_dict: Grammar mapping states to productions
+    :return: Grammar mapping states to productions with actions
+    """
+    action_dict = {}
+    for (rule_type, token_type), production in rule_dict.items():
+        production = list(production)
+        if rule_type in (RuleType.NAME, RuleType.NAME_CHARS) and production:
+            production.insert(0, ActionType.NAME_CHAR)
+        elif rule_type == RuleType.OPEN_TAG:
+            if token_type == TokenType.GREATER_THAN:
+                production.insert(0, ActionType.START_ELEMENT)
+            else:
+                production.insert(0, ActionType.EMPTY_ELEMENT)
+        elif rule_type == RuleType.CLOSE_TAG:
+            index = production.index(RuleType.NAME) + 1
+            production.insert(index, ActionType.END_ELEMENT)
+        action_dict[rule_type, token_type] = production
+    return action_dict
+
+
+def first_sets(rule_dict):
+    """
+    Compute the FIRST set of each rule type of a grammar, containing
+    the token types that can start the rule, and find the rule types that
+    can produce no tokens at all. Only the rule types of the keys are
+    used, so productions can also be keyed by anything else than the next
+    token type. Actions are ignored.
+    :param rule_dict: Grammar mapping states to productions
+    :return: Tuple of a dict mapping rule types to sets of token types,
+        and a set of nullable rule types
+    """
+    first = {rule_type: set() for rule_type, _ in rule_dict}
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for (rule_type, _), production in rule_dict.items():
+            tokens, production_nullable = sequence_first(
+                symbols=production,
+                first=first,
+                nullable=nullable,
+            )
+            if not tokens <= first[rule_type]:
+                first[rule_type] |= tokens
+                changed = True
+            if production_nullable and rule_type not in nullable:
+                nullable.add(rule_type)
+                changed = True
+    return first, nullable
+
+
+def sequence_first(symbols, first, nullable):
+    """
+    Compute the FIRST set of a sequence of symbols.
+    :param symbols: Sequence of token types, rule types and actions
+    :param first: FIRST sets of rule types
+    :param nullable: Nullable rule types
+    :return: Tuple of a set of token types, and whether the sequence
+        can produce no tokens at all
+    """
+    tokens = set()
+    for symbol in symbols:
+        if isinstance(symbol, TokenType):
+            tokens.add(symbol)
+            return tokens, False
+        if symbol in first:
+            tokens |= first[symbol]
+            if symbol not in nullable:
+                return tokens, False
+    return tokens, True
+
+
+def follow_sets(rule_dict, start=RuleType.XML_DOCUMENT):
+    """
+    Compute the FOLLOW set of each rule type of a grammar, containing
+    the token types that can come right after the rule. The start rule
+    is followed by the end of input.
+    :param rule_dict: Grammar mapping states to productions
+    :param start: Start rule type
+    :return: Dict mapping rule types to sets of token types
+    """
+    first, nullable = first_sets(rule_dict=rule_dict)
+    follow = {rule_type: set() for rule_type in first}
+    follow[start].add(TokenType.END_OF_STRING)
+    changed = True
+    while changed:
+        changed = False
+        for (rule_type, _), production in rule_dict.items():
+            for index, symbol in enumerate(production):
+                if symbol not in follow:
+                    continue
+                tokens, rest_nullable = sequence_first(
+                    symbols=production[index + 1:],
+                    first=first,
+                    nullable=nullable,
+                )
+                if rest_nullable:
+                    tokens |= follow[rule_type]
+                if not tokens <= follow[symbol]:
+                    follow[symbol] |= tokens
+                    changed = True
+    return follow
@@ -0,0 +1,355 @@
+import json
+
+from littlexml.token import TOKEN_TYPES, TOKEN_TYPE_IDS, Token, TokenStream
+
+
+FORMATS = ('json', 'jsonl', 'binary')
+
+# Binary token streams start with a magic number and a format version,
+# followed by one record for each token. A record starts with the type id
+# of the token, with flags for optional fields, followed by the difference
+# between the start of the token and the start of the previous token
+# as a signed variable-length integer. Tokens with a value continue with
+# the length of the encoded value as an unsigned variable-length integer
+# and the value itself, and tokens with an end position with the signed
+# difference between the end and the start.
+BINARY_MAGIC = b'LXTK'
+BINARY_VERSION = 1
+BINARY_HEADER = BINARY_MAGIC + bytes([BINARY_VERSION])
+
+_HAS_VALUE = 0x80
+_HAS_END = 0x40
+_TYPE_MASK = 0x3f
+
+# Record fields fit into this many bytes, except for values
+_MAX_RECORD_HEADER = 1 + 3 * 10
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _binary_file(file):
+    """
+    Get the underlying binary file of a text file.
+    :param file: File object opened in text or binary mode
+    :return: File object opened in binary mode
+    """
+    return getattr(file, 'buffer', file)
+
+
+def _encode_signed(value, output):
+    """
+    Append a signed variable-length integer in zigzag encoding.
+    :param value: Integer to encode
+    :param output: Bytearray to append to
+    """
+    value = value << 1 if value >= 0 else (-value << 1) - 1
+    _encode_varint(value=value, output=output)
+
+
+def _encode_varint(value, output):
+    """
+    Append an unsigned variable-length integer.
+    :param value: Non-negative integer to encode
+    :param output: Bytearray to append to
+    """
+    while value >= 0x80:
+        output.append(value & 0x7f | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+class BinaryTokenWriter:
+    """
+    Writes tokens to a file in the binary token stream format.
+    Records are collected in a buffer, which is written to the file
+    whenever it grows over the buffer size.
+    :param output_file: File object to write to
+    :param buffer_size: Number of bytes to buffer before writing
+    """
+
+    def __init__(self, output_file, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.output_file = _binary_file(output_file)
+        self.buffer_size = buffer_size
+        self._buffer = bytearray(BINARY_HEADER)
+        self._start = 0
+
+    def write(self, token):
+        """
+        Add a token to the stream.
+        :param token: Token to write
+        """
+        buffer = self._buffer
+        type_id = TOKEN_TYPE_IDS[token.token_type]
+        if token.value is not None:
+            type_id |= _HAS_VALUE
+        if token.end is not None:
+            type_id |= _HAS_END
+        buffer.append(type_id)
+        _encode_signed(value=token.start - self._start, output=buffer)
+        self._start = token.start
+        if token.value is not None:
+            value = token.value.encode()
+            _encode_varint(value=len(value), output=buffer)
+            buffer += value
+        if token.end is not None:
+            _encode_signed(value=token.end - token.start, output=buffer)
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, tokens):
+        """
+        Add all tokens to the stream and flush the buffer.
+        :param tokens: Iterable of tokens to write
+        """
+        for token in tokens:
+            self.write(token=token)
+        self.flush()
+
+    def flush(self):
+        """
+        Write buffered records to the file.
+        """
+        self.output_file.write(self._buffer)
+        self.output_file.flush()
+        self._buffer = bytearray()
+
+
+class BinaryTokenReader:
+    """
+    Reads tokens from a file in the binary token stream format.
+    The file is read in chunks, and iterating over the object yields
+    tokens as they are decoded.
+    :param input_file: File object to read from
+    :param buffer_size: Number of bytes read from the file at once
+    :raises FormatError: If the file does not start with a valid header
+    """
+
+    def __init__(self, input_file, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.input_file = _binary_file(input_file)
+        self.buffer_size = buffer_size
+        self._buffer = b''
+        self._index = 0
+        self._read_header()
+
+    def __iter__(self):
+        start = 0
+        while self._fill(size=_MAX_RECORD_HEADER):
+            try:
+                type_id = self._buffer[self._index]
+                self._index += 1
+                start += self._read_signed()
+                value = None
+                if type_id & _HAS_VALUE:
+                    length = self._read_varint()
+                    # The value is followed by the rest of the record
+                    self._fill(size=length + _MAX_RECORD_HEADER)
+                    if len(self._buffer) - self._index < length:
+                        raise IndexError
+                    value_end = self._index + length
+                    value = self._buffer[self._index:value_end].decode()
+                    self._index = value_end
+                end = None
+                if type_id & _HAS_END:
+                    end = start + self._read_signed()
+                token_type = TOKEN_TYPES[type_id & _TYPE_MASK]
+            except (IndexError, UnicodeDecodeError):
+                raise FormatError('Truncated or invalid token record')
+            yield Token(
+                token_type=token_type,
+                start=start,
+                value=value,
+                end=end,
+            )
+
+    def _read_header(self):
+        """
+        Check the magic number and version at the start of the file.
+        :raises FormatError: If the header is invalid
+        """
+        self._fill(size=len(BINARY_HEADER))
+        header = self._buffer[:len(BINARY_HEADER)]
+        if header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise FormatError('Not a binary token stream')
+        if header[len(BINARY_MAGIC):] != bytes([BINARY_VERSION]):
+            raise FormatError('Unsupported binary token stream version')
+        self._index = len(BINARY_HEADER)
+
+    def _fill(self, size):
+        """
+        Read from the file until at least `size` bytes are buffered
+        after the current index, or until end of file. The file is read
+        in chunks of the buffer size, so that a corrupt size never takes
+        more memory than the rest of the file.
+        :param size: Number of bytes needed
+        :return: Whether any bytes are buffered after the current index
+        """
+        missing = size - (len(self._buffer) - self._index)
+        if missing > 0:
+            chunks = [self._buffer[self._index:]]
+            while missing > 0:
+                chunk = self.input_file.read(self.buffer_size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                missing -= len(chunk)
+            self._buffer = b''.join(chunks)
+            self._index = 0
+        return self._index < len(self._buffer)
+
+    def _read_signed(self):
+        """
+        Decode a signed variable-length integer at the current index.
+        :return: Decoded integer
+        :raises IndexError: If the integer is truncated
+        """
+        value = self._read_varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def _read_varint(self):
+        """
+        Decode an unsigned variable-length integer at the current index.
+        :return: Decoded integer
+        :raises IndexError: If the integer is truncated
+        """
+        buffer = self._buffer
+        index = self._index
+        value = 0
+        shift = 0
+        while True:
+            byte = buffer[index]
+            index += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self._index = index
+        return value
+
+
+class JsonTokenWriter:
+    """
+    Writes tokens to a text file in JSON format as they are produced,
+    either as a JSON array or as JSON Lines with one token per line.
+    The JSON array is formatted in the same way as by `json.dump` with
+    an indent of two spaces. Serialized tokens are collected in a buffer,
+    which is written to the file whenever it grows over the buffer size.
+    :param output_file: File object to write to
+    :param lines: Whether to write JSON Lines instead of a JSON array
+    :param buffer_size: Number of characters to buffer before writing
+    """
+
+    def __init__(self, output_file, lines=False,
+                 buffer_size=DEFAULT_BUFFER_SIZE):
+        self.output_file = output_file
+        self.lines = lines
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        self._count = 0
+
+    def write(self, token):
+        """
+        Add a token to the stream.
+        :param token: Token to write
+        """
+        if self.lines:
+            text = json.dumps(token.to_dict(), separators=(',', ':')) + '\n'
+        else:
+            text = json.dumps(token.to_dict(), indent=2)
+            separator = ',\n  ' if self._count else '[\n  '
+            text = separator + text.replace('\n', '\n  ')
+        self._count += 1
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, tokens):
+        """
+        Add all tokens to the stream, finish it and flush the buffer.
+        :param tokens: Iterable of tokens to write
+        """
+        for token in tokens:
+            self.write(token=token)
+        self.close()
+
+    def close(self):
+        """
+        Finish the JSON array, if any, and flush the buffer.
+        """
+        if not self.lines:
+            self._buffer.append('\n]\n' if self._count else '[]\n')
+        self.flush()
+
+    def flush(self):
+        """
+        Write buffered tokens to the file.
+        """
+        self.output_file.write(''.join(self._buffer))
+        self.output_file.flush()
+        self._buffer = []
+        self._buffered = 0
+
+
+class JsonLinesTokenReader:
+    """
+    Reads tokens from a text file in JSON Lines format, with one token
+    per line. Iterating over the object yields tokens as lines are read.
+    :param input_file: File object to read from
+    """
+
+    def __init__(self, input_file):
+        self.input_file = input_file
+
+    def __iter__(self):
+        for line_number, line in enumerate(self.input_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                token_dict = json.loads(line)
+                yield Token.from_dict(token_dict=token_dict)
+            except (ValueError, KeyError, TypeError) as error:
+                raise FormatError(
+                    f'Invalid token at line {line_number}: {error}'
+                )
+
+
+def write_tokens(tokens, output_file, token_format='json'):
+    """
+    Write a token stream to a file as the tokens are produced.
+    :param tokens: Iterable of tokens
+    :param output_file: File object to write to
+    :param token_format: Format of the token stream, one of `FORMATS`
+    """
+    if token_format == 'binary':
+        output_file.flush()
+        writer = BinaryTokenWriter(output_file=output_file)
+    else:
+        writer = JsonTokenWriter(
+            output_file=output_file,
+            lines=token_format == 'jsonl',
+        )
+    writer.write_all(tokens=tokens)
+
+
+def read_tokens(input_file, token_format='json'):
+    """
+    Read a token stream from a file.
+    :param input_file: File object to read from
+    :param token_format: Format of the token stream, one of `FORMATS`
+    :return: Iterable of tokens
+    :raises FormatError: If the token stream cannot be decoded
+    """
+    if token_format == 'binary':
+        return BinaryTokenReader(input_file=input_file)
+    if token_format == 'jsonl':
+        return JsonLinesTokenReader(input_file=input_file)
+    try:
+        token_list = json.load(input_file)
+        return TokenStream.from_list(token_list=token_list)
+    except (ValueError, KeyError, TypeError) as error:
+        raise FormatError(f'Invalid JSON token stream: {error}')
+
+
+class FormatError(Exception):
+    name = 'Format error'
@@ -0,0 +1,241 @@
+import asyncio
+import json
+
+from littlexml.aio import validate_async
+from littlexml.lexer import DEFAULT_CHUNK_SIZE, LexicalError
+from littlexml.limits import LimitError
+from littlexml.parser import ParsingError
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_CONCURRENCY = 16
+VALIDATE_PATH = '/validate'
+
+_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+}
+
+
+class HTTPError(Exception):
+    """
+    Error in a request, answered with the status code.
+    :param status: HTTP status code
+    :param message: Error message
+    """
+    name = 'HTTP error'
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _BodyReader:
+    """
+    Reader of the body of a request with a known length.
+    :param reader: Stream reader of the connection
+    :param length: Number of bytes in the body
+    """
+
+    def __init__(self, reader, length):
+        self.reader = reader
+        self.remaining = length
+
+    async def read(self, size):
+        """
+        Read up to `size` bytes of the body.
+        :param size: Maximum number of bytes
+        :return: Bytes, empty at the end of the body
+        :raises HTTPError: If the connection is closed before the end
+        """
+        if not self.remaining:
+            return b''
+        chunk = await self.reader.read(min(size, self.remaining))
+        if not chunk:
+            raise HTTPError(status=400, message='Incomplete request body')
+        self.remaining -= len(chunk)
+        return chunk
+
+    async def discard(self):
+        """
+        Read the rest of the body without validating it.
+        """
+        while await self.read(size=DEFAULT_CHUNK_SIZE):
+            pass
+
+
+class ValidationServer:
+    """
+    Local HTTP server validating LittleXML documents sent in the body
+    of `POST /validate` requests. Each response is a JSON object with
+    the `ok` member, and the `error` and `message` members for invalid
+    documents. Connections are closed after each response.
+    Documents are validated while their body is received, and at most
+    `concurrency` documents are validated at once. Other requests wait
+    without their bodies being read, so that clients sending more than
+    the server can handle are slowed down by the transport.
+    :param host: Host name or address to listen on
+    :param port: Port to listen on, `0` to pick a free port
+    :param concurrency: Maximum number of documents validated at once
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced for every document
+    :param chunk_size: Maximum number of bytes read at once
+    :param executor: `concurrent.futures.Executor` processing the chunks
+        of large documents, `None` to process them in the event loop
+    :param offload_after: Number of bytes of a document read before
+        its chunks are processed in the executor
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 concurrency=DEFAULT_CONCURRENCY, spans=False, limits=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                 offload_after=DEFAULT_CHUNK_SIZE):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.spans = spans
+        self.limits = limits
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.offload_after = offload_after
+        self._semaphore = None
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start(self):
+        """
+        Start listening. The port picked by the system is stored
+        in `port`.
+        :raises OSError: If the address cannot be used
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._server = await asyncio.start_server(
+            self._handle,
+            host=self.host,
+            port=self.port,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Start listening if needed and serve requests until cancelled.
+        :raises OSError: If the address cannot be used
+        """
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and wait until the server is closed.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """
+        Answer a single request and close the connection.
+        :param reader: Stream reader of the connection
+        :param writer: Stream writer of the connection
+        """
+        try:
+            try:
+                status, result = await self._respond(reader=reader)
+            except HTTPError as error:
+                status = error.status
+                result = self._error_result(error=error)
+            body = json.dumps(result).encode()
+            writer.write(
+                f'HTTP/1.1 {status} {_REASONS[status]}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: close\r\n'
+                f'\r\n'.encode() + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        """
+        Read a request and validate the document in its body.
+        :param reader: Stream reader of the connection
+        :return: Tuple of the status code and the result
+        :raises HTTPError: If the request is not valid
+        """
+        method, path, headers = await self._read_head(reader=reader)
+        if path != VALIDATE_PATH:
+            raise HTTPError(status=404, message=f'Unknown path: {path}')
+        if method != 'POST':
+            raise HTTPError(status=405, message=f'Unknown method: {method}')
+        try:
+            length = int(headers['content-length'])
+        except KeyError:
+            raise HTTPError(status=411, message='Missing content length')
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(status=400, message='Invalid content length')
+
+        body = _BodyReader(reader=reader, length=length)
+        # Bodies of waiting requests are left unread
+        async with self._semaphore:
+            try:
+                await validate_async(
+                    reader=body,
+                    spans=self.spans,
+                    limits=self.limits,
+                    chunk_size=self.chunk_size,
+                    executor=self.executor,
+                    offload_after=self.offload_after,
+                )
+            except LimitError as error:
+                # The rest of the body is not read, as it may be too large
+                return 200, self._error_result(error=error)
+            except (LexicalError, ParsingError) as error:
+                result = self._error_result(error=error)
+            else:
+                return 200, {'ok': True}
+        # The client may not read the response until the body is sent
+        await body.discard()
+        return 200, result
+
+    async def _read_head(self, reader):
+        """
+        Read the request line and headers.
+        :param reader: Stream reader of the connection
+        :return: Tuple of the method, the path and a dict of headers
+            with lowercase names
+        :raises HTTPError: If the request line or headers are malformed
+        """
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, value = line.decode('latin-1').split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            raise HTTPError(status=400, message='Malformed request')
+        path = target.split('?', 1)[0]
+        return method, path, headers
+
+    @staticmethod
+    def _error_result(error):
+        return {'ok': False, 'error': error.name, 'message': str(error)}
+
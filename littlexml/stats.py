@@ -0,0 +1,37 @@
+import collections
+
+
+class Statistics:
+    """
+    Counters and timings collected during lexical and syntactic analysis.
+    Pass the same object to `Lexer` and `Parser` to collect both.
+    """
+
+    def __init__(self):
+        self.token_counts = collections.Counter()
+        self.rule_steps = collections.Counter()
+        self.steps = 0
+        self.max_stack_depth = 0
+        self.lex_time = 0.0
+        self.parse_time = 0.0
+
+    def as_dict(self):
+        """
+        Get statistics in a serializable format.
+        :return: Statistics as dict
+        """
+        return {
+            'tokens': sum(self.token_counts.values()),
+            'token_counts': {
+                token_type.value: count
+                for token_type, count in self.token_counts.most_common()
+            },
+            'steps': self.steps,
+            'rule_steps': {
+                rule_type.value: count
+                for rule_type, count in self.rule_steps.most_common()
+            },
+            'max_stack_depth': self.max_stack_depth,
+            'lex_time': self.lex_time,
+            'parse_time': self.parse_time,
+        }
@@ -0,0 +1,86 @@
+from littlexml.rule import (
+    ActionType, RuleType, RULE_DICT, SPAN_RULE_DICT, add_tag_actions,
+)
+from littlexml.token import TOKEN_TYPES, TOKEN_TYPE_IDS, TokenType
+
+
+RULE_TYPES = tuple(RuleType)
+ACTION_TYPES = tuple(ActionType)
+
+
+class ParseTable:
+    """
+    Dense LL(1) parse table compiled from a grammar.
+    Symbols are encoded as small integers: token types use their ids from
+    `TOKEN_TYPE_IDS`, rule types follow after all token types. The table
+    holds a production for each pair of rule type and token type, reversed
+    and encoded, or `None` if the pair is not allowed by the grammar.
+    Actions in productions are encoded as negative integers, so that
+    they never match a token type.
+    :param rule_dict: Grammar mapping states to productions
+    """
+
+    def __init__(self, rule_dict):
+        self.token_count = len(TOKEN_TYPES)
+        # Negative indices of actions count from the end of the symbols
+        self.symbols = TOKEN_TYPES + RULE_TYPES + ACTION_TYPES[::-1]
+        self.symbol_ids = {
+            symbol: symbol_id
+            for symbol_id, symbol in enumerate(TOKEN_TYPES + RULE_TYPES)
+        }
+        self.symbol_ids.update({
+            action_type: -1 - action_id
+            for action_id, action_type in enumerate(ACTION_TYPES)
+        })
+        self.start = self.symbol_ids[RuleType.XML_DOCUMENT]
+        self.end = self.symbol_ids[TokenType.END_OF_STRING]
+
+        table = [None] * (len(RULE_TYPES) * self.token_count)
+        for (rule_type, token_type), production in rule_dict.items():
+            index = self.index(
+                rule_id=self.symbol_ids[rule_type],
+                token_id=TOKEN_TYPE_IDS[token_type],
+            )
+            table[index] = tuple(
+                self.symbol_ids[symbol]
+                for symbol in reversed(production)
+            )
+        self.table = tuple(table)
+
+    def index(self, rule_id, token_id):
+        """
+        Get the index of a table entry.
+        :param rule_id: Encoded rule type
+        :param token_id: Encoded token type
+        :return: Index into `table`
+        """
+        return (rule_id - self.token_count) * self.token_count + token_id
+
+    def get(self, rule_type, token_type):
+        """
+        Look up a production in the table.
+        :param rule_type: Rule type at the top of the stack
+        :param token_type: Type of the current token
+        :return: Reversed and encoded production, `None` if not allowed
+        """
+        index = self.index(
+            rule_id=self.symbol_ids[rule_type],
+            token_id=TOKEN_TYPE_IDS[token_type],
+        )
+        return self.table[index]
+
+    def decode(self, symbol_ids):
+        """
+        Decode a sequence of symbols.
+        :param symbol_ids: Encoded symbols
+        :return: List of token types, rule types and actions
+        """
+        return [self.symbols[symbol_id] for symbol_id in symbol_ids]
+
+
+PARSE_TABLE = ParseTable(rule_dict=RULE_DICT)
+SPAN_PARSE_TABLE = ParseTable(rule_dict=SPAN_RULE_DICT)
+TAG_PARSE_TABLE = ParseTable(rule_dict=add_tag_actions(rule_dict=RULE_DICT))
+SPAN_TAG_PARSE_TABLE = ParseTable(
+    rule_dict=add_tag_actions(rule_dict=SPAN_RULE_DICT),
+)
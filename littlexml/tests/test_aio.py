@@ -0,0 +1,146 @@
+import asyncio
+import concurrent.futures
+import io
+import unittest
+
+from littlexml.aio import ChunkValidator, validate_async
+from littlexml.lexer import LexicalError, StreamLexer
+from littlexml.limits import LimitError, Limits
+from littlexml.parser import Parser, ParsingError
+from littlexml.tests import test_parser
+
+
+def stream_error(input_string, spans=False, limits=None, chunk_size=1):
+    try:
+        Parser(
+            input_stream=StreamLexer(
+                input_file=io.StringIO(input_string),
+                chunk_size=chunk_size,
+                spans=spans,
+                limits=limits,
+            ),
+            parse_tokens=True,
+            spans=spans,
+            limits=limits,
+        )
+    except (LexicalError, ParsingError, LimitError) as error:
+        return type(error), str(error)
+    return None
+
+
+async def async_error(input_string, **kwargs):
+    reader = asyncio.StreamReader()
+    reader.feed_data(input_string.encode())
+    reader.feed_eof()
+    try:
+        await validate_async(reader=reader, **kwargs)
+    except (LexicalError, ParsingError, LimitError) as error:
+        return type(error), str(error)
+    return None
+
+
+class TestValidateAsync(unittest.IsolatedAsyncioTestCase):
+    DOCUMENTS = (
+        test_parser.TestParser.VALID_STRINGS
+        + test_parser.TestParser.INVALID_STRINGS
+    )
+
+    async def test_same_as_parser(self):
+        for document in self.DOCUMENTS:
+            for spans in (False, True):
+                for chunk_size in (1, 2, 5, 64):
+                    with self.subTest(document=document, spans=spans,
+                                      chunk_size=chunk_size):
+                        self.assertEqual(
+                            await async_error(
+                                input_string=document,
+                                spans=spans,
+                                chunk_size=chunk_size,
+                            ),
+                            stream_error(
+                                input_string=document,
+                                spans=spans,
+                                chunk_size=chunk_size,
+                            ),
+                        )
+
+    async def test_limits(self):
+        document = '<a><b><c>word</c></b></a>'
+        for limits in (
+            Limits(max_depth=2),
+            Limits(max_tokens=10),
+            Limits(max_bytes=12),
+            Limits(max_name_length=0),
+        ):
+            for chunk_size in (1, 3, 64):
+                with self.subTest(limits=limits, chunk_size=chunk_size):
+                    error = await async_error(
+                        input_string=document,
+                        limits=limits,
+                        chunk_size=chunk_size,
+                    )
+                    self.assertEqual(error, stream_error(
+                        input_string=document,
+                        limits=limits,
+                        chunk_size=chunk_size,
+                    ))
+                    self.assertEqual(error[0], LimitError)
+
+    async def test_executor(self):
+        document = '<a>' + ' word' * 1000 + '</a>'
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertIsNone(await async_error(
+                input_string=document,
+                chunk_size=100,
+                executor=executor,
+                offload_after=1000,
+            ))
+            self.assertEqual(
+                await async_error(
+                    input_string=document + '<',
+                    chunk_size=100,
+                    executor=executor,
+                ),
+                stream_error(input_string=document + '<', chunk_size=100),
+            )
+
+    async def test_yields_to_loop(self):
+        steps = 0
+
+        async def count_steps():
+            nonlocal steps
+            while True:
+                steps += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(count_steps())
+        await asyncio.sleep(0)
+        error = await async_error(
+            input_string='<a>' + ' word' * 100 + '</a>',
+            chunk_size=10,
+        )
+        task.cancel()
+        self.assertIsNone(error)
+        self.assertGreater(steps, 10)
+
+
+class TestChunkValidator(unittest.TestCase):
+
+    def test_multibyte_characters(self):
+        document = '<a>word é</a>'.encode()
+        for split in range(len(document)):
+            validator = ChunkValidator()
+            with self.assertRaises(LexicalError) as context:
+                validator.feed(chunk=document[:split])
+                validator.feed(chunk=document[split:])
+                validator.close()
+            self.assertEqual(
+                str(context.exception),
+                'Invalid character at position 9: é',
+            )
+
+    def test_valid(self):
+        validator = ChunkValidator()
+        for chunk in ('<?xml ver', 'sion=1.0?><a', '>word</', 'a>'):
+            validator.feed(chunk=chunk)
+        validator.close()
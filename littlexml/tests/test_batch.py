@@ -0,0 +1,109 @@
+import random
+import unittest
+
+from littlexml.batch import (
+    ERROR_CODES, LEXICAL_ERROR, LIMIT_ERROR, NO_OFFSET, OK, PARSING_ERROR,
+    validate_many,
+)
+from littlexml.lexer import LexicalError
+from littlexml.limits import LimitError, Limits
+from littlexml.parser import Parser, ParsingError
+from littlexml.tests import test_parser
+
+
+def parse_result(document, spans=False, limits=None):
+    try:
+        Parser(input_stream=document, spans=spans, limits=limits)
+    except (LexicalError, ParsingError, LimitError) as error:
+        if error.position is None:
+            return ERROR_CODES[type(error)], NO_OFFSET, str(error)
+        return ERROR_CODES[type(error)], error.position, str(error)
+    return OK, NO_OFFSET, None
+
+
+class TestValidateMany(unittest.TestCase):
+    PIECES = [
+        '<', '>', '</', '/>', 'a', 'b', ' ', '\t', '1', '.', '?', '@', '%',
+        '-', '_', ':', '?>', '<a>', '</a>', '<b/>', '<?xml version=1.0?>',
+    ]
+
+    def documents(self, count):
+        rng = random.Random(0)
+        seeds = (
+            test_parser.TestParser.VALID_STRINGS
+            + test_parser.TestParser.INVALID_STRINGS
+        )
+        documents = list(seeds)
+        for _ in range(count):
+            document = rng.choice(seeds)
+            offset = rng.randint(0, len(document))
+            deleted = rng.randint(0, 2)
+            inserted = rng.choice(self.PIECES)
+            documents.append(
+                document[:offset] + inserted + document[offset + deleted:]
+            )
+        return documents
+
+    def test_same_as_parser(self):
+        documents = self.documents(count=2000)
+        for spans in (False, True):
+            for limits in (
+                None,
+                Limits(max_depth=2),
+                Limits(max_name_length=3),
+                Limits(max_tokens=30, max_bytes=40),
+            ):
+                result = validate_many(
+                    documents=documents,
+                    spans=spans,
+                    limits=limits,
+                    messages=True,
+                )
+                for index, document in enumerate(documents):
+                    with self.subTest(document=document, spans=spans,
+                                      limits=limits):
+                        self.assertEqual(
+                            (
+                                result.codes[index],
+                                result.offsets[index],
+                                result.messages[index],
+                            ),
+                            parse_result(
+                                document=document,
+                                spans=spans,
+                                limits=limits,
+                            ),
+                        )
+
+    def test_result(self):
+        result = validate_many(documents=[
+            '<a>word</a>',
+            '<?xml version=1.0?><a><b/></a>',
+            '<a>word</b>',
+            '<a>%</a>',
+            '<a>word',
+            '<a><b><c/></b></a>',
+        ], limits=Limits(max_depth=2))
+        self.assertEqual(list(result.codes), [
+            OK, OK, PARSING_ERROR, LEXICAL_ERROR, PARSING_ERROR, LIMIT_ERROR,
+        ])
+        self.assertEqual(list(result.offsets), [
+            NO_OFFSET, NO_OFFSET, 10, 4, 8, 8,
+        ])
+        self.assertIsNone(result.messages)
+        self.assertEqual(len(result), 6)
+        self.assertEqual(result.failed, 4)
+        self.assertTrue(result.ok(index=0))
+        self.assertEqual(result.error_name(index=3), 'Lexical error')
+        self.assertIsNone(result.error_name(index=1))
+
+    def test_bytes(self):
+        documents = self.documents(count=200)
+        expected = validate_many(documents=documents, messages=True)
+        result = validate_many(
+            documents=[document.encode() for document in documents],
+            messages=True,
+        )
+        self.assertEqual(result.codes, expected.codes)
+        self.assertEqual(result.offsets, expected.offsets)
+        self.assertEqual(result.messages, expected.messages)
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import unittest
+
+from littlexml.cache import ValidationCache
+from littlexml.validation import validate_files
+
+
+class TestValidationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_key(self):
+        cache = ValidationCache()
+        key = cache.key(content='<a/>')
+        self.assertEqual(cache.key(content=b'<a/>'), key)
+        self.assertNotEqual(cache.key(content='<b/>'), key)
+        self.assertNotEqual(cache.key(content='<a/>', options='spans'), key)
+        with open(self.path('a.littlexml'), 'w') as output_file:
+            output_file.write('<a/>')
+        self.assertEqual(cache.file_key(path=self.path('a.littlexml')), key)
+
+    def test_hits_and_misses(self):
+        cache = ValidationCache()
+        self.assertIsNone(cache.get(key='a'))
+        cache.put(key='a')
+        cache.put(key='b', error_name='Parsing error', message='message')
+        self.assertEqual(cache.get(key='a'), (None, None))
+        self.assertEqual(cache.get(key='b'), ('Parsing error', 'message'))
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+
+    def test_evict_entries(self):
+        cache = ValidationCache(max_entries=2)
+        cache.put(key='a')
+        cache.put(key='b')
+        cache.get(key='a')
+        cache.put(key='c')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(key='a'))
+        self.assertIsNone(cache.get(key='b'))
+        self.assertIsNotNone(cache.get(key='c'))
+
+    def test_evict_bytes(self):
+        cache = ValidationCache(max_entries=None, max_bytes=300)
+        for key in 'abcdefgh':
+            cache.put(key=key, error_name='Parsing error', message='x' * 50)
+            self.assertLessEqual(cache.nbytes, 300)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(key='h'))
+
+    def test_save_and_load(self):
+        path = self.path('cache.json')
+        with ValidationCache(path=path) as cache:
+            cache.put(key='a')
+            cache.put(key='b', error_name='Parsing error', message='message')
+        cache = ValidationCache(path=path)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(key='b'), ('Parsing error', 'message'))
+
+        with open(path, 'w') as output_file:
+            json.dump({'version': 0, 'entries': [['c', None, None]]},
+                      output_file)
+        self.assertEqual(len(ValidationCache(path=path)), 0)
+
+    def test_load_invalid(self):
+        path = self.path('cache.json')
+        for content in [
+            'garbage',
+            '[]',
+            '{"version": 1}',
+            '{"version": 1, "entries": [["a", null]]}',
+            '{"version": 1, "entries": [["a", 1, null]]}',
+        ]:
+            with self.subTest(content=content):
+                with open(path, 'w') as output_file:
+                    output_file.write(content)
+                with ValidationCache(path=path) as cache:
+                    self.assertEqual(len(cache), 0)
+                    cache.put(key='a')
+                self.assertEqual(len(ValidationCache(path=path)), 1)
+
+    def test_validate_files(self):
+        contents = {
+            'a.littlexml': '<a>word</a>',
+            'b.littlexml': '<a>word</b>',
+            'c.littlexml': '<a>word</a>',
+        }
+        paths = []
+        for name, content in contents.items():
+            paths.append(self.path(name))
+            with open(self.path(name), 'w') as output_file:
+                output_file.write(content)
+        paths.append(self.path('missing.littlexml'))
+        expected = [
+            str(result)
+            for result in validate_files(paths=paths, jobs=1)
+        ]
+
+        cache = ValidationCache()
+        for ordered in (True, False):
+            with self.subTest(ordered=ordered):
+                results = [
+                    str(result)
+                    for result in validate_files(
+                        paths=paths,
+                        jobs=1,
+                        ordered=ordered,
+                        cache=cache,
+                    )
+                ]
+                if ordered:
+                    self.assertEqual(results, expected)
+                else:
+                    self.assertCountEqual(results, expected)
+        # Files with the same content are validated and looked up once,
+        # and input errors are not cached
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 3)
+
+        results = list(validate_files(paths=paths, jobs=1, spans=True,
+                                      cache=cache))
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual([str(result) for result in results], expected)
+
+    def test_unordered_results_are_streamed(self):
+        with open(self.path('a.littlexml'), 'w') as output_file:
+            output_file.write('<a>word</a>')
+        consumed = []
+
+        def paths():
+            for _ in range(3):
+                consumed.append(self.path('a.littlexml'))
+                yield consumed[-1]
+
+        results = validate_files(
+            paths=paths(),
+            jobs=1,
+            ordered=False,
+            cache=ValidationCache(),
+        )
+        next(results)
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(len(list(results)), 2)
@@ -0,0 +1,122 @@
+import io
+import unittest
+
+from littlexml.diagnostics import Diagnostics
+from littlexml.lexer import LexicalError, Lexer, StreamLexer
+from littlexml.parser import Parser, ParsingError
+from littlexml.tests import test_parser
+
+
+def recover(input_stream, spans=False, max_errors=None):
+    diagnostics = Diagnostics(max_errors=max_errors)
+    Parser(input_stream=input_stream, spans=spans, diagnostics=diagnostics)
+    return diagnostics
+
+
+class TestDiagnostics(unittest.TestCase):
+
+    def test_valid(self):
+        for test_string in test_parser.TestParser.VALID_STRINGS:
+            for spans in (False, True):
+                with self.subTest(test_string=test_string, spans=spans):
+                    diagnostics = recover(
+                        input_stream=test_string,
+                        spans=spans,
+                    )
+                    self.assertTrue(diagnostics.ok)
+
+    def test_first_error(self):
+        for test_string in test_parser.TestParser.INVALID_STRINGS:
+            for spans in (False, True):
+                with self.subTest(test_string=test_string, spans=spans):
+                    lexer = Lexer(
+                        input_string=test_string,
+                        spans=spans,
+                        lazy=True,
+                    )
+                    with self.assertRaises(
+                            (LexicalError, ParsingError)) as context:
+                        Parser(
+                            input_stream=lexer,
+                            parse_tokens=True,
+                            spans=spans,
+                        )
+                    diagnostics = recover(
+                        input_stream=test_string,
+                        spans=spans,
+                    )
+                    self.assertEqual(
+                        str(diagnostics.errors[0].error),
+                        str(context.exception),
+                    )
+
+    def test_all_errors(self):
+        for spans in (False, True):
+            diagnostics = recover(
+                input_stream='<a><b>x%y</c></a>junk',
+                spans=spans,
+            )
+            self.assertEqual([str(diagnostic) for diagnostic in diagnostics], [
+                'Lexical error -- Invalid character at position 8: %',
+                'Parsing error -- Mismatched closing tag at position 12: '
+                'expected b, found c',
+                'Parsing error -- Invalid token at position 18: '
+                + ('alpha_span' if spans else 'letter'),
+            ])
+            self.assertEqual(
+                [diagnostic.position for diagnostic in diagnostics],
+                [8, 12, 18],
+            )
+            self.assertFalse(diagnostics.stopped)
+
+    def test_end_of_input(self):
+        diagnostics = recover(input_stream='<a><b>x</b')
+        self.assertEqual([str(diagnostic) for diagnostic in diagnostics], [
+            'Parsing error -- Invalid token at position 11: end_of_string',
+        ])
+        diagnostics = recover(input_stream='<a><b>x</b></a><')
+        self.assertEqual([str(diagnostic) for diagnostic in diagnostics], [
+            'Parsing error -- Invalid token at position 16: less_than',
+        ])
+
+    def test_max_errors(self):
+        # Invalid characters are skipped up to the next token
+        test_string = '<a>x' + '%' * 10 + '</a>'
+        self.assertEqual(len(recover(input_stream=test_string)), 1)
+        test_string = '<a>' + ' %x' * 10 + '</a>'
+        diagnostics = recover(input_stream=test_string, max_errors=3)
+        self.assertEqual(len(diagnostics), 3)
+        self.assertTrue(diagnostics.stopped)
+        test_string = '<a>' + ' %x' * 3 + '</a>'
+        diagnostics = recover(input_stream=test_string, max_errors=3)
+        self.assertEqual(len(diagnostics), 3)
+        self.assertFalse(diagnostics.stopped)
+
+    def test_stream_lexer(self):
+        test_string = '<a><b>x%y</c></a>junk'
+        expected = [
+            str(diagnostic) for diagnostic in recover(input_stream=test_string)
+        ]
+        diagnostics = Diagnostics()
+        lexer = StreamLexer(
+            input_file=io.StringIO(test_string),
+            chunk_size=2,
+            diagnostics=diagnostics,
+        )
+        Parser(
+            input_stream=lexer,
+            parse_tokens=True,
+            diagnostics=diagnostics,
+        )
+        self.assertEqual(
+            [str(diagnostic) for diagnostic in diagnostics],
+            expected,
+        )
+
+    def test_stats(self):
+        with self.assertRaises(ValueError):
+            Parser(
+                input_stream='<a>x</a>',
+                verbose=True,
+                diagnostics=Diagnostics(),
+            )
@@ -0,0 +1,92 @@
+import unittest
+
+from littlexml.grammar import (
+    GRAMMAR_PATH, TABLES_PATH, GrammarError, compile_rules, generate_module,
+    parse_grammar,
+)
+from littlexml.token import TokenType
+
+
+class TestGrammar(unittest.TestCase):
+
+    def test_tables_up_to_date(self):
+        with open(GRAMMAR_PATH) as grammar_file:
+            source = generate_module(text=grammar_file.read())
+        with open(TABLES_PATH) as tables_file:
+            self.assertEqual(source, tables_file.read())
+
+    def test_compile_rules(self):
+        grammars = parse_grammar(text='''
+            %chars LETTER 'a'-'c'
+            list ::= LETTER rest
+            rest ::= SPACE list
+                   | %empty
+            unused ::= DIGIT
+            %grammar spans
+            list ::= ALPHA_SPAN rest
+        ''')
+        self.assertEqual(
+            compile_rules(grammar=grammars['default']),
+            {
+                ('list', TokenType.LETTER): [TokenType.LETTER, 'rest'],
+                ('rest', TokenType.SPACE): [TokenType.SPACE, 'list'],
+                ('rest', TokenType.END_OF_STRING): [],
+            },
+        )
+        rule_dict = compile_rules(grammar=grammars['spans'])
+        self.assertEqual(
+            rule_dict['list', TokenType.ALPHA_SPAN],
+            [TokenType.ALPHA_SPAN, 'rest'],
+        )
+        self.assertEqual(
+            grammars['default'].chars,
+            dict.fromkeys('abc', TokenType.LETTER),
+        )
+
+    def test_comments(self):
+        grammar = parse_grammar(text="""
+            # Comment
+            %chars SIGN '#' '@'-'@'  # Signs
+            list ::= SIGN  # Only a sign
+        """)['default']
+        self.assertEqual(
+            grammar.chars,
+            {'#': TokenType.SIGN, '@': TokenType.SIGN},
+        )
+        self.assertEqual(grammar.rules, {'list': [[TokenType.SIGN]]})
+
+    def test_conflicts(self):
+        for text, message in (
+            (
+                'a ::= LESS_THAN GT_SLASH | LESS_THAN',
+                'LL(1) conflict in rule a on LESS_THAN: '
+                'LESS_THAN GT_SLASH or LESS_THAN',
+            ),
+            (
+                'a ::= b LESS_THAN\nb ::= LESS_THAN | %empty',
+                'LL(1) conflict in rule b on LESS_THAN: LESS_THAN or %empty',
+            ),
+        ):
+            with self.subTest(text=text):
+                grammar = parse_grammar(text=text)['default']
+                with self.assertRaises(GrammarError) as context:
+                    compile_rules(grammar=grammar)
+                self.assertEqual(str(context.exception), message)
+
+    def test_errors(self):
+        for text, message in (
+            ('a ::= UNKNOWN', 'Unknown token type at line 1: UNKNOWN'),
+            ('a ::= LETTER\na ::= DIGIT', 'Duplicate rule at line 2: a'),
+            ('| LETTER', 'Alternative without a rule at line 1'),
+            ('a ::= LETTER %empty', 'Invalid alternative at line 1'),
+            ("%chars DIGIT '0'-'9' '5'", "Duplicate character at line 1: '5'"),
+            ('', 'No rules defined'),
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(GrammarError) as context:
+                    parse_grammar(text=text)
+                self.assertEqual(str(context.exception), message)
+        grammar = parse_grammar(text='a ::= LETTER b')['default']
+        with self.assertRaises(GrammarError) as context:
+            compile_rules(grammar=grammar)
+        self.assertEqual(str(context.exception), 'Undefined rule in rule a: b')
@@ -0,0 +1,138 @@
+import random
+import timeit
+import unittest
+
+from littlexml.incremental import IncrementalParser
+from littlexml.lexer import Lexer, LexicalError
+from littlexml.parser import Parser, ParsingError
+from littlexml.tests import test_parser
+
+
+def parse_error(input_string, spans=False):
+    try:
+        Parser(input_stream=input_string, spans=spans)
+    except (LexicalError, ParsingError) as error:
+        return type(error), str(error)
+    return None
+
+
+def incremental_error(parser):
+    if parser.error is None:
+        return None
+    return type(parser.error), str(parser.error)
+
+
+class TestIncrementalParser(unittest.TestCase):
+
+    PIECES = [
+        '<', '>', '</', '/>', 'a', 'b', ' ', '1', '.', '?', '%',
+        '<a>', '</a>', '<b/>', '<?xml version=1.0?>',
+    ]
+
+    def test_same_as_parser(self):
+        rng = random.Random(0)
+        documents = (
+            test_parser.TestParser.VALID_STRINGS
+            + test_parser.TestParser.INVALID_STRINGS
+        )
+        for seed, document in enumerate(documents):
+            spans = seed % 3 == 0
+            parser = IncrementalParser(
+                input_string=document,
+                spans=spans,
+                checkpoint_interval=rng.choice([1, 4, 32]),
+            )
+            for step in range(20):
+                with self.subTest(seed=seed, step=step):
+                    text = parser.text
+                    offset = rng.randint(0, len(text))
+                    deleted = rng.randint(0, min(3, len(text) - offset))
+                    inserted = ''.join(
+                        rng.choice(self.PIECES)
+                        for _ in range(rng.randint(0, 2))
+                    )
+                    parser.edit(
+                        offset=offset,
+                        deleted=deleted,
+                        inserted=inserted,
+                    )
+                    text = text[:offset] + inserted + text[offset + deleted:]
+                    self.assertEqual(parser.text, text)
+                    self.assertEqual(
+                        incremental_error(parser=parser),
+                        parse_error(input_string=text, spans=spans),
+                    )
+                    if not isinstance(parser.error, LexicalError):
+                        self.assertEqual(
+                            [token.to_dict() for token in parser.tokens],
+                            Lexer(input_string=text, spans=spans).as_dict(),
+                        )
+
+    def test_small_edit(self):
+        document = '<root><a>' + ' '.join(['word'] * 10000) + '</a></root>'
+        parser = IncrementalParser(input_string=document)
+        self.assertTrue(parser.ok)
+        offset = document.index('word', len(document) // 2)
+        parser.edit(offset=offset, deleted=4, inserted='other')
+        self.assertTrue(parser.ok)
+        self.assertLessEqual(parser._parsed_chunks, 2)
+        parser.edit(offset=len(parser.text) - 5, deleted=1, inserted='b')
+        self.assertEqual(
+            str(parser.error),
+            f'Mismatched closing tag at position {len(parser.text) - 4}: '
+            f'expected root, found boot',
+        )
+        self.assertEqual(parser.error.position, len(parser.text) - 4)
+        self.assertLessEqual(parser._parsed_chunks, 2)
+
+    def test_edit_scaling(self):
+        times = []
+        for words in (4000, 64000):
+            document = '<root><a>' + ' '.join(['word'] * words) + '</a></root>'
+            parser = IncrementalParser(input_string=document)
+            offset = document.index('word', len(document) // 2)
+            times.append(min(timeit.repeat(
+                lambda: parser.edit(offset=offset, deleted=4, inserted='word'),
+                number=20,
+                repeat=5,
+            )))
+            self.assertTrue(parser.ok)
+            self.assertLessEqual(parser._parsed_chunks, 2)
+        # The document is 16 times longer, the edit should not be
+        self.assertLess(times[1], 4 * times[0])
+
+    def test_checkpoint_memory(self):
+        depth = 2000
+        document = '<a>' * depth + 'x' + '</a>' * depth
+        parser = IncrementalParser(
+            input_string=document,
+            checkpoint_interval=16,
+        )
+        self.assertTrue(parser.ok)
+        nodes = set()
+        checkpoints = [
+            chunk.checkpoint
+            for chunk in parser._chunks
+            if chunk.checkpoint is not None
+        ]
+        self.assertGreater(len(checkpoints), depth / 16)
+        for checkpoint in checkpoints:
+            for node in (checkpoint.stack, checkpoint.names):
+                while node is not None and id(node) not in nodes:
+                    nodes.add(id(node))
+                    node = node[1]
+        # Full copies would take a node per open element in each checkpoint
+        self.assertLess(len(nodes), 5 * (depth + len(parser._chunks)))
+        parser.edit(offset=len(document) - 2, deleted=1, inserted='b')
+        self.assertEqual(
+            str(parser.error),
+            f'Mismatched closing tag at position {len(document) - 1}: '
+            f'expected a, found b',
+        )
+
+    def test_out_of_range(self):
+        parser = IncrementalParser(input_string='<a/>')
+        for offset, deleted in [(-1, 0), (5, 0), (3, 2)]:
+            with self.subTest(offset=offset, deleted=deleted):
+                with self.assertRaises(ValueError):
+                    parser.edit(offset=offset, deleted=deleted)
@@ -0,0 +1,200 @@
+import io
+import random
+import tempfile
+import unittest
+
+from littlexml.lexer import (
+    Lexer, LexicalError, SCANNERS, StreamLexer, map_file,
+)
+from littlexml.tests import test_parser
+from littlexml.token import TokenType
+
+
+class TestStreamLexer(unittest.TestCase):
+    TEST_STRINGS = (
+        test_parser.TestParser.VALID_STRINGS
+        + test_parser.TestParser.INVALID_STRINGS
+    )
+    CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+    def test_same_tokens(self):
+        for test_string in self.TEST_STRINGS:
+            try:
+                expected = Lexer(input_string=test_string).as_dict()
+            except LexicalError:
+                continue
+            for chunk_size in self.CHUNK_SIZES:
+                with self.subTest(string=test_string, chunk_size=chunk_size):
+                    lexer = StreamLexer(
+                        input_file=io.StringIO(test_string),
+                        chunk_size=chunk_size,
+                    )
+                    tokens = [token.to_dict() for token in lexer]
+                    self.assertEqual(tokens, expected)
+
+    def test_same_errors(self):
+        for test_string in self.TEST_STRINGS:
+            try:
+                Lexer(input_string=test_string)
+            except LexicalError as error:
+                expected = str(error)
+            else:
+                continue
+            for chunk_size in self.CHUNK_SIZES:
+                with self.subTest(string=test_string, chunk_size=chunk_size):
+                    lexer = StreamLexer(
+                        input_file=io.StringIO(test_string),
+                        chunk_size=chunk_size,
+                    )
+                    with self.assertRaises(LexicalError) as context:
+                        list(lexer)
+                    self.assertEqual(str(context.exception), expected)
+
+    def test_binary_file(self):
+        test_strings = self.TEST_STRINGS + ['<a>é</a>', '<a>x€y</a>']
+        for test_string in test_strings:
+            expected = TestBinaryInput.tokenize(test_string)
+            for chunk_size in self.CHUNK_SIZES:
+                with self.subTest(string=test_string, chunk_size=chunk_size):
+                    lexer = StreamLexer(
+                        input_file=io.BytesIO(test_string.encode()),
+                        chunk_size=chunk_size,
+                    )
+                    try:
+                        result = [token.to_dict() for token in lexer]
+                    except LexicalError as error:
+                        result = str(error)
+                    self.assertEqual(result, expected)
+
+    def test_lazy(self):
+        input_file = io.StringIO('<a>' + 'x' * 1000 + '</a>')
+        lexer = StreamLexer(input_file=input_file, chunk_size=10)
+        next(iter(lexer))
+        self.assertEqual(input_file.tell(), 10)
+
+
+class TestSpans(unittest.TestCase):
+
+    def test_span_tokens(self):
+        lexer = Lexer(input_string='<a1>word 12 3x@y</a1>', spans=True)
+        tokens = [
+            (token.token_type, token.value, token.start, token.end)
+            for token in lexer
+            if token.end is not None
+        ]
+        self.assertEqual(tokens, [
+            (TokenType.ALPHA_SPAN, 'a1', 2, 3),
+            (TokenType.ALPHA_SPAN, 'word', 5, 8),
+            (TokenType.DIGIT_SPAN, '12', 10, 11),
+            (TokenType.ALNUM_SPAN, '3x', 13, 14),
+            (TokenType.ALPHA_SPAN, 'y', 16, 16),
+            (TokenType.ALPHA_SPAN, 'a1', 19, 20),
+        ])
+
+    def test_fine_grained_default(self):
+        lexer = Lexer(input_string='<ab/>')
+        token_types = [token['type'] for token in lexer.as_dict()]
+        self.assertEqual(token_types, [
+            'less_than', 'letter', 'letter', 'gt_slash', 'end_of_string',
+        ])
+
+    def test_question_mark(self):
+        for scanner in SCANNERS:
+            with self.subTest(scanner=scanner):
+                lexer = Lexer(input_string='a?? ?>', scanner=scanner)
+                token_types = [token['type'] for token in lexer.as_dict()]
+                self.assertEqual(token_types, [
+                    'letter', 'sign', 'sign', 'space', 'gt_xml',
+                    'end_of_string',
+                ])
+
+
+class TestRegexScanner(unittest.TestCase):
+    FUZZ_ALPHABET = '<>/?=. \n\t_:-@aXlmvz019ésion'
+    FUZZ_FRAGMENTS = [
+        '<?xml version=1.0?>', '<?xml', 'version=', '<a>', '</a>', '<a/>',
+        '/>', '?>', 'word 12 x3', '  ',
+    ]
+
+    def assert_same_result(self, test_string, spans):
+        try:
+            expected = Lexer(input_string=test_string, spans=spans).as_dict()
+        except LexicalError as error:
+            expected = str(error)
+        try:
+            result = Lexer(
+                input_string=test_string,
+                spans=spans,
+                scanner='regex',
+            ).as_dict()
+        except LexicalError as error:
+            result = str(error)
+        self.assertEqual(result, expected)
+
+    def test_same_as_default(self):
+        test_strings = (
+            test_parser.TestParser.VALID_STRINGS
+            + test_parser.TestParser.INVALID_STRINGS
+        )
+        for test_string in test_strings:
+            for spans in (False, True):
+                with self.subTest(string=test_string, spans=spans):
+                    self.assert_same_result(test_string, spans=spans)
+
+    def test_fuzz(self):
+        generator = random.Random(0)
+        for _ in range(2000):
+            test_string = ''.join(
+                generator.choice(self.FUZZ_FRAGMENTS)
+                if generator.random() < 0.3
+                else generator.choice(self.FUZZ_ALPHABET)
+                for _ in range(generator.randint(0, 20))
+            )
+            for spans in (False, True):
+                with self.subTest(string=test_string, spans=spans):
+                    self.assert_same_result(test_string, spans=spans)
+
+    def test_unknown_scanner(self):
+        with self.assertRaises(ValueError):
+            Lexer(input_string='<a/>', scanner='unknown')
+
+
+class TestBinaryInput(unittest.TestCase):
+    TEST_STRINGS = (
+        test_parser.TestParser.VALID_STRINGS
+        + test_parser.TestParser.INVALID_STRINGS
+        + ['<a>é</a>', '<a>x</a>\n\t', '<?xml vers']
+    )
+
+    @staticmethod
+    def tokenize(input_string, **kwargs):
+        try:
+            return Lexer(input_string=input_string, **kwargs).as_dict()
+        except LexicalError as error:
+            return str(error)
+
+    def test_same_as_string(self):
+        for test_string in self.TEST_STRINGS:
+            expected = self.tokenize(test_string)
+            for scanner in SCANNERS:
+                with self.subTest(string=test_string, scanner=scanner):
+                    result = self.tokenize(
+                        test_string.encode(),
+                        scanner=scanner,
+                    )
+                    self.assertEqual(result, expected)
+
+    def test_map_file(self):
+        test_string = '<?xml version=1.0?>\n<a>word 12</a>\n'
+        with tempfile.TemporaryFile(mode='w+') as input_file:
+            input_file.write(test_string)
+            input_file.flush()
+            with map_file(input_file=input_file) as mapped:
+                lexer = Lexer(input_string=mapped, scanner='regex', lazy=True)
+                tokens = [token.to_dict() for token in lexer]
+        self.assertEqual(tokens, Lexer(input_string=test_string).as_dict())
+
+    def test_map_empty_file(self):
+        with tempfile.TemporaryFile(mode='w+') as input_file:
+            with map_file(input_file=input_file) as mapped:
+                self.assertEqual(len(mapped), 0)
@@ -0,0 +1,101 @@
+import io
+import unittest
+
+from littlexml.lexer import Lexer, StreamLexer
+from littlexml.limits import LimitError, Limits
+from littlexml.parser import Parser
+
+
+class TestLimits(unittest.TestCase):
+
+    def test_depth(self):
+        limits = Limits(max_depth=3)
+        Parser(input_stream='<a><b><c>x</c></b></a>', limits=limits)
+        Parser(input_stream='<a><b><c/></b></a>', limits=limits)
+        with self.assertRaises(LimitError) as context:
+            Parser(input_stream='<a><b><c><d/></c></b></a>', limits=limits)
+        self.assertEqual(
+            str(context.exception),
+            'Nesting depth limit of 3 exceeded at position 11',
+        )
+
+    def test_depth_without_matching_tags(self):
+        test_string = '<a>' * 100 + 'x' + '</b>' * 100
+        Parser(input_stream=test_string, match_tags=False)
+        with self.assertRaises(LimitError):
+            Parser(
+                input_stream=test_string,
+                match_tags=False,
+                limits=Limits(max_depth=10),
+            )
+
+    def test_tokens(self):
+        test_string = '<a>word</a>'
+        Parser(input_stream=test_string, limits=Limits(max_tokens=11))
+        with self.assertRaises(LimitError):
+            Parser(input_stream=test_string, limits=Limits(max_tokens=10))
+        lexer = Lexer(input_string=test_string, lazy=True,
+                      limits=Limits(max_tokens=5))
+        with self.assertRaises(LimitError):
+            list(lexer)
+
+    def test_token_stream(self):
+        tokens = Lexer(input_string='<a>word</a>').tokens
+        with self.assertRaises(LimitError):
+            Parser(
+                input_stream=iter(tokens),
+                parse_tokens=True,
+                limits=Limits(max_tokens=4),
+            )
+
+    def test_bytes(self):
+        test_string = '<a>' + 'x' * 100 + '</a>'
+        Parser(input_stream=test_string, limits=Limits(max_bytes=107))
+        with self.assertRaises(LimitError):
+            Parser(input_stream=test_string, limits=Limits(max_bytes=106))
+        with self.assertRaises(LimitError):
+            Lexer(input_string=test_string.encode(),
+                  limits=Limits(max_bytes=100))
+
+    def test_bytes_stream(self):
+        read = []
+
+        class Input(io.StringIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                read.append(chunk)
+                return chunk
+
+        test_string = '<a>' + 'x' * 10000 + '</a>'
+        lexer = StreamLexer(
+            input_file=Input(test_string),
+            chunk_size=100,
+            limits=Limits(max_bytes=1000),
+        )
+        with self.assertRaises(LimitError):
+            Parser(input_stream=lexer, parse_tokens=True)
+        self.assertLessEqual(len(read), 11)
+
+    def test_name_length(self):
+        limits = Limits(max_name_length=5)
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                Parser(input_stream='<abcde/>', spans=spans, limits=limits)
+                with self.assertRaises(LimitError) as context:
+                    Parser(input_stream='<abc1ef>x</abc1ef>', spans=spans,
+                           limits=limits)
+                self.assertEqual(
+                    str(context.exception),
+                    'Name length limit of 5 exceeded at position 2',
+                )
+
+    def test_same_errors_verbose(self):
+        limits = Limits(max_depth=2, max_name_length=3)
+        for test_string in ['<a><b><c/></b></a>', '<a><abcd/></a>']:
+            with self.subTest(string=test_string):
+                with self.assertRaises(LimitError) as fast:
+                    Parser(input_stream=test_string, limits=limits)
+                with self.assertRaises(LimitError) as slow:
+                    Parser(input_stream=test_string, limits=limits,
+                           trace=lambda **kwargs: None)
+                self.assertEqual(str(fast.exception), str(slow.exception))
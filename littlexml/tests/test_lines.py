@@ -0,0 +1,135 @@
+import io
+import unittest
+
+from littlexml.lexer import (
+    DEFAULT_CHUNK_SIZE, Lexer, LexicalError, StreamLexer,
+)
+from littlexml.lines import LineIndex
+from littlexml.parser import Parser, ParsingError
+
+
+def expected_location(test_string, position):
+    before = test_string[:position - 1]
+    line = before.count('\n') + 1
+    return line, position - (before.rfind('\n') + 1)
+
+
+class TestLineIndex(unittest.TestCase):
+    TEST_STRING = '<a>\n  <b>x\r\n\n y</b>\n</a>\n'
+
+    def test_location(self):
+        for chunk_size in (1, 2, 5, 100):
+            line_index = LineIndex()
+            for start in range(0, len(self.TEST_STRING), chunk_size):
+                line_index.feed(
+                    chunk=self.TEST_STRING[start:start + chunk_size],
+                )
+            self.assertEqual(len(line_index), 6)
+            for position in range(1, len(self.TEST_STRING) + 2):
+                with self.subTest(chunk_size=chunk_size, position=position):
+                    self.assertEqual(
+                        line_index.location(position=position),
+                        expected_location(
+                            test_string=self.TEST_STRING,
+                            position=position,
+                        ),
+                    )
+            with self.assertRaises(ValueError):
+                line_index.location(position=len(self.TEST_STRING) + 2)
+
+    def test_excerpt(self):
+        line_index = LineIndex()
+        line_index.feed(chunk=memoryview(self.TEST_STRING.encode()))
+        self.assertEqual(line_index.line_span(line=2), (4, 11))
+        self.assertEqual(
+            line_index.excerpt(source=self.TEST_STRING, position=8),
+            [(2, '  <b>x')],
+        )
+        self.assertEqual(
+            line_index.excerpt(
+                source=self.TEST_STRING.encode(),
+                position=8,
+                context=1,
+            ),
+            [(1, '<a>'), (2, '  <b>x'), (3, '')],
+        )
+
+
+class TestLexerLines(unittest.TestCase):
+    TEST_STRING = '<a>\n  <b>x\n  y</b>\n</a>'
+
+    def test_tokens(self):
+        lexers = [
+            Lexer(input_string=self.TEST_STRING, lines=True),
+            Lexer(input_string=self.TEST_STRING.encode(), scanner='regex',
+                  lazy=True, lines=True),
+            StreamLexer(input_file=io.StringIO(self.TEST_STRING),
+                        chunk_size=3, lines=True),
+        ]
+        for lexer in lexers:
+            for token in lexer:
+                with self.subTest(lexer=lexer, token=token):
+                    self.assertEqual(
+                        lexer.location(position=token.start),
+                        expected_location(
+                            test_string=self.TEST_STRING,
+                            position=token.start,
+                        ),
+                    )
+
+    def test_errors(self):
+        test_string = '<a>\n<b>x\n</b>\n%</a>'
+        lexer = Lexer(input_string=test_string, lazy=True, lines=True)
+        with self.assertRaises(LexicalError) as context:
+            list(lexer)
+        self.assertEqual(context.exception.position, 15)
+        self.assertEqual(lexer.location(position=15), (4, 1))
+        self.assertEqual(
+            lexer.excerpt(position=15, context=1),
+            [(3, '</b>'), (4, '%</a>')],
+        )
+
+        test_string = '<a>\n<b>x</c>\n</a>'
+        lexer = StreamLexer(input_file=io.StringIO(test_string),
+                            chunk_size=4, lines=True)
+        with self.assertRaises(ParsingError) as context:
+            Parser(input_stream=lexer, parse_tokens=True)
+        self.assertEqual(
+            lexer.location(position=context.exception.position),
+            (2, 7),
+        )
+        with self.assertRaises(ValueError):
+            lexer.excerpt(position=context.exception.position)
+        self.assertEqual(
+            lexer.excerpt(
+                position=context.exception.position,
+                context=1,
+                source=test_string,
+            ),
+            [(1, '<a>'), (2, '<b>x</c>'), (3, '</a>')],
+        )
+
+    def test_long_line(self):
+        line = '<a>' + 'x' * (DEFAULT_CHUNK_SIZE + 5000)
+        test_string = line + '\n</a>\n'
+        position = DEFAULT_CHUNK_SIZE - 10
+        lexer = Lexer(input_string=test_string, lines=True)
+        self.assertEqual(lexer.excerpt(position=position), [(1, line)])
+
+        lexer = StreamLexer(input_file=io.StringIO(test_string), lines=True)
+        for token in lexer:
+            if token.start == position:
+                break
+        self.assertEqual(
+            lexer.excerpt(position=position, source=test_string),
+            [(1, line)],
+        )
+        self.assertEqual(
+            [token.start for token in lexer][-3:],
+            [len(line) + 4, len(line) + 6, len(test_string) + 1],
+        )
+
+    def test_not_indexed(self):
+        lexer = Lexer(input_string=self.TEST_STRING)
+        with self.assertRaises(ValueError):
+            lexer.location(position=1)
@@ -0,0 +1,135 @@
+import concurrent.futures
+import os
+import random
+import tempfile
+import unittest
+
+from littlexml.limits import Limits
+from littlexml.parallel import validate_parallel
+from littlexml.tests import test_parser
+from littlexml.validation import validate_file
+
+
+def nested_document(names, text='word', separator='\n'):
+    return (
+        ''.join(f'<{name}>{separator}' for name in names)
+        + text
+        + ''.join(f'</{name}>{separator}' for name in reversed(names))
+    )
+
+
+class TestValidateParallel(unittest.TestCase):
+    PIECES = ['<', '>', '</', '/>', 'a', ' ', '%', '?>', '<a>', '</a>']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.count = 0
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(executor.shutdown)
+        self.executor = executor
+
+    def write(self, document):
+        self.count += 1
+        path = os.path.join(self.directory, f'{self.count}.littlexml')
+        with open(path, 'w') as output_file:
+            output_file.write(document)
+        return path
+
+    def documents(self, count):
+        rng = random.Random(0)
+        documents = (
+            test_parser.TestParser.VALID_STRINGS
+            + test_parser.TestParser.INVALID_STRINGS
+        )
+        for _ in range(count):
+            names = [
+                rng.choice(['a', 'b', 'name', 'x_1'])
+                for _ in range(rng.randint(1, 30))
+            ]
+            document = rng.choice(['', '<?xml version=1.0?>\n']) + (
+                nested_document(names=names, separator=rng.choice(['', '\n']))
+            )
+            for _ in range(rng.choice([0, 1, 2])):
+                offset = rng.randint(0, len(document))
+                document = (
+                    document[:offset]
+                    + rng.choice(self.PIECES)
+                    + document[offset + rng.randint(0, 2):]
+                )
+            documents.append(document)
+        return documents
+
+    def test_same_as_sequential(self):
+        rng = random.Random(0)
+        for document in self.documents(count=300):
+            path = self.write(document=document)
+            for spans in (False, True):
+                for limits in (
+                    None,
+                    Limits(max_depth=10),
+                    Limits(max_tokens=100),
+                    Limits(max_name_length=1),
+                ):
+                    chunk_size = rng.randint(1, 20)
+                    with self.subTest(document=document, spans=spans,
+                                      limits=limits, chunk_size=chunk_size):
+                        self.assertEqual(
+                            str(validate_parallel(
+                                path=path,
+                                chunk_size=chunk_size,
+                                spans=spans,
+                                limits=limits,
+                                executor=self.executor,
+                            )),
+                            str(validate_file(
+                                path=path,
+                                spans=spans,
+                                memory_map=True,
+                                limits=limits,
+                            )),
+                        )
+
+    def test_errors(self):
+        names = [f'e{index % 7}' for index in range(500)]
+        document = nested_document(names=names)
+        path = self.write(document=document)
+        self.assertTrue(validate_parallel(
+            path=path,
+            chunk_size=100,
+            executor=self.executor,
+        ).ok)
+        mismatched = document.replace('</e3>', '</e4>', 1)
+        position = document.index('</e3>') + 3
+        result = validate_parallel(
+            path=self.write(document=mismatched),
+            chunk_size=100,
+            executor=self.executor,
+        )
+        self.assertEqual(
+            result.message,
+            f'Mismatched closing tag at position {position}: '
+            f'expected e3, found e4',
+        )
+        result = validate_parallel(
+            path=path,
+            chunk_size=100,
+            limits=Limits(max_depth=300),
+            executor=self.executor,
+        )
+        self.assertEqual(result.error_name, 'Limit error')
+        result = validate_parallel(
+            path=os.path.join(self.directory, 'missing.littlexml'),
+            executor=self.executor,
+        )
+        self.assertEqual(result.error_name, 'Input error')
+
+    def test_processes(self):
+        names = [f'e{index % 7}' for index in range(2000)]
+        path = self.write(document=nested_document(names=names))
+        self.assertTrue(validate_parallel(
+            path=path,
+            jobs=2,
+            chunk_size=1000,
+        ).ok)
@@ -1,6 +1,8 @@
+import contextlib
+import io
 import unittest
 
-from littlexml.lexer import LexicalError
+from littlexml.lexer import Lexer, LexicalError
 from littlexml.parser import Parser, ParsingError
 
 
@@ -94,6 +96,12 @@ class TestParser(unittest.TestCase):
         '<nested1><nested2>a<nested3/></nested2></nested1>',
         '<nested1><nested2><nested3/>a</nested2></nested1>',
         '<nested1><nested2><nested3></nested2></nested3></nested1>',
+        '<a>x</b>',
+        '<a></ab>',
+        '<ab></a>',
+        '<a><b></a></b>',
+        '<nested1><nested2/></nested2></nested1>',
+        '<?xml version=1.0?><root><a>word</a><b>word</a></root>',
     ]
 
     def test_valid(self):
@@ -109,3 +117,59 @@ class TestParser(unittest.TestCase):
             with self.subTest(string=test_string):
                 with self.assertRaises((LexicalError, ParsingError)):
                     Parser(input_stream=test_string)
+
+    def test_deeply_nested(self):
+        depth = 10000
+        test_string = '<a>' * depth + 'x' + '</a>' * depth
+        Parser(input_stream=test_string)
+        with self.assertRaises(ParsingError):
+            Parser(input_stream=test_string[:-1])
+
+    def test_token_iterator(self):
+        for test_string in self.VALID_STRINGS:
+            with self.subTest(string=test_string):
+                tokens = iter(Lexer(input_string=test_string).tokens)
+                Parser(input_stream=tokens, parse_tokens=True)
+
+    def test_fail_fast(self):
+        consumed = []
+
+        def generate_tokens():
+            for token in Lexer(input_string='<a>x</b>' + 'y' * 100):
+                consumed.append(token)
+                yield token
+
+        with self.assertRaises(ParsingError):
+            Parser(input_stream=generate_tokens(), parse_tokens=True)
+        self.assertLess(len(consumed), 10)
+
+    def test_mismatched_tags(self):
+        with self.assertRaises(ParsingError) as context:
+            Parser(input_stream='<root><a>x</b></root>')
+        self.assertEqual(
+            str(context.exception),
+            'Mismatched closing tag at position 13: expected a, found b',
+        )
+        Parser(input_stream='<root><a>x</b></root>', match_tags=False)
+
+    def test_spans(self):
+        for test_string in self.VALID_STRINGS:
+            with self.subTest(string=test_string):
+                try:
+                    Parser(input_stream=test_string, spans=True)
+                except (LexicalError, ParsingError):
+                    self.fail()
+        for test_string in self.INVALID_STRINGS:
+            with self.subTest(string=test_string):
+                with self.assertRaises((LexicalError, ParsingError)):
+                    Parser(input_stream=test_string, spans=True)
+
+    def test_same_errors_verbose(self):
+        for test_string in self.INVALID_STRINGS:
+            with self.subTest(string=test_string):
+                with self.assertRaises((LexicalError, ParsingError)) as fast:
+                    Parser(input_stream=test_string)
+                with contextlib.redirect_stderr(io.StringIO()):
+                    with self.assertRaises(type(fast.exception)) as slow:
+                        Parser(input_stream=test_string, verbose=True)
+                self.assertEqual(str(fast.exception), str(slow.exception))
@@ -0,0 +1,150 @@
+import io
+import json
+import unittest
+
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser
+from littlexml.serialization import (
+    BINARY_HEADER, BinaryTokenReader, BinaryTokenWriter, FORMATS, FormatError,
+    JsonTokenWriter, read_tokens, write_tokens,
+)
+from littlexml.token import Token, TokenType
+
+
+class TestSerialization(unittest.TestCase):
+    TEST_STRING = (
+        '<?xml version=1.0?>\n<nested><a1>word 12 3x@y '
+        + 'long' * 100
+        + '</a1></nested>\n'
+    )
+
+    def roundtrip(self, tokens, token_format, **kwargs):
+        if token_format == 'binary':
+            output_file = io.BytesIO()
+        else:
+            output_file = io.StringIO()
+        write_tokens(
+            tokens=tokens,
+            output_file=output_file,
+            token_format=token_format,
+        )
+        output_file.seek(0)
+        if token_format == 'binary':
+            return list(BinaryTokenReader(input_file=output_file, **kwargs))
+        return list(read_tokens(
+            input_file=output_file,
+            token_format=token_format,
+        ))
+
+    def test_roundtrip(self):
+        for token_format in FORMATS:
+            for spans in (False, True):
+                with self.subTest(format=token_format, spans=spans):
+                    lexer = Lexer(input_string=self.TEST_STRING, spans=spans)
+                    tokens = self.roundtrip(
+                        tokens=lexer,
+                        token_format=token_format,
+                    )
+                    self.assertEqual(
+                        [token.to_dict() for token in tokens],
+                        lexer.as_dict(),
+                    )
+                    Parser(input_stream=tokens, parse_tokens=True, spans=spans)
+
+    def test_binary_small_buffer(self):
+        lexer = Lexer(input_string=self.TEST_STRING, spans=True)
+        tokens = self.roundtrip(
+            tokens=lexer,
+            token_format='binary',
+            buffer_size=3,
+        )
+        self.assertEqual(
+            [token.to_dict() for token in tokens],
+            lexer.as_dict(),
+        )
+
+    def test_binary_arbitrary_tokens(self):
+        tokens = [
+            Token(token_type=TokenType.SIGN, start=10 ** 12, value='é'),
+            Token(token_type=TokenType.SPACE, start=3),
+            Token(token_type=TokenType.ALPHA_SPAN, start=0, value='', end=-1),
+        ]
+        result = self.roundtrip(tokens=tokens, token_format='binary')
+        self.assertEqual(
+            [token.to_dict() for token in result],
+            [token.to_dict() for token in tokens],
+        )
+
+    def test_binary_size(self):
+        lexer = Lexer(input_string=self.TEST_STRING)
+        output_file = io.BytesIO()
+        BinaryTokenWriter(output_file=output_file).write_all(tokens=lexer)
+        self.assertLess(
+            len(output_file.getvalue()),
+            len(lexer.tokens) * 5 + len(BINARY_HEADER),
+        )
+
+    def test_invalid_binary(self):
+        with self.assertRaises(FormatError):
+            BinaryTokenReader(input_file=io.BytesIO(b'[{"type": "letter"}]'))
+        with self.assertRaises(FormatError):
+            BinaryTokenReader(input_file=io.BytesIO(b'LXTK\x7f'))
+        truncated = io.BytesIO(BINARY_HEADER + b'\x80\x02\x05a')
+        with self.assertRaises(FormatError):
+            list(BinaryTokenReader(input_file=truncated))
+        corrupt = io.BytesIO(BINARY_HEADER + b'\x80\x02\x01\xff')
+        with self.assertRaises(FormatError):
+            list(BinaryTokenReader(input_file=corrupt))
+        # Length of the value far beyond the end of the file
+        corrupt = io.BytesIO(BINARY_HEADER + b'\x80\x02' + b'\xff' * 12 + b'a')
+        with self.assertRaises(FormatError):
+            list(BinaryTokenReader(input_file=corrupt, buffer_size=4))
+
+    def test_same_as_json_dump(self):
+        for tokens in ([], Lexer(input_string=self.TEST_STRING).tokens):
+            with self.subTest(tokens=len(tokens)):
+                output_file = io.StringIO()
+                write_tokens(tokens=tokens, output_file=output_file)
+                expected = json.dumps(
+                    [token.to_dict() for token in tokens],
+                    indent=2,
+                )
+                self.assertEqual(output_file.getvalue(), expected + '\n')
+
+    def test_json_streaming(self):
+        for lines in (False, True):
+            with self.subTest(lines=lines):
+                output_file = io.StringIO()
+                writer = JsonTokenWriter(
+                    output_file=output_file,
+                    lines=lines,
+                    buffer_size=1,
+                )
+                for token in Lexer(input_string=self.TEST_STRING):
+                    written = len(output_file.getvalue())
+                    writer.write(token=token)
+                    self.assertGreater(len(output_file.getvalue()), written)
+                writer.close()
+
+    def test_invalid_json(self):
+        for content in [
+            '[{"type": "unknown", "start": 1}]',
+            '{',
+            '[1]',
+            '[{"type": "letter", "start": 1, "value": 5}]',
+            '[{"type": "letter", "start": "1", "value": "a"}]',
+        ]:
+            with self.subTest(content=content):
+                with self.assertRaises(FormatError):
+                    read_tokens(input_file=io.StringIO(content))
+
+    def test_invalid_jsonl(self):
+        content = '{"type": "less_than", "start": 1}\n\n[1]\n'
+        tokens = iter(read_tokens(
+            input_file=io.StringIO(content),
+            token_format='jsonl',
+        ))
+        self.assertEqual(next(tokens).token_type, TokenType.LESS_THAN)
+        with self.assertRaises(FormatError) as context:
+            next(tokens)
+        self.assertIn('line 3', str(context.exception))
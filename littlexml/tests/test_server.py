@@ -0,0 +1,110 @@
+import asyncio
+import json
+import unittest
+
+from littlexml.limits import Limits
+from littlexml.server import ValidationServer
+
+
+class TestValidationServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = ValidationServer(
+            port=0,
+            concurrency=2,
+            limits=Limits(max_bytes=1000),
+            chunk_size=16,
+        )
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def request(self, body=b'', method='POST', path='/validate',
+                      headers=None):
+        reader, writer = await asyncio.open_connection(
+            host=self.server.host,
+            port=self.server.port,
+        )
+        if headers is None:
+            headers = {'Content-Length': len(body)}
+        head = f'{method} {path} HTTP/1.1\r\n' + ''.join(
+            f'{name}: {value}\r\n'
+            for name, value in headers.items()
+        )
+        writer.write(head.encode() + b'\r\n' + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        head, body = response.split(b'\r\n\r\n', 1)
+        status = int(head.split()[1])
+        return status, json.loads(body)
+
+    async def test_valid(self):
+        status, result = await self.request(body=b'<a>word</a>')
+        self.assertEqual(status, 200)
+        self.assertEqual(result, {'ok': True})
+
+    async def test_invalid(self):
+        status, result = await self.request(
+            body=b'<a>word</b>' + b' ' * 500,
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(result, {
+            'ok': False,
+            'error': 'Parsing error',
+            'message': 'Mismatched closing tag at position 10: '
+                       'expected a, found b',
+        })
+
+    async def test_limit(self):
+        status, result = await self.request(
+            body=b'<a>' + b'word ' * 1000 + b'</a>',
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(result['error'], 'Limit error')
+
+    async def test_bad_requests(self):
+        status, _ = await self.request(path='/other')
+        self.assertEqual(status, 404)
+        status, _ = await self.request(method='GET')
+        self.assertEqual(status, 405)
+        status, _ = await self.request(headers={})
+        self.assertEqual(status, 411)
+        status, result = await self.request(headers={'Content-Length': 'x'})
+        self.assertEqual(status, 400)
+        self.assertEqual(result['error'], 'HTTP error')
+
+    async def test_concurrency(self):
+        documents = [
+            f'<a{index}>word</a{index}>'.encode()
+            for index in range(10)
+        ]
+        results = await asyncio.gather(*(
+            self.request(body=document)
+            for document in documents
+        ))
+        self.assertEqual(results, [(200, {'ok': True})] * 10)
+
+    async def test_backpressure(self):
+        # Requests over the limit wait without their bodies being read
+        writers = []
+        for _ in range(2):
+            _, writer = await asyncio.open_connection(
+                host=self.server.host,
+                port=self.server.port,
+            )
+            writer.write(
+                b'POST /validate HTTP/1.1\r\nContent-Length: 100\r\n\r\n<a>'
+            )
+            await writer.drain()
+            writers.append(writer)
+        await asyncio.sleep(0.1)
+        waiting = asyncio.create_task(self.request(body=b'<a>word</a>'))
+        await asyncio.sleep(0.1)
+        self.assertFalse(waiting.done())
+        writers[0].close()
+        status, result = await asyncio.wait_for(waiting, timeout=5)
+        self.assertEqual((status, result), (200, {'ok': True}))
+        writers[1].close()
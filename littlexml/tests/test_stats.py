@@ -0,0 +1,38 @@
+import unittest
+
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser
+from littlexml.rule import RuleType
+from littlexml.stats import Statistics
+from littlexml.token import TokenType
+
+
+class TestStatistics(unittest.TestCase):
+    TEST_STRING = '<?xml version=1.0?><nested><a>word 12</a></nested>'
+
+    def test_counters(self):
+        stats = Statistics()
+        Parser(input_stream=self.TEST_STRING, stats=stats)
+        tokens = Lexer(input_string=self.TEST_STRING).tokens
+        self.assertEqual(sum(stats.token_counts.values()), len(tokens))
+        self.assertEqual(stats.token_counts[TokenType.LETTER], 18)
+        self.assertEqual(stats.rule_steps[RuleType.ELEMENT], 2)
+        self.assertEqual(
+            stats.steps,
+            sum(stats.rule_steps.values()) + len(tokens),
+        )
+        self.assertGreater(stats.max_stack_depth, 2)
+        self.assertGreater(stats.lex_time, 0)
+        self.assertGreater(stats.parse_time, 0)
+        self.assertEqual(stats.as_dict()['tokens'], len(tokens))
+
+    def test_trace(self):
+        steps = []
+
+        def trace(step, stack_top, token, stack_depth):
+            steps.append(step)
+
+        stats = Statistics()
+        Parser(input_stream=self.TEST_STRING, stats=stats)
+        Parser(input_stream=self.TEST_STRING, trace=trace, trace_every=10)
+        self.assertEqual(steps, list(range(0, stats.steps, 10)))
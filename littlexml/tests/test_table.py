@@ -0,0 +1,36 @@
+import unittest
+
+from littlexml.rule import (
+    RuleType, RULE_DICT, SPAN_RULE_DICT, add_tag_actions,
+)
+from littlexml.table import (
+    PARSE_TABLE, SPAN_PARSE_TABLE, SPAN_TAG_PARSE_TABLE, TAG_PARSE_TABLE,
+)
+from littlexml.token import TokenType
+
+
+class TestParseTable(unittest.TestCase):
+
+    def test_same_as_rules(self):
+        tables = [
+            (PARSE_TABLE, RULE_DICT),
+            (SPAN_PARSE_TABLE, SPAN_RULE_DICT),
+            (TAG_PARSE_TABLE, add_tag_actions(rule_dict=RULE_DICT)),
+            (SPAN_TAG_PARSE_TABLE, add_tag_actions(rule_dict=SPAN_RULE_DICT)),
+        ]
+        for table, rule_dict in tables:
+            for rule_type in RuleType:
+                for token_type in TokenType:
+                    with self.subTest(rule=rule_type, token=token_type):
+                        production = table.get(
+                            rule_type=rule_type,
+                            token_type=token_type,
+                        )
+                        expected = rule_dict.get((rule_type, token_type))
+                        if expected is None:
+                            self.assertIsNone(production)
+                        else:
+                            self.assertEqual(
+                                table.decode(symbol_ids=production)[::-1],
+                                expected,
+                            )
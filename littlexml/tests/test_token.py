@@ -0,0 +1,92 @@
+import sys
+import unittest
+
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser
+from littlexml.token import Token, TokenStream, TokenType
+
+
+class TestTokenStream(unittest.TestCase):
+    TEST_STRING = '<?xml version=1.0?><nested><a1>word 12 3x@y</a1></nested>'
+
+    def test_same_tokens(self):
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                tokens = Lexer(input_string=self.TEST_STRING, spans=spans)
+                stream = TokenStream(tokens=tokens)
+                self.assertEqual(len(stream), len(tokens.tokens))
+                self.assertEqual(stream.as_dict(), tokens.as_dict())
+
+    def test_indexing(self):
+        stream = TokenStream(tokens=[
+            Token(token_type=TokenType.LESS_THAN, start=1),
+            Token(token_type=TokenType.ALPHA_SPAN, start=2, value='ab', end=3),
+            Token(token_type=TokenType.GT_SLASH, start=5),
+        ])
+        self.assertEqual(stream[1].value, 'ab')
+        self.assertEqual(stream[1].end, 3)
+        self.assertIsNone(stream[0].value)
+        self.assertIsNone(stream[-1].end)
+        self.assertEqual(stream[-1].token_type, TokenType.GT_SLASH)
+        self.assertEqual(len(stream[1:]), 2)
+        with self.assertRaises(IndexError):
+            stream[3]
+
+    def test_compact_lexer(self):
+        lexer = Lexer(input_string=self.TEST_STRING, compact=True)
+        self.assertIsInstance(lexer.tokens, TokenStream)
+        expected = Lexer(input_string=self.TEST_STRING).as_dict()
+        self.assertEqual(lexer.as_dict(), expected)
+        Parser(input_stream=lexer.tokens, parse_tokens=True)
+
+    def test_from_list(self):
+        token_list = Lexer(input_string=self.TEST_STRING).as_dict()
+        stream = TokenStream.from_list(token_list=token_list)
+        self.assertEqual(stream.as_dict(), token_list)
+
+    def test_random_access(self):
+        test_string = '<a>' + ' '.join(['x', 'yz12', '3']) * 100 + '</a>'
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                tokens = Lexer(input_string=test_string, spans=spans).tokens
+                stream = TokenStream(tokens=tokens)
+                expected = [token.to_dict() for token in tokens]
+                for index in reversed(range(len(stream))):
+                    self.assertEqual(stream[index].to_dict(), expected[index])
+                self.assertEqual(
+                    [token.to_dict() for token in stream[::7]],
+                    expected[::7],
+                )
+
+    def test_other_values(self):
+        tokens = [
+            Token(token_type=TokenType.LETTER, start=1, value='é'),
+            Token(token_type=TokenType.ALPHA_SPAN, start=2, value='a', end=4),
+            Token(token_type=TokenType.LETTER, start=5, value='b'),
+            Token(token_type=TokenType.SPACE, start=2 ** 40),
+            Token(token_type=TokenType.ALPHA_SPAN, start=2 ** 40 + 1,
+                  value='cd', end=2 ** 40 + 2),
+        ]
+        stream = TokenStream(tokens=tokens)
+        self.assertEqual(
+            stream.as_dict(),
+            [token.to_dict() for token in tokens],
+        )
+        self.assertEqual(stream[2].value, 'b')
+
+    def test_memory(self):
+        tokens = Lexer(input_string='<a>' + 'x' * 1000 + '</a>').tokens
+        token_size = sys.getsizeof(tokens[0]) + sys.getsizeof(tokens) // 1000
+        stream = TokenStream(tokens=tokens)
+        # An order of magnitude smaller than a list of tokens
+        self.assertLess(stream.nbytes / len(stream), token_size / 10)
+        spans = Lexer(input_string='<a>' + 'xy ' * 1000 + 'z</a>', spans=True)
+        tokens = spans.tokens
+        # Values of span tokens are separate strings
+        token_size += sum(
+            sys.getsizeof(token.value)
+            for token in tokens
+            if token.end is not None
+        ) // len(tokens)
+        stream = TokenStream(tokens=tokens)
+        self.assertLess(stream.nbytes / len(stream), token_size / 10)
@@ -0,0 +1,101 @@
+import unittest
+
+from littlexml.events import EventType
+from littlexml.lexer import Lexer
+from littlexml.parser import Parser, ParsingError
+from littlexml.tree import parse_events, parse_tree
+
+
+class TestEvents(unittest.TestCase):
+    TEST_STRING = '<?xml version=1.0?><a><b_1:x>word  12 @x</b_1:x></a>'
+    EXPECTED = [
+        (EventType.DECLARATION, '1.0', 1, 19),
+        (EventType.START_ELEMENT, 'a', 20, 22),
+        (EventType.START_ELEMENT, 'b_1:x', 23, 29),
+        (EventType.TEXT, 'word 12 @x', 30, 40),
+        (EventType.END_ELEMENT, 'b_1:x', 41, 48),
+        (EventType.END_ELEMENT, 'a', 49, 52),
+    ]
+
+    def assert_events(self, events, expected):
+        self.assertEqual(
+            [
+                (event.event_type, event.value, event.start, event.end)
+                for event in events
+            ],
+            expected,
+        )
+
+    def test_events(self):
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                events = parse_events(self.TEST_STRING, spans=spans)
+                self.assert_events(events=events, expected=self.EXPECTED)
+
+    def test_events_verbose_path(self):
+        events = parse_events(self.TEST_STRING, trace=lambda **kwargs: None)
+        self.assert_events(events=events, expected=self.EXPECTED)
+
+    def test_token_stream(self):
+        tokens = Lexer(input_string=self.TEST_STRING).tokens
+        events = parse_events(tokens, parse_tokens=True)
+        self.assert_events(events=events, expected=self.EXPECTED)
+
+    def test_empty_element(self):
+        events = parse_events('<a/>')
+        self.assert_events(events=events, expected=[
+            (EventType.START_ELEMENT, 'a', 1, 4),
+            (EventType.END_ELEMENT, 'a', 1, 4),
+        ])
+
+    def test_whitespace_after_tags(self):
+        for test_string, expected in (
+            ('<?xml version=1.0?>  <a>  <b/>\n</a>\n', [
+                (EventType.DECLARATION, '1.0', 1, 19),
+                (EventType.START_ELEMENT, 'a', 22, 24),
+                (EventType.START_ELEMENT, 'b', 27, 30),
+                (EventType.END_ELEMENT, 'b', 27, 30),
+                (EventType.END_ELEMENT, 'a', 32, 35),
+            ]),
+            ('<c12>  x</c12> ', [
+                (EventType.START_ELEMENT, 'c12', 1, 5),
+                (EventType.TEXT, 'x', 8, 8),
+                (EventType.END_ELEMENT, 'c12', 9, 14),
+            ]),
+        ):
+            for spans in (False, True):
+                with self.subTest(string=test_string, spans=spans):
+                    events = parse_events(test_string, spans=spans)
+                    self.assert_events(events=events, expected=expected)
+
+    def test_invalid(self):
+        events = []
+        with self.assertRaises(ParsingError):
+            Parser(input_stream='<a><b>x</b></a>x', handler=events.append)
+        self.assert_events(events=events, expected=[
+            (EventType.START_ELEMENT, 'a', 1, 3),
+            (EventType.START_ELEMENT, 'b', 4, 6),
+            (EventType.TEXT, 'x', 7, 7),
+            (EventType.END_ELEMENT, 'b', 8, 11),
+            (EventType.END_ELEMENT, 'a', 12, 15),
+        ])
+
+
+class TestTree(unittest.TestCase):
+
+    def test_tree(self):
+        document = parse_tree('<?xml version=1.0?><a><b>one two</b></a>')
+        self.assertEqual(document.version, '1.0')
+        self.assertEqual(document.root.name, 'a')
+        self.assertIsNone(document.root.text)
+        child, = document.root.children
+        self.assertEqual(child.name, 'b')
+        self.assertEqual(child.text, 'one two')
+        self.assertEqual(
+            [element.name for element in document.root.iter()],
+            ['a', 'b'],
+        )
+
+    def test_interned_names(self):
+        document = parse_tree('<name><name/></name>')
+        self.assertIs(document.root.name, document.root.children[0].name)
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from littlexml.validation import find_files, validate_file, validate_files
+
+
+class TestValidation(unittest.TestCase):
+    FILES = {
+        'a.littlexml': '<?xml version=1.0?><a>word</a>',
+        'b.littlexml': '<a>word</a',
+        os.path.join('nested', 'c.littlexml'): '<c/>',
+        os.path.join('nested', 'd.txt'): '<d/>',
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for name, content in self.FILES.items():
+            path = self.path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as output_file:
+                output_file.write(content)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_find_files(self):
+        files = list(find_files(
+            paths=[self.directory.name, self.path('*.txt')],
+            pattern='*.littlexml',
+        ))
+        self.assertEqual(files, [
+            self.path('a.littlexml'),
+            self.path('b.littlexml'),
+            self.path(os.path.join('nested', 'c.littlexml')),
+            self.path('*.txt'),
+        ])
+
+    def test_validate_file(self):
+        self.assertTrue(validate_file(path=self.path('a.littlexml')).ok)
+        result = validate_file(path=self.path('b.littlexml'))
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error_name, 'Parsing error')
+        result = validate_file(path=self.path('missing.littlexml'))
+        self.assertEqual(result.error_name, 'Input error')
+
+    def test_byte_positions(self):
+        path = self.path('bytes.littlexml')
+        for content, message in (
+            (b'<a>\r\n<b>x</c>\r\n</a>',
+             'Mismatched closing tag at position 12: expected b, found c'),
+            ('<a>\r\n\u00e9</a>'.encode(),
+             'Invalid character at position 6: \u00e9'),
+        ):
+            with open(path, 'wb') as output_file:
+                output_file.write(content)
+            for memory_map in (False, True):
+                with self.subTest(content=content, memory_map=memory_map):
+                    result = validate_file(path=path, memory_map=memory_map)
+                    self.assertEqual(result.message, message)
+
+    def test_validate_files(self):
+        paths = list(find_files(paths=[self.directory.name]))
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                results = list(validate_files(paths=paths, jobs=jobs))
+                self.assertEqual(
+                    [result.path for result in results],
+                    paths,
+                )
+                self.assertEqual(
+                    [result.ok for result in results],
+                    [True, False, True, True],
+                )
+        results = validate_files(paths=paths, jobs=2, ordered=False)
+        self.assertEqual(
+            sorted(result.path for result in results),
+            sorted(paths),
+        )
@@ -1,12 +1,15 @@
+from array import array
 from enum import Enum
 
 
 class Token:
+    __slots__ = ('token_type', 'start', 'value', 'end')
 
-    def __init__(self, token_type, start, value=None):
+    def __init__(self, token_type, start, value=None, end=None):
         self.token_type = token_type
         self.start = start
         self.value = value
+        self.end = end
 
     def __repr__(self):
         identifier = f'Token [{self.token_type.value} {self.start}]'
@@ -16,6 +19,8 @@ class Token:
 
     def __str__(self):
         identifier = f'<{self.token_type.value}> start={self.start}'
+        if self.end is not None:
+            identifier = f'{identifier} end={self.end}'
         if self.value is not None:
             return f'{identifier} value={repr(self.value)}'
         return identifier
@@ -27,6 +32,8 @@ class Token:
         }
         if self.value is not None:
             token_dict['value'] = self.value
+        if self.end is not None:
+            token_dict['end'] = self.end
         return token_dict
 
     @classmethod
@@ -38,10 +45,28 @@ class Token:
 
     @classmethod
     def from_dict(cls, token_dict):
+        """
+        Create a token from its serializable format.
+        :param token_dict: Dict with the fields of the token
+        :return: Token
+        :raises ValueError: If the token type is unknown
+        :raises KeyError: If the type or start is missing
+        :raises TypeError: If a field is of the wrong type
+        """
+        start = token_dict['start']
+        value = token_dict.get('value', None)
+        end = token_dict.get('end', None)
+        if not isinstance(start, int) or (
+            end is not None and not isinstance(end, int)
+        ):
+            raise TypeError('Token positions must be integers')
+        if value is not None and not isinstance(value, str):
+            raise TypeError('Token values must be strings')
         return Token(
             token_type=TokenType(token_dict['type']),
-            start=token_dict['start'],
-            value=token_dict.get('value', None),
+            start=start,
+            value=value,
+            end=end,
         )
 
 
@@ -63,12 +88,221 @@ class TokenType(Enum):
     VERSION = 'version'
     END_OF_STRING = 'end_of_string'
 
+    # Span tokens, only produced by the lexer in span mode, each covering
+    # a maximal run of letters and digits: starting with a letter,
+    # consisting of digits only, or starting with a digit and
+    # containing a letter
+    ALPHA_SPAN = 'alpha_span'
+    DIGIT_SPAN = 'digit_span'
+    ALNUM_SPAN = 'alnum_span'
 
-CHARACTER_MAPPING = {
-    '-': TokenType.HYPHEN,
-    '.': TokenType.DOT,
-    ':': TokenType.COLON,
-    '>': TokenType.GREATER_THAN,
-    '@': TokenType.SIGN,
-    '_': TokenType.UNDERSCORE,
+
+TOKEN_TYPES = tuple(TokenType)
+TOKEN_TYPE_IDS = {
+    token_type: type_id
+    for type_id, token_type in enumerate(TOKEN_TYPES)
 }
+
+
+class TokenStream:
+    """
+    Compact sequence of tokens, stored in columns of typed arrays instead of
+    separate objects. Tokens are created only when accessed.
+    Start positions are stored as unsigned 32-bit integers and end
+    positions as the number of positions covered by a token in a byte,
+    until a number does not fit. Values are stored without their offsets,
+    as a value takes a byte for each of the positions of its token,
+    and only the offset of the values of every block of tokens is kept.
+    Values of other sizes are kept separately.
+    :param tokens: Iterable of tokens to store
+    """
+
+    # Flags set in the type column for tokens with a value, and for tokens
+    # with a value kept separately
+    _HAS_VALUE = 0x80
+    _OTHER_VALUE = 0x40
+    # Number of tokens in a block sharing the offset of their values
+    _BLOCK_SIZE = 16
+
+    def __init__(self, tokens=()):
+        self._types = bytearray()
+        self._starts = array('I')
+        # Number of positions covered by tokens with an end position,
+        # zero for tokens without one
+        self._sizes = None
+        self._values = bytearray()
+        self._block_offsets = array('I')
+        self._other_values = {}
+        self.extend(tokens=tokens)
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        offset = 0
+        for index in range(len(self._types)):
+            token, offset = self._get_token(index=index, offset=offset)
+            yield token
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self[item]
+                for item in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('token index out of range')
+        token, _ = self._get_token(
+            index=index,
+            offset=self._value_offset(index=index),
+        )
+        return token
+
+    def __repr__(self):
+        return f'<TokenStream: {len(self)} tokens>'
+
+    @property
+    def nbytes(self):
+        """number of bytes used by the token columns"""
+        size = (
+            len(self._types)
+            + self._starts.itemsize * len(self._starts)
+            + len(self._values)
+            + self._block_offsets.itemsize * len(self._block_offsets)
+            + sum(len(value.encode()) for value in self._other_values.values())
+        )
+        if self._sizes is not None:
+            size += self._sizes.itemsize * len(self._sizes)
+        return size
+
+    def append(self, token):
+        """
+        Add a token to the end of the stream.
+        :param token: Token to add
+        """
+        type_id = TOKEN_TYPE_IDS[token.token_type]
+        index = len(self._types)
+        if not index % self._BLOCK_SIZE:
+            self._block_offsets = _append_position(
+                column=self._block_offsets,
+                position=len(self._values),
+            )
+        if token.end is None:
+            size = 1
+        else:
+            size = token.end - token.start + 1
+        if token.value is not None:
+            type_id |= self._HAS_VALUE
+            value = token.value.encode()
+            if len(value) == size:
+                self._values += value
+            else:
+                type_id |= self._OTHER_VALUE
+                self._other_values[index] = token.value
+        self._types.append(type_id)
+        try:
+            self._starts.append(token.start)
+        except OverflowError:
+            self._starts = _append_position(
+                column=self._starts,
+                position=token.start,
+            )
+        if token.end is not None and self._sizes is None:
+            # End positions are only stored once a token has one
+            self._sizes = array('B', bytes(index))
+        if self._sizes is not None:
+            self._sizes = _append_position(
+                column=self._sizes,
+                position=0 if token.end is None else size,
+            )
+
+    def extend(self, tokens):
+        """
+        Add tokens to the end of the stream.
+        :param tokens: Iterable of tokens to add
+        """
+        for token in tokens:
+            self.append(token=token)
+
+    def as_dict(self):
+        """
+        Get tokens in a serializable format.
+        :return: Token stream as list of dicts
+        """
+        return [token.to_dict() for token in self]
+
+    @classmethod
+    def from_list(cls, token_list):
+        return cls(tokens=(
+            Token.from_dict(token_dict=token_dict)
+            for token_dict in token_list
+        ))
+
+    def _value_offset(self, index):
+        """
+        Find the offset of the value of a token from the offset
+        of its block.
+        :param index: Index of the token
+        :return: Offset of the value in the value column
+        """
+        block = index // self._BLOCK_SIZE
+        offset = self._block_offsets[block]
+        for item in range(block * self._BLOCK_SIZE, index):
+            type_id = self._types[item]
+            if not type_id & self._HAS_VALUE or type_id & self._OTHER_VALUE:
+                continue
+            if self._sizes is not None and self._sizes[item]:
+                offset += self._sizes[item]
+            else:
+                offset += 1
+        return offset
+
+    def _get_token(self, index, offset):
+        """
+        Create a token from the columns.
+        :param index: Index of the token
+        :param offset: Offset of the value of the token, or of the next
+            value if it has none
+        :return: Tuple of the token and the offset of the next value
+        """
+        type_id = self._types[index]
+        start = self._starts[index]
+        size = 1
+        end = None
+        if self._sizes is not None and self._sizes[index]:
+            size = self._sizes[index]
+            end = start + size - 1
+        value = None
+        if type_id & self._OTHER_VALUE:
+            type_id ^= self._HAS_VALUE | self._OTHER_VALUE
+            value = self._other_values[index]
+        elif type_id & self._HAS_VALUE:
+            type_id ^= self._HAS_VALUE
+            value_end = offset + size
+            value = self._values[offset:value_end].decode()
+            offset = value_end
+        token = Token(
+            token_type=TOKEN_TYPES[type_id],
+            start=start,
+            value=value,
+            end=end,
+        )
+        return token, offset
+
+
+def _append_position(column, position):
+    """
+    Append a position or size to a column, widening the column
+    to signed 64-bit integers if the number does not fit.
+    :param column: Array of positions or sizes
+    :param position: Position or size to append
+    :return: The column, or a new column if it was widened
+    """
+    try:
+        column.append(position)
+    except OverflowError:
+        column = array('q', column)
+        column.append(position)
+    return column
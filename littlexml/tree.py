@@ -0,0 +1,103 @@
+from littlexml.events import EventType
+from littlexml.parser import Parser
+
+
+class Element:
+    """
+    Element of a document tree.
+    :param name: Name of the element
+    :param start: Position of the opening tag
+    """
+    __slots__ = ('name', 'children', 'text', 'start', 'end')
+
+    def __init__(self, name, start):
+        self.name = name
+        self.children = []
+        self.text = None
+        self.start = start
+        self.end = None
+
+    def __repr__(self):
+        return f'<Element {self.name} [{self.start}-{self.end}]>'
+
+    def iter(self):
+        """
+        Iterate over the element and all of its descendants.
+        :return: Generator yielding elements in document order
+        """
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+
+class Document:
+    """
+    Document tree with the version from the XML declaration, if any,
+    and the root element.
+    """
+    __slots__ = ('version', 'root')
+
+    def __init__(self):
+        self.version = None
+        self.root = None
+
+    def __repr__(self):
+        return f'<Document version={self.version}: {self.root}>'
+
+
+class TreeBuilder:
+    """
+    Builds a document tree from parsing events.
+    The object is used as the event handler of `Parser`.
+    """
+
+    def __init__(self):
+        self.document = Document()
+        self._stack = []
+
+    def __call__(self, event):
+        event_type = event.event_type
+        if event_type == EventType.START_ELEMENT:
+            element = Element(name=event.value, start=event.start)
+            if self._stack:
+                self._stack[-1].children.append(element)
+            else:
+                self.document.root = element
+            self._stack.append(element)
+        elif event_type == EventType.TEXT:
+            self._stack[-1].text = event.value
+        elif event_type == EventType.END_ELEMENT:
+            self._stack.pop().end = event.end
+        elif event_type == EventType.DECLARATION:
+            self.document.version = event.value
+
+
+def parse_events(input_stream, **kwargs):
+    """
+    Parse a LittleXML string or token stream, collecting parsing events.
+    :param input_stream: The string or token stream to be parsed
+    :param kwargs: Other arguments passed to `Parser`
+    :return: List of events
+    :raises LexicalError: If the input cannot be tokenized
+    :raises ParsingError: If the input is not valid
+    """
+    events = []
+    Parser(input_stream=input_stream, handler=events.append, **kwargs)
+    return events
+
+
+def parse_tree(input_stream, **kwargs):
+    """
+    Parse a LittleXML string or token stream, validating it and building
+    its document tree in a single pass.
+    :param input_stream: The string or token stream to be parsed
+    :param kwargs: Other arguments passed to `Parser`
+    :return: Document tree
+    :raises LexicalError: If the input cannot be tokenized
+    :raises ParsingError: If the input is not valid
+    """
+    builder = TreeBuilder()
+    Parser(input_stream=input_stream, handler=builder, **kwargs)
+    return builder.document
@@ -0,0 +1,369 @@
+import collections
+import concurrent.futures
+import contextlib
+import fnmatch
+import functools
+import glob
+import os
+
+from littlexml.lexer import Lexer, LexicalError, StreamLexer, map_file
+from littlexml.limits import LimitError
+from littlexml.parser import Parser, ParsingError
+from littlexml.serialization import FormatError, read_tokens
+
+
+INPUT_ERROR = 'Input error'
+
+
+class ValidationResult:
+    """
+    Outcome of validating a single file.
+    :param path: Path to the validated file
+    :param error_name: Name of the error, `None` if the file is valid
+    :param message: Error message, `None` if the file is valid
+    """
+
+    def __init__(self, path, error_name=None, message=None):
+        self.path = path
+        self.error_name = error_name
+        self.message = message
+
+    def __str__(self):
+        if self.ok:
+            return f'{self.path}: OK'
+        return f'{self.path}: {self.error_name} -- {self.message}'
+
+    @property
+    def ok(self):
+        """whether the file is valid"""
+        return self.error_name is None
+
+
+def find_files(paths, pattern='*'):
+    """
+    Expand paths, directories and glob patterns into a list of files.
+    Directories are searched recursively for files matching `pattern`.
+    Paths that do not exist are returned unchanged, so that they can be
+    reported as errors.
+    :param paths: Iterable of paths, directories or glob patterns
+    :param pattern: Pattern for names of files found in directories
+    :return: Generator yielding file paths
+    """
+    for path in paths:
+        if os.path.exists(path):
+            matches = [path]
+        else:
+            matches = sorted(glob.glob(path, recursive=True)) or [path]
+        for match in matches:
+            if not os.path.isdir(match):
+                yield match
+                continue
+            for root, directories, files in os.walk(match):
+                directories.sort()
+                for name in sorted(files):
+                    if fnmatch.fnmatch(name, pattern):
+                        yield os.path.join(root, name)
+
+
+def validate_file(path, tokens=False, token_format='json', spans=False,
+                  memory_map=False, limits=None):
+    """
+    Validate a single LittleXML file.
+    :param path: Path to the file
+    :param tokens: Whether the file contains a token stream
+    :param token_format: Format of the token stream, one of `FORMATS`
+    :param spans: Whether to use span tokens
+    :param memory_map: Whether to memory-map the file
+        instead of reading it in chunks
+    :param limits: `Limits` enforced during validation
+    :return: Validation result
+    """
+    try:
+        with contextlib.ExitStack() as stack:
+            input_file = stack.enter_context(open(path, 'rb'))
+            if tokens:
+                input_stream = read_tokens(
+                    input_file=input_file,
+                    token_format=token_format,
+                )
+            elif memory_map:
+                mapped = stack.enter_context(map_file(input_file=input_file))
+                input_stream = Lexer(
+                    input_string=mapped,
+                    spans=spans,
+                    scanner='regex',
+                    lazy=True,
+                    limits=limits,
+                )
+            else:
+                input_stream = StreamLexer(
+                    input_file=input_file,
+                    spans=spans,
+                    limits=limits,
+                )
+            Parser(
+                input_stream=input_stream,
+                parse_tokens=True,
+                spans=spans,
+                limits=limits,
+            )
+    except (LexicalError, ParsingError, FormatError, LimitError) as error:
+        return ValidationResult(
+            path=path,
+            error_name=error.name,
+            message=str(error),
+        )
+    except (OSError, ValueError) as error:
+        return ValidationResult(
+            path=path,
+            error_name=INPUT_ERROR,
+            message=str(error),
+        )
+    return ValidationResult(path=path)
+
+
+def cache_options(tokens=False, token_format='json', spans=False,
+                  limits=None):
+    """
+    Describe the options affecting validation results, to be included
+    in keys of cached results.
+    :param tokens: Whether the input is a token stream
+    :param token_format: Format of the token stream, one of `FORMATS`
+    :param spans: Whether to use span tokens
+    :param limits: `Limits` enforced during validation
+    :return: Description of the options
+    """
+    token_format = token_format if tokens else None
+    return f'tokens={token_format} spans={spans} limits={limits!r}'
+
+
+def validate_files(paths, jobs=None, ordered=True, tokens=False,
+                   token_format='json', spans=False, memory_map=False,
+                   limits=None, cache=None):
+    """
+    Validate multiple LittleXML files using a pool of worker processes.
+    With a cache, files are looked up by their content before validating
+    them, and files with the same content are only validated once.
+    :param paths: Iterable of file paths
+    :param jobs: Number of worker processes, defaults to the number of CPUs,
+        files are validated in the current process if set to 1
+    :param ordered: Whether to return results in the order of `paths`
+        instead of the order in which they are completed
+    :param tokens: Whether the files contain token streams
+    :param token_format: Format of the token streams, one of `FORMATS`
+    :param spans: Whether to use span tokens
+    :param memory_map: Whether to memory-map the files
+        instead of reading them in chunks
+    :param limits: `Limits` enforced during validation of each file
+    :param cache: `ValidationCache` for results of validation
+    :return: Generator yielding validation results
+    """
+    validate = functools.partial(
+        validate_file,
+        tokens=tokens,
+        token_format=token_format,
+        spans=spans,
+        memory_map=memory_map,
+        limits=limits,
+    )
+    if cache is None:
+        yield from _run_validation(
+            validate=validate,
+            paths=paths,
+            jobs=jobs,
+            ordered=ordered,
+        )
+        return
+
+    options = cache_options(
+        tokens=tokens,
+        token_format=token_format,
+        spans=spans,
+        limits=limits,
+    )
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if jobs != 1:
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=jobs),
+            )
+        yield from _validate_cached(
+            validate=validate,
+            paths=paths,
+            executor=executor,
+            ordered=ordered,
+            cache=cache,
+            options=options,
+        )
+
+
+def _validate_cached(validate, paths, executor, ordered, cache, options):
+    """
+    Validate files not found in the cache, submitting each file as soon
+    as it is looked up, so that files are hashed while others are being
+    validated. Files with the same content are only validated once.
+    Without ordering, results are yielded as soon as they are available.
+    :param validate: Function validating a single file
+    :param paths: Iterable of file paths
+    :param executor: Executor validating the files, `None` to validate
+        them in the current process
+    :param ordered: Whether to return results in the order of `paths`
+    :param cache: `ValidationCache` for results of validation
+    :param options: Description of the options affecting the results
+    :return: Generator yielding validation results
+    """
+    # Entries of files in the order of paths, only kept when ordered
+    entries = collections.deque()
+    # Paths of files waiting for the result of validating their content
+    waiting = {}
+    completed = {}
+    running = {}
+    # Futures appended by the thread of the executor as they complete
+    finished = collections.deque()
+
+    def complete(key, result):
+        completed[key] = result
+        # Input errors may not be caused by the content
+        if result.error_name != INPUT_ERROR and key != result.path:
+            cache.put(
+                key=key,
+                error_name=result.error_name,
+                message=result.message,
+            )
+        paths = waiting.pop(key)
+        if ordered:
+            return _ready_entries(entries=entries, completed=completed)
+        return [
+            _entry_result(entry=(path, key, None), completed=completed)
+            for path in paths
+        ]
+
+    for path in paths:
+        key = _file_key(cache=cache, path=path, options=options)
+        if key in completed:
+            result = _entry_result(
+                entry=(path, key, None),
+                completed=completed,
+            )
+        elif key in waiting:
+            result = None
+        else:
+            result = _cached_result(cache=cache, path=path, key=key)
+        if ordered:
+            entries.append((path, key, result))
+            yield from _ready_entries(entries=entries, completed=completed)
+        elif result is not None:
+            yield result
+        if result is None and key in waiting:
+            waiting[key].append(path)
+        elif result is None:
+            waiting[key] = [path]
+            if executor is None:
+                yield from complete(key=key, result=validate(path))
+            else:
+                future = executor.submit(validate, path)
+                future.add_done_callback(finished.append)
+                running[future] = key
+        while finished:
+            future = finished.popleft()
+            key = running.pop(future)
+            yield from complete(key=key, result=future.result())
+
+    for future in concurrent.futures.as_completed(list(running)):
+        key = running.pop(future)
+        yield from complete(key=key, result=future.result())
+
+
+def _file_key(cache, path, options):
+    """
+    Get the key of the content of a file.
+    :param cache: `ValidationCache` for results of validation
+    :param path: Path to the file
+    :param options: Description of the options affecting the results
+    :return: Key of the file, or its path if it cannot be read
+    """
+    try:
+        return cache.file_key(path=path, options=options)
+    except OSError:
+        # Let the validation report the error
+        return path
+
+
+def _cached_result(cache, path, key):
+    """
+    Look up the result of a file in the cache.
+    :param cache: `ValidationCache` for results of validation
+    :param path: Path to the file
+    :param key: Key of the file
+    :return: Cached result, `None` if not found
+    """
+    if key == path:
+        return None
+    cached = cache.get(key=key)
+    if cached is None:
+        return None
+    error_name, message = cached
+    return ValidationResult(
+        path=path,
+        error_name=error_name,
+        message=message,
+    )
+
+
+def _ready_entries(entries, completed):
+    """
+    Take the entries at the front of the queue whose results are known.
+    :param entries: Entries of files in the order of their paths
+    :param completed: Results of validation by key
+    :return: List of validation results
+    """
+    results = []
+    # Results for the same content are yielded in order as well
+    while entries and (entries[0][2] is not None
+                       or entries[0][1] in completed):
+        results.append(_entry_result(
+            entry=entries.popleft(),
+            completed=completed,
+        ))
+    return results
+
+
+def _entry_result(entry, completed):
+    """
+    Get the result of a file from the cache or from the results
+    of validation.
+    :param entry: Tuple of the path, key and cached result
+    :param completed: Results of validation by key
+    :return: Validation result
+    """
+    path, key, result = entry
+    if result is not None:
+        return result
+    result = completed[key]
+    return ValidationResult(
+        path=path,
+        error_name=result.error_name,
+        message=result.message,
+    )
+
+
+def _run_validation(validate, paths, jobs, ordered):
+    """
+    Validate files using a pool of worker processes.
+    :param validate: Function validating a single file
+    :param paths: Iterable of file paths
+    :param jobs: Number of worker processes
+    :param ordered: Whether to return results in the order of `paths`
+    :return: Generator yielding validation results
+    """
+    if jobs == 1:
+        yield from map(validate, paths)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        if ordered:
+            yield from executor.map(validate, paths, chunksize=16)
+            return
+        futures = [executor.submit(validate, path) for path in paths]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
@@ -3,6 +3,7 @@ from setuptools import setup
 setup(
     name='littlexml',
     packages=['littlexml'],
+    package_data={'littlexml': ['grammar.bnf']},
     entry_points={
         'console_scripts': ['littlexml = littlexml.__main__:parse_args'],
     },